@@ -1,18 +1,45 @@
-from flask import Blueprint, render_template, redirect, url_for, session, abort, request
+from flask import Blueprint, render_template, redirect, url_for, session, abort, request, jsonify
 from flask_login import login_user, current_user, login_required
 from utils.decorators import admin_required
 from utils.mailgun import send_contact_reply
-from models import User, Application, Profile, db
+from models import User, Profile, UserStats, db
 from sqlalchemy import func, desc, asc
+from sqlalchemy.orm import contains_eager
 from models import CreditBalance, CreditLedger, ContactMessage
 from sqlalchemy.exc import IntegrityError
 from models import CreditBalance
 from datetime import datetime
+import time
 
 
 
 admin_bp = Blueprint("admin", __name__, template_folder="templates")
 
+# Header totals are shared by every admin page view; recomputed at most
+# this often per process.
+ADMIN_STATS_TTL = 60
+_stats_cache = {"value": None, "expires": 0}
+
+
+def admin_stats():
+    if _stats_cache["value"] is None or _stats_cache["expires"] < time.monotonic():
+        users, applications = db.session.query(
+            func.count(UserStats.user_id),
+            func.coalesce(func.sum(UserStats.application_count), 0),
+        ).one()
+
+        _stats_cache["value"] = {
+            "users": users,
+            "applications": applications,
+            "active_users": Profile.query
+                .filter(Profile.application_mode == "auto")
+                .count(),
+            "errors_today": 0
+        }
+        _stats_cache["expires"] = time.monotonic() + ADMIN_STATS_TTL
+    return _stats_cache["value"]
+
+
 def admin_adjust_credits(user_id: int, amount: int, reason: str, reference: str):
     """
     amount can be positive (add) or negative (remove)
@@ -69,59 +96,54 @@ def dashboard():
     direction = request.args.get("dir", "desc")
 
     sort_map = {
-        "id": User.id,
+        "id": UserStats.user_id,
         "email": User.email,
         "country": Profile.country,
-        "applications": func.count(Application.id),
-        "last_application": func.max(Application.created_at),
+        "applications": UserStats.application_count,
+        "last_application": UserStats.last_application_at,
         "created_at": User.created_at,
-	    "credits": func.coalesce(CreditBalance.available_credits, 0),
+	    "credits": UserStats.available_credits,
     }
 
     sort_col = sort_map.get(sort, User.created_at)
     order_func = desc if direction == "desc" else asc
 
     # -----------------------------
-    # base query
+    # base query, driven from user_stats (one row per user, kept by
+    # triggers) so the (column, user_id) indexes can serve the ORDER BY;
+    # Profile stays an outer join so users without one are still listed
     # -----------------------------
     query = (
 	    db.session.query(
 		    User,
-		    func.count(Application.id).label("application_count"),
-		    func.max(Application.created_at).label("last_application"),
-		    func.coalesce(CreditBalance.available_credits, 0).label("credits"),
+		    UserStats.application_count.label("application_count"),
+		    UserStats.last_application_at.label("last_application"),
+		    UserStats.available_credits.label("credits"),
 	    )
-	    .outerjoin(Application, Application.user_id == User.id)
-	    .outerjoin(Profile, Profile.user_id == User.id)
-	    .outerjoin(CreditBalance, CreditBalance.user_id == User.id)
-	    .group_by(User.id, CreditBalance.available_credits)
+	    .select_from(UserStats)
+	    .join(User, User.id == UserStats.user_id)
+	    .outerjoin(Profile, Profile.user_id == UserStats.user_id)
+	    .options(contains_eager(User.profile))
     )
 
     # -----------------------------
-    # ordering
+    # ordering (user_id breaks ties so pages are stable)
+    # -----------------------------
+    query = query.order_by(order_func(sort_col), order_func(UserStats.user_id))
+
+    # -----------------------------
+    # stats
     # -----------------------------
-    query = query.order_by(order_func(sort_col))
+    stats = admin_stats()
 
     # -----------------------------
     # pagination
     # -----------------------------
-    total_users = query.count()
+    total_users = stats["users"]
     users = query.offset((page - 1) * per_page).limit(per_page).all()
 
     total_pages = (total_users + per_page - 1) // per_page
 
-    # -----------------------------
-    # stats
-    # -----------------------------
-    stats = {
-        "users": User.query.count(),
-        "applications": Application.query.count(),
-        "active_users": User.query.join(Profile)
-            .filter(Profile.application_mode == "auto")
-            .count(),
-        "errors_today": 0
-    }
-
     return render_template(
         "admin/dashboard.html",
         users=users,
@@ -272,3 +294,10 @@ def contact_message_detail(message_id):
         msg=msg
     )
 
+
+@admin_bp.route("/stripe-webhooks/stats")
+@admin_required
+def stripe_webhook_stats():
+    from billing import webhook_queue_stats
+
+    return jsonify(webhook_queue_stats())
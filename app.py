@@ -10,6 +10,7 @@ from contact import contact
 from admin.routes import admin_bp
 from billing import billing_bp
 from werkzeug.exceptions import HTTPException
+from utils.dashboard_cache import register_orm_invalidation
 
 UTM_KEYS = ["utm_source", "utm_medium", "utm_campaign", "utm_content", "utm_term"]
 
@@ -19,6 +20,11 @@ def create_app():
 
     db.init_app(app)
 
+    # Drop cached dashboard summaries when credits, subscriptions,
+    # applications or matches change through the ORM
+    from models import Application, CreditBalance, UserSubscription, Match, DismissedMatch
+    register_orm_invalidation(db.session, (Application, CreditBalance, UserSubscription, Match, DismissedMatch))
+
     login_manager = LoginManager()
     login_manager.login_view = "auth.login"
     login_manager.init_app(app)
@@ -3,8 +3,11 @@ from flask import Blueprint, redirect, url_for, request, render_template
 from flask_login import login_required, current_user
 from models import db, SubscriptionPlan, UserSubscription, CreditLedger, CreditBalance, Profile, PendingCreditGrant, StripeWebhookEvent
 import os
+import json
 from datetime import datetime
 from dotenv import load_dotenv
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from onboarding import get_or_create_profile
 
 load_dotenv()
@@ -332,29 +335,176 @@ def extract_subscription_id(invoice):
     return None
 
 
-@billing_bp.route("/stripe/webhook", methods=["POST"])
-def stripe_webhook():
-    payload = request.get_data(as_text=True)
-    sig_header = request.headers.get("Stripe-Signature")
+def dispatch_stripe_event(event):
+    obj = event["data"]["object"]
+    event_type = event["type"]
+
+    if event_type == "checkout.session.completed":
+        if obj.get("mode") == "subscription":
+            handle_checkout_completed(obj)
+        elif obj.get("mode") == "payment":
+            handle_credit_pack_checkout(obj)
+
+    elif event_type == "invoice.paid":
+        handle_invoice_paid(obj)
+
+    elif event_type == "invoice.payment_failed":
+        if obj.get("subscription"):
+            handle_payment_failed(obj)
+
+    elif event_type == "customer.subscription.deleted":
+        handle_subscription_deleted(obj)
+
+
+# -----------------------------------------------------
+# Webhook queue
+#
+# The webhook only verifies and stores events; workers/stripe_webhook_worker.py
+# drains stripe_webhook_events. A row is due when processed is false and
+# next_attempt_at has passed; next_attempt_at doubles as the lease while a
+# worker holds it and is cleared once an event is given up on.
+# -----------------------------------------------------
+
+STRIPE_WEBHOOK_MAX_ATTEMPTS = int(os.getenv("STRIPE_WEBHOOK_MAX_ATTEMPTS", "8"))
+STRIPE_WEBHOOK_LEASE_SECONDS = int(os.getenv("STRIPE_WEBHOOK_LEASE_SECONDS", "120"))
+STRIPE_WEBHOOK_RETRY_BASE = 30       # seconds, doubled per attempt
+STRIPE_WEBHOOK_RETRY_MAX = 3600
+
+
+def enqueue_stripe_event(event, payload: str, signature=None):
+    """
+    Store a verified event for the worker. Redeliveries of an event we
+    already hold are ignored.
+    """
+    obj = event["data"]["object"]
+    customer = obj.get("customer")
+    if isinstance(customer, dict):
+        customer = customer.get("id")
+
+    db.session.execute(
+        pg_insert(StripeWebhookEvent)
+        .values(
+            stripe_event_id=event["id"],
+            event_type=event["type"],
+            payload=payload,
+            signature=signature,
+            customer_id=customer,
+            stripe_created=event.get("created"),
+            processed=False,
+            attempts=0,
+            received_at=func.now(),
+            next_attempt_at=func.now(),
+        )
+        .on_conflict_do_nothing(index_elements=["stripe_event_id"])
+    )
+    db.session.commit()
+
+
+def claim_stripe_events(limit=20):
+    """
+    Lease up to `limit` due events, oldest first. Only the earliest open
+    event of each customer is eligible, so one customer's events are
+    applied in Stripe's order even across workers and retries.
+    """
+    rows = db.session.execute(
+        text("""
+            UPDATE stripe_webhook_events
+            SET next_attempt_at = NOW() + make_interval(secs => :lease),
+                attempts = attempts + 1
+            WHERE id IN (
+                SELECT e.id
+                FROM stripe_webhook_events e
+                WHERE e.processed = FALSE
+                  AND e.next_attempt_at <= NOW()
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM stripe_webhook_events p
+                      WHERE p.customer_id = e.customer_id
+                        AND p.processed = FALSE
+                        AND p.next_attempt_at IS NOT NULL
+                        AND (p.stripe_created, p.id) < (e.stripe_created, e.id)
+                  )
+                ORDER BY e.stripe_created, e.id
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, stripe_event_id, event_type, payload, attempts
+        """),
+        {"lease": STRIPE_WEBHOOK_LEASE_SECONDS, "limit": limit},
+    ).mappings().all()
+    db.session.commit()
+    return sorted(rows, key=lambda r: r["id"])
 
-    event = None
-    event_id = None
-    event_type = None
 
-    # Store raw webhook immediately
-    webhook_row = None
+def process_stripe_event(row):
+    """Apply one claimed event. Returns True if done, False if it will be retried or was given up on."""
+    payload = row["payload"]
+    event = stripe.Event.construct_from(
+        json.loads(payload) if isinstance(payload, str) else payload,
+        stripe.api_key,
+    )
+
     try:
-        webhook_row = StripeWebhookEvent(
-            payload=payload,
-            signature=sig_header
+        dispatch_stripe_event(event)
+    except Exception as e:
+        db.session.rollback()
+        attempts = row["attempts"]
+        give_up = attempts >= STRIPE_WEBHOOK_MAX_ATTEMPTS
+        delay = min(STRIPE_WEBHOOK_RETRY_BASE * 2 ** (attempts - 1), STRIPE_WEBHOOK_RETRY_MAX)
+        db.session.execute(
+            text("""
+                UPDATE stripe_webhook_events
+                SET error = :error,
+                    next_attempt_at = CASE WHEN :give_up THEN NULL
+                                           ELSE NOW() + make_interval(secs => :delay) END
+                WHERE id = :id
+            """),
+            {"error": str(e)[:2000], "give_up": give_up, "delay": delay, "id": row["id"]},
         )
-        db.session.add(webhook_row)
         db.session.commit()
-    except Exception as e:
-        print(e)
-        print("<<<<<<<<<<<<<")
-        # If this fails something is very wrong
-        return "", 500
+        print(f"[STRIPE] {row['event_type']} {row['stripe_event_id']} failed "
+              f"(attempt {attempts}{', giving up' if give_up else f', retry in {delay}s'}): {e}")
+        return False
+
+    db.session.execute(
+        text("""
+            UPDATE stripe_webhook_events
+            SET processed = TRUE, processed_at = NOW(), next_attempt_at = NULL, error = NULL
+            WHERE id = :id
+        """),
+        {"id": row["id"]},
+    )
+    db.session.commit()
+    return True
+
+
+def webhook_queue_stats():
+    """Backlog and lag of the webhook queue (seconds), for the worker log and admin."""
+    row = db.session.execute(
+        text("""
+            SELECT
+                COUNT(*) FILTER (WHERE processed = FALSE AND next_attempt_at IS NOT NULL) AS pending,
+                COUNT(*) FILTER (WHERE processed = FALSE AND next_attempt_at IS NOT NULL AND attempts > 0) AS attempted,
+                COUNT(*) FILTER (WHERE processed = FALSE AND next_attempt_at IS NULL
+                                 AND stripe_event_id IS NOT NULL) AS dead,
+                EXTRACT(EPOCH FROM NOW() - MIN(received_at)
+                        FILTER (WHERE processed = FALSE AND next_attempt_at IS NOT NULL)) AS oldest_pending_age,
+                EXTRACT(EPOCH FROM PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY processed_at - received_at)
+                        FILTER (WHERE processed_at > NOW() - INTERVAL '1 hour')) AS p50_lag_1h,
+                EXTRACT(EPOCH FROM PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY processed_at - received_at)
+                        FILTER (WHERE processed_at > NOW() - INTERVAL '1 hour')) AS p95_lag_1h
+            FROM stripe_webhook_events
+            WHERE received_at > NOW() - INTERVAL '7 days'
+               OR processed = FALSE
+        """)
+    ).mappings().one()
+    return {k: (float(v) if v is not None and k.endswith(("age", "1h")) else v) for k, v in row.items()}
+
+
+@billing_bp.route("/stripe/webhook", methods=["POST"])
+def stripe_webhook():
+    payload = request.get_data(as_text=True)
+    sig_header = request.headers.get("Stripe-Signature")
 
     try:
         event = stripe.Webhook.construct_event(
@@ -362,53 +512,28 @@ def stripe_webhook():
             sig_header,
             os.getenv("STRIPE_WEBHOOK_SECRET"),
         )
-        event_id = event["id"]
-        event_type = event["type"]
-
-        webhook_row.stripe_event_id = event_id
-        webhook_row.event_type = event_type
-        db.session.commit()
-
     except Exception as e:
-        webhook_row.error = f"Signature error: {str(e)}"
-        db.session.commit()
+        # Keep the raw request for debugging; never queued
+        try:
+            db.session.add(
+                StripeWebhookEvent(
+                    payload=payload,
+                    signature=sig_header,
+                    error=f"Signature error: {str(e)}",
+                )
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
         return "", 400
 
-    # Idempotency check
-    already_processed = (
-        StripeWebhookEvent.query
-        .filter_by(stripe_event_id=event_id, processed=True)
-        .first()
-    )
-    if already_processed:
-        return "", 200
-
     try:
-        obj = event["data"]["object"]
-
-        if event_type == "checkout.session.completed":
-            if obj.get("mode") == "subscription":
-                handle_checkout_completed(obj)
-            elif obj.get("mode") == "payment":
-                handle_credit_pack_checkout(obj)
-
-        elif event_type == "invoice.paid":
-            handle_invoice_paid(obj)
-
-        elif event_type == "invoice.payment_failed":
-            if obj.get("subscription"):
-                handle_payment_failed(obj)
-
-        elif event_type == "customer.subscription.deleted":
-            handle_subscription_deleted(obj)
-
-        webhook_row.processed = True
-        db.session.commit()
-
+        enqueue_stripe_event(event, payload, sig_header)
     except Exception as e:
-        # Log error but DO NOT return 500
-        webhook_row.error = str(e)
-        db.session.commit()
+        # Not stored: let Stripe retry
+        db.session.rollback()
+        print(f"[STRIPE] Failed to store webhook {event['id']}: {e}")
+        return "", 500
 
     return "", 200
 
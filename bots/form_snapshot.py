@@ -0,0 +1,168 @@
+# bots/form_snapshot.py
+
+"""
+One-round-trip snapshot of a form's fields.
+
+Walking fields with Playwright locators costs a browser round trip per
+is_visible / bounding_box / get_attribute / evaluate call, which adds up to
+seconds on forms with dozens of fields. snapshot_fields() reads everything
+the bots decide on (visibility, box, attributes, label, value, options) in a
+single evaluate(), and tags each element so the bot can still get a locator
+for the few fields it actually fills.
+"""
+
+from dataclasses import dataclass, field
+
+
+SNAPSHOT_ATTR = "data-hn-field"
+
+SNAPSHOT_FIELDS_JS = """
+([root, selector, closest, attr]) => {
+    root = root || document;
+    const scope = root.querySelectorAll ? root : document;
+
+    // label[for=id], then an ancestor <label>, then the nearest wrapper with a <label>
+    const labelFor = (el) => {
+        if (el.id) {
+            const l = scope.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+            if (l && l.innerText.trim()) return l.innerText.trim();
+        }
+        const anc = el.parentElement && el.parentElement.closest("label");
+        if (anc && anc.innerText.trim()) return anc.innerText.trim();
+        for (let p = el.parentElement; p; p = p.parentElement) {
+            if (Array.from(p.children).some(c => c.tagName === "LABEL")) {
+                const l = p.querySelector("label");
+                if (l && l.innerText.trim()) return l.innerText.trim();
+                break;
+            }
+        }
+        return "Question";
+    };
+
+    for (const old of scope.querySelectorAll(`[${attr}]`)) old.removeAttribute(attr);
+
+    return Array.from(scope.querySelectorAll(selector)).map((el, idx) => {
+        el.setAttribute(attr, String(idx));
+
+        const box = el.getBoundingClientRect();
+        const style = getComputedStyle(el);
+        const attrs = {};
+        for (const a of el.attributes) attrs[a.name] = a.value;
+
+        const ancestors = {};
+        for (const [key, sel] of Object.entries(closest || {})) {
+            const anc = el.parentElement && el.parentElement.closest(sel);
+            ancestors[key] = anc ? (anc.getAttribute("data-ui") || "") : null;
+        }
+
+        const tag = el.tagName.toLowerCase();
+        const parent = el.parentElement;
+
+        return {
+            index: idx,
+            tag,
+            type: el.getAttribute("type"),
+            attrs,
+            visible: box.width > 0 && box.height > 0 && style.visibility !== "hidden",
+            width: box.width,
+            height: box.height,
+            value: "value" in el ? String(el.value ?? "") : "",
+            checked: !!el.checked,
+            label: labelFor(el),
+            options: tag === "select"
+                ? Array.from(el.options).map(o => ({value: o.value, text: o.text.trim(), selected: o.selected}))
+                : [],
+            has_single_value: parent ? parent.innerHTML.includes("select__single-value") : false,
+            ancestors,
+        };
+    });
+}
+"""
+
+
+@dataclass
+class FieldSnapshot:
+    """Everything the bots inspect on one input / textarea / select."""
+    index: int
+    tag: str
+    type: str | None
+    attrs: dict
+    visible: bool
+    width: float
+    height: float
+    value: str
+    checked: bool
+    label: str
+    options: list = field(default_factory=list)
+    has_single_value: bool = False
+    ancestors: dict = field(default_factory=dict)
+
+    def attr(self, name, default=None):
+        return self.attrs.get(name, default)
+
+    @property
+    def name(self):
+        return self.attrs.get("name")
+
+    @property
+    def id(self):
+        return self.attrs.get("id")
+
+    @property
+    def css_class(self):
+        return self.attrs.get("class") or ""
+
+    @property
+    def maxlength(self):
+        try:
+            return int(self.attrs["maxlength"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @property
+    def required(self):
+        """aria-required or the required attribute; callers add the "*" label check."""
+        return (
+            (self.attrs.get("aria-required") or "").lower() == "true"
+            or "required" in self.attrs
+        )
+
+    def locator(self, root):
+        """Locator for this element, valid until the next snapshot of `root`."""
+        return root.locator(f"[{SNAPSHOT_ATTR}='{self.index}']")
+
+
+async def snapshot_fields(root, selector: str = "input, textarea, select", closest: dict | None = None):
+    """
+    Snapshot every element matching `selector` under `root` (a Page or an
+    element Locator) in one evaluate().
+
+    `closest` maps a key to a CSS selector; each snapshot's `ancestors[key]`
+    is the data-ui of the nearest matching ancestor ("" if it has none) or
+    None when there is no such ancestor. The element itself never counts.
+    """
+    args = [selector, closest or {}, SNAPSHOT_ATTR]
+    # Locator.evaluate passes the element first; Page.evaluate only the arg
+    if hasattr(root, "element_handle"):
+        rows = await root.evaluate("(root, args) => (" + SNAPSHOT_FIELDS_JS + ")([root, ...args])", args)
+    else:
+        rows = await root.evaluate("(args) => (" + SNAPSHOT_FIELDS_JS + ")([null, ...args])", args)
+
+    return [
+        FieldSnapshot(
+            index=r["index"],
+            tag=r["tag"],
+            type=r["type"],
+            attrs=r["attrs"],
+            visible=r["visible"],
+            width=r["width"],
+            height=r["height"],
+            value=r["value"],
+            checked=r["checked"],
+            label=r["label"],
+            options=r["options"],
+            has_single_value=r["has_single_value"],
+            ancestors=r["ancestors"],
+        )
+        for r in rows
+    ]
@@ -1,5 +1,4 @@
 import os
-import asyncio
 import random
 import re
 import json
@@ -8,7 +7,11 @@ from playwright.async_api import async_playwright
 from openai import AsyncOpenAI
 
 from bots.base import BaseATSBot, ApplyResult
-from utils.s3_uploader import upload_to_s3  # noqa: F401 (kept for parity with other bots)
+from utils.s3_uploader import upload_to_s3_async
+from utils.answer_engine import FormAnswerer, Question
+from utils.question_router import classify
+from bots.form_snapshot import snapshot_fields
+from bots.pacing import Pacer
 from dotenv import load_dotenv
 import random
 import secrets
@@ -27,6 +30,18 @@ HUMAN_USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 13.5; rv:132.0) Gecko/20100101 Firefox/132.0",
 ]
 
+GREENHOUSE_ANSWER_SYSTEM_MSG = (
+    "You help candidates answer Greenhouse job application questions. "
+    "Your goal is to provide responses that maximize the candidate’s chance of progressing to an interview. "
+    "If the candidate profile does not provide a clear answer, choose the safest, most positive, generally acceptable answer. "
+    "Never select or generate an answer that could disadvantage the candidate unless their profile explicitly requires it. "
+    "Do NOT invent factual information such as degrees, immigration status, job history, or legal restrictions. "
+    "If uncertain, choose the response most commonly expected by employers and least risky to the candidate. "
+    "Maintain a professional, concise tone. "
+    "For long questions, produce thoughtful but safe answers. "
+    "For short questions or yes/no questions, choose the most interview-friendly option. "
+)
+
 def random_user_agent():
     return random.choice(HUMAN_USER_AGENTS)
 
@@ -81,6 +96,12 @@ class GreenhouseBot(BaseATSBot):
             or os.getenv("DEBUG_MODE", "false").lower() == "true"
         )
 
+        # per-application answer cache/batcher, set up in apply()
+        self.form_answers = None
+
+        # human pauses / typing speed (BOT_PACING) and per-phase timing
+        self.pacing = Pacer()
+
     # ----------------- logging / helpers -----------------
 
     def should_show_browser(self) -> bool:
@@ -150,29 +171,6 @@ class GreenhouseBot(BaseATSBot):
         except Exception:
             return default
 
-    async def is_required_field(self, element, label_text):
-        try:
-            # aria-required
-            aria = await element.get_attribute("aria-required")
-            if aria and aria.lower() == "true":
-                return True
-        except:
-            pass
-
-        try:
-            # HTML required attribute
-            req = await element.get_attribute("required")
-            if req is not None:
-                return True
-        except:
-            pass
-
-        # Label contains *
-        if "*" in (label_text or ""):
-            return True
-
-        return False
-
     async def ai_pick_from_options(self, question: str, options: list[str], profile_answers: dict, ai_data) -> str:
         """
         Smart dropdown selection with full debug logging.
@@ -189,7 +187,7 @@ class GreenhouseBot(BaseATSBot):
             self.log(f"[Route] Only one option → {options[0]}")
             return options[0]
 
-        q = question.lower().strip()
+        intents = classify(question)
         pa = {k.lower(): v for k, v in (profile_answers or {}).items()}
         self.log(f"[Profile] Normalized Profile: {pa}")
 
@@ -217,28 +215,28 @@ class GreenhouseBot(BaseATSBot):
         # ---------------------------------------------------------
         # DEMOGRAPHICS
         # ---------------------------------------------------------
-        if "race" in q or "ethnicity" in q:
+        if "race" in intents:
             self.log("[Route] Demographics: race/ethnicity branch")
             chosen = match_by_value(pa.get("race"))
             if chosen:
                 self.log(f"[Return] race match -> {chosen}")
                 return chosen
 
-        if "gender" in q:
+        if "gender" in intents:
             self.log("[Route] Demographics: gender branch")
             chosen = match_by_value(pa.get("gender"))
             if chosen:
                 self.log(f"[Return] gender match -> {chosen}")
                 return chosen
 
-        if "disability" in q:
+        if "disability" in intents:
             self.log("[Route] Demographics: disability branch")
             chosen = match_by_value(pa.get("disability_status"))
             if chosen:
                 self.log(f"[Return] disability -> {chosen}")
                 return chosen
 
-        if "veteran" in q:
+        if "veteran" in intents:
             self.log("[Route] Demographics: veteran branch")
             chosen = match_by_value(pa.get("veteran_status"))
             if chosen:
@@ -248,7 +246,7 @@ class GreenhouseBot(BaseATSBot):
         # ---------------------------------------------------------
         # WORK AUTHORIZATION
         # ---------------------------------------------------------
-        if "authorization" in q or "authorized" in q or "right to work" in q:
+        if "work_authorization" in intents:
             self.log("[Route] Work authorization branch")
             allowed = pa.get("legally_allowed")
             if allowed is True:
@@ -264,7 +262,7 @@ class GreenhouseBot(BaseATSBot):
                         self.log(f"[Return] not authorized -> {chosen}")
                         return chosen
 
-        if "visa" in q or "sponsor" in q or "sponsorship" in q:
+        if "sponsorship" in intents:
             self.log("[Route] Visa/sponsorship branch")
             needs = pa.get("sponsorship_required")
             if needs is True:
@@ -283,7 +281,7 @@ class GreenhouseBot(BaseATSBot):
         # ---------------------------------------------------------
         # RELOCATION
         # ---------------------------------------------------------
-        if "relocat" in q:
+        if "relocation" in intents:
             self.log("[Route] Relocation branch")
             relocate = pa.get("willing_to_relocate")
             if relocate is True:
@@ -302,7 +300,7 @@ class GreenhouseBot(BaseATSBot):
         # ---------------------------------------------------------
         # SALARY
         # ---------------------------------------------------------
-        if "salary" in q or "compensation" in q or "pay" in q:
+        if "salary" in intents:
             self.log("[Route] Salary branch")
             desired = str(pa.get("desired_salary", "")).lower()
             chosen = match_by_value(desired)
@@ -313,7 +311,7 @@ class GreenhouseBot(BaseATSBot):
         # ---------------------------------------------------------
         # NOTICE PERIOD
         # ---------------------------------------------------------
-        if "notice" in q:
+        if "notice_period" in intents:
             self.log("[Route] Notice period branch")
             desired = str(pa.get("notice_period", "")).lower()
             chosen = match_by_value(desired)
@@ -324,7 +322,7 @@ class GreenhouseBot(BaseATSBot):
         # ---------------------------------------------------------
         # YEARS EXPERIENCE
         # ---------------------------------------------------------
-        if "experience" in q and "year" in q:
+        if "years_experience" in intents:
             self.log("[Route] Years of experience branch")
             num = str(pa.get("years_experience", "")).strip()
             chosen = match_by_value(num)
@@ -435,11 +433,11 @@ class GreenhouseBot(BaseATSBot):
         else:
             await element.click(force=True)
 
-        await asyncio.sleep(0.3)
+        await self.pacing.sleep(0.3)
 
         # 2. Trigger loading of all options
         await element.fill(" ")
-        await asyncio.sleep(0.4)
+        await self.pacing.sleep(0.4)
 
         # 3. Find menu in portal
         menu = page.locator(
@@ -475,12 +473,12 @@ class GreenhouseBot(BaseATSBot):
             opt = options.nth(i)
             if (await opt.inner_text()).strip() == chosen:
                 await opt.click()
-                await asyncio.sleep(0.2)
+                await self.pacing.sleep(0.2)
                 return
 
         # fallback: first option
         await options.first.click()
-        await asyncio.sleep(0.2)
+        await self.pacing.sleep(0.2)
 
     def _format_phone_smart(self, raw_phone, country):
         """
@@ -515,8 +513,8 @@ class GreenhouseBot(BaseATSBot):
                 x = box["x"] + random.uniform(5, box["width"] - 5)
                 y = box["y"] + random.uniform(5, box["height"] - 5)
                 await element.page.mouse.move(x, y, steps=random.randint(8, 18))
-                await asyncio.sleep(random.uniform(0.08, 0.22))
-                await element.page.mouse.click(x, y, delay=random.randint(30, 120))
+                await self.pacing.sleep(0.08, 0.22)
+                await element.page.mouse.click(x, y, delay=self.pacing.key_delay(30, 120))
             else:
                 await element.click()
         except:
@@ -529,24 +527,28 @@ class GreenhouseBot(BaseATSBot):
         # Clear any pre-filled text
         try:
             await element.fill("")
-            await asyncio.sleep(random.uniform(0.1, 0.25))
+            await self.pacing.sleep(0.1, 0.25)
         except:
             pass
 
+        if not self.pacing.profile.type_per_char:
+            await element.fill(text)
+            return
+
         for ch in text:
-            await element.type(ch, delay=random.randint(40, 120))
+            await element.type(ch, delay=self.pacing.key_delay())
 
             # Random mid-word pause
             if random.random() < 0.05:
-                await asyncio.sleep(random.uniform(0.2, 0.5))
+                await self.pacing.sleep(0.2, 0.5)
 
             # Occasional backspace + retype
             if random.random() < 0.03:
                 await element.press("Backspace")
-                await asyncio.sleep(random.uniform(0.05, 0.15))
-                await element.type(ch, delay=random.randint(60, 140))
+                await self.pacing.sleep(0.05, 0.15)
+                await element.type(ch, delay=self.pacing.key_delay(60, 140))
 
-        await asyncio.sleep(random.uniform(0.2, 0.6))
+        await self.pacing.sleep(0.2, 0.6)
 
     async def human_scroll_focus(self, element):
         """Scroll the page slightly to simulate reading behaviour"""
@@ -554,12 +556,12 @@ class GreenhouseBot(BaseATSBot):
             page = element.page
             delta = random.randint(120, 380)
             await page.mouse.wheel(0, delta)
-            await asyncio.sleep(random.uniform(0.15, 0.4))
+            await self.pacing.sleep(0.15, 0.4)
         except:
             pass
 
     async def human_sleep(self, min_s=0.4, max_s=1.2):
-        await asyncio.sleep(random.uniform(min_s, max_s))
+        await self.pacing.sleep(min_s, max_s)
 
     async def random_scroll(self, page):
         try:
@@ -579,8 +581,7 @@ class GreenhouseBot(BaseATSBot):
         except:
             pass
 
-        for ch in text:
-            await locator.type(ch, delay=random.randint(40, 120))
+        await self.pacing.type(locator, text)
 
     # ----------------- frame / form detection -----------------
 
@@ -678,24 +679,16 @@ class GreenhouseBot(BaseATSBot):
 
             screenshot_path = f"/tmp/{prefix}_{uid}_{jid}.png"
 
-            # Smooth scroll through full height
-            full_height = await page.evaluate("() => document.body.scrollHeight")
-            for _ in range(0, full_height, 600):
-                await page.mouse.wheel(0, 600)
-                await asyncio.sleep(0.25)
-
-            # Let async rendering settle
-            await asyncio.sleep(1.2)
-
-            # Scroll back to the top
-            await page.evaluate("window.scrollTo(0, 0)")
-            await asyncio.sleep(0.2)
+            # Smooth scroll through full height, let async rendering
+            # settle, then scroll back to the top
+            await self.pacing.scroll_through(page)
+            await self.pacing.sleep(0.2)
 
             # Capture screenshot
             await page.screenshot(path=screenshot_path, full_page=True)
 
             # Upload
-            screenshot_url = upload_to_s3(screenshot_path, folder="screenshots")
+            screenshot_url = await upload_to_s3_async(screenshot_path, folder="screenshots")
             self.log(f"Screenshot captured and uploaded: {screenshot_url}")
 
             return screenshot_url
@@ -752,23 +745,25 @@ class GreenhouseBot(BaseATSBot):
         if not company_name:
             company_name = "the company"
 
-        # description
+        # description: the worker's condensed brief when there is one
+        job_description = job.get("condensed_description") or ""
         selectors = [
             ".job-description",
             "[data-qa='job-description']",
             "section[role='main']",
         ]
-        for sel in selectors:
-            try:
-                loc = page.locator(sel)
-                if await loc.count() > 0:
-                    jd = await loc.first.inner_text()
-                    jd = re.sub(r"\s+", " ", jd).strip()
-                    if jd:
-                        job_description = jd
-                        break
-            except Exception:
-                pass
+        if not job_description:
+            for sel in selectors:
+                try:
+                    loc = page.locator(sel)
+                    if await loc.count() > 0:
+                        jd = await loc.first.inner_text()
+                        jd = re.sub(r"\s+", " ", jd).strip()
+                        if jd:
+                            job_description = jd
+                            break
+                except Exception:
+                    pass
 
         if len(job_description) > 2000:
             job_description = job_description[:2000]
@@ -788,6 +783,8 @@ class GreenhouseBot(BaseATSBot):
             return ApplyResult(status="failed", message="No job URL found")
 
         self.log(f"Starting Greenhouse apply to: {url}")
+        self.pacing.reset()
+        self.form_answers = None
 
         # parse ai_cv_data
         ai_raw = self.g(user, "ai_cv_data")
@@ -862,19 +859,22 @@ class GreenhouseBot(BaseATSBot):
         """)
 
         page = await context.new_page()
+        self.pacing.mark("launch")
 
         try:
             self.log("Navigating to job page")
             await page.goto(url, timeout=60000)
 
-            self.log("Waiting briefly for Apply button to render")
-            await page.wait_for_timeout(1500)
+            self.log("Waiting for Apply button or form to render")
+            await self.pacing.wait_for(
+                page.locator("button:has-text('Apply'), a:has-text('Apply'), form"), state="attached"
+            )
             await self.human_sleep(0.4, 1.4)
 
             await self.click_cookie_banners(page)
             await self.human_sleep(0.4, 1.4)
 
-            await page.wait_for_timeout(1500)
+            await self.pacing.wait_for_load(page)
 
             apply_btn = page.locator("button:has-text('Apply'), a:has-text('Apply')")
             btn_count = await apply_btn.count()
@@ -884,15 +884,27 @@ class GreenhouseBot(BaseATSBot):
                 self.log("Clicking Apply button")
                 await self.human_sleep(0.4, 1.4)
                 await apply_btn.first.click()
-                await page.wait_for_timeout(2000)
+                await self.pacing.wait_for_load(page, "domcontentloaded")
+            self.pacing.mark("open_page")
 
             self.log("Waiting for Greenhouse form to load")
             form = await self.wait_for_greenhouse_form(page)
             self.log("Greenhouse form found and ready")
+            self.pacing.mark("find_form")
 
             # job context for LLM answers later
             job_title, company_name, job_description = await self.extract_job_context(page, job)
 
+            # batch-answer the open questions in the background while we fill the basics
+            self.form_answers = FormAnswerer(
+                user_id=self.g(user, "user_id"),
+                source="greenhouse",
+                system_msg=GREENHOUSE_ANSWER_SYSTEM_MSG + "Each answer MUST NOT exceed its max_character_length.",
+                context=self.answer_context(ai_data, profile_answers, job_title, company_name, job_description),
+            )
+            await self.prefetch_answers(form, ai_data, profile_answers)
+            self.pacing.mark("job_context")
+
             # core profile fields from ai_data
             first_name = ai_data.get("first_name") or self.g(user, "first_name", "") or ""
             last_name = ai_data.get("last_name") or self.g(user, "last_name", "") or ""
@@ -910,10 +922,12 @@ class GreenhouseBot(BaseATSBot):
             self.log("Handling phone field")
             await self.handle_phone(form, ai_data, user)
             await self.human_sleep(0.4, 1.4)
+            self.pacing.mark("basic_fields")
 
             self.log("Uploading resume")
             await self.handle_resume_upload(form, cv_path)
             await self.human_sleep(0.4, 1.4)
+            self.pacing.mark("resume")
 
             self.log("Handling custom questions")
             await self.handle_custom_questions(
@@ -924,8 +938,10 @@ class GreenhouseBot(BaseATSBot):
                 company_name,
                 job_description,
             )
+            self.pacing.mark("custom_questions")
 
             screenshot_url = await self.capture_final_screenshot(page, user, job, prefix="gh_success")
+            self.pacing.mark("screenshot")
             self.log("Submitting application")
             submit = form.locator(
                 "button[type='submit'], input[type='submit'], button:has-text('Submit'), button:has-text('Apply'), input[value*='Apply']"
@@ -939,17 +955,19 @@ class GreenhouseBot(BaseATSBot):
                 await playwright.stop()
                 return ApplyResult(status="failed", message="Submit button not found")
 
-            await page.wait_for_timeout(4000)
-            body = await page.text_content("body") or ""
-            self.log(f"Submission check body length: {len(body)}")
-
-            lower_body = body.lower()
             success_phrases = [
                 "thank you for applying",
                 "thank you for your application",
                 "application received",
                 "thank you for submitting",
             ]
+            await self.pacing.wait_for_text(page, success_phrases)
+            self.pacing.mark("submit")
+
+            body = await page.text_content("body") or ""
+            self.log(f"Submission check body length: {len(body)}")
+
+            lower_body = body.lower()
             if any(p in lower_body for p in success_phrases):
                 self.log("Application appears successful")
                 await browser.close()
@@ -994,6 +1012,10 @@ class GreenhouseBot(BaseATSBot):
                 screenshot_url=screenshot_url
             )
 
+        finally:
+            self.pacing.mark("finish")
+            self.log(f"Timings {self.pacing.summary()}")
+
 
     # ----------------- field handlers -----------------
 
@@ -1070,7 +1092,7 @@ class GreenhouseBot(BaseATSBot):
                 if await btn.count() > 0:
                     self.log(f"[CookieBanner] Clicking: {selector}")
                     await btn.first.click(timeout=2000)
-                    await page.wait_for_timeout(300)
+                    await self.pacing.sleep(0.3)
                     return True
             except Exception as e:
                 self.log(f"[CookieBanner] Failed selector {selector}: {e}")
@@ -1296,6 +1318,15 @@ class GreenhouseBot(BaseATSBot):
 
         return question_text, group
 
+    async def is_revealed(self, element):
+        try:
+            if not await element.is_visible():
+                return False
+            box = await element.bounding_box()
+        except Exception:
+            return False
+        return bool(box) and box["width"] >= 3 and box["height"] >= 3
+
     async def handle_custom_questions(
             self,
             form,
@@ -1307,55 +1338,34 @@ class GreenhouseBot(BaseATSBot):
     ):
         self.log("Scanning for custom question fields")
 
-        locator = form.locator("input, textarea, select")
         try:
-            total = await locator.count()
+            fields = await snapshot_fields(form)
         except Exception as e:
-            self.log(f"Error counting form fields: {e}")
+            self.log(f"Error scanning form fields: {e}")
             return
 
-        for i in range(total):
-            element = locator.nth(i)
-
-            try:
-                # --- SPEED BOOST: SKIP invisible items immediately ---
-                try:
-                    if not await element.is_visible():
-                        self.log(f"Skipping invisible element #{i}")
-                        continue
-                except:
-                    continue
-
-                # --- SPEED BOOST: Skip zero-size ghost elements ---
-                try:
-                    box = await element.bounding_box()
-                    if not box or box["width"] < 3 or box["height"] < 3:
-                        self.log(f"Skipping tiny/hidden element #{i}")
-                        continue
-                except:
-                    continue
+        for field in fields:
+            i = field.index
 
-                # Now safe to inspect attributes
-                try:
-                    name = await element.get_attribute("name")
-                    tag = await element.evaluate("e => e.tagName.toLowerCase()")
-                    etype = await element.get_attribute("type")
-                    css_class = (await element.get_attribute("class") or "")
-                    if "iti__" in css_class:
-                        self.log("Skipping phone widget internal field")
-                        continue
-                except Exception as e:
-                    self.log(f"Error inspecting element {i}: {e}")
-                    continue
-                if "iti__" in css_class:
-                    self.log("Skipping phone-widget internal field")
+            # The snapshot predates every answer filled below, so a
+            # follow-up question revealed by an earlier select / radio /
+            # checkbox still reads as hidden there; check those live.
+            if not field.visible or field.width < 3 or field.height < 3:
+                if not await self.is_revealed(field.locator(form)):
+                    self.log(f"Skipping invisible element #{i}")
                     continue
-            except Exception as e:
-                self.log(f"Error inspecting element {i}: {e}")
+                self.log(f"Element #{i} revealed by an earlier answer")
+
+            name = field.name
+            tag = field.tag
+            etype = field.type
+            css_class = field.css_class
+            if "iti__" in css_class:
+                self.log("Skipping phone widget internal field")
                 continue
 
-            current_value = await element.input_value()
-            if current_value and "select__single-value" in (await element.evaluate("e => e.parentElement.innerHTML")):
+            current_value = field.value
+            if current_value and field.has_single_value:
                 self.log("React-select already has a value, skipping.")
                 continue
 
@@ -1367,25 +1377,20 @@ class GreenhouseBot(BaseATSBot):
             if etype in ["hidden", "submit", "button", "file"]:
                 continue
             # Skip if this is a core identity field by ID
-            el_id = await element.get_attribute("id")
+            el_id = field.id
             if el_id in ["first_name", "last_name", "email", "phone"]:
                 self.log(f"Skipping core identity field by ID: {el_id}")
                 continue
 
-
-            label = await self.find_label(form, element)
+            element = field.locator(form)
+            label = field.label
             self.log(f"Found question: '{label}' (name={name}, type={tag}/{etype})")
             # Skip identity fields by label, in case name/id are missing
             if label.lower().strip() in ["first name*", "last name*", "email*", "email", "first name", "last name"]:
                 self.log(f"Skipping core identity field by label: {label}")
                 continue
 
-            maxlength = await element.get_attribute("maxlength")
-            if maxlength:
-                try:
-                    maxlength = int(maxlength)
-                except:
-                    maxlength = None
+            maxlength = field.maxlength
 
             # generate answer
             answer = await self.route_question_answer(
@@ -1400,13 +1405,13 @@ class GreenhouseBot(BaseATSBot):
             )
 
             # Detect required field
-            is_required = await self.is_required_field(element, label)
+            is_required = field.required or "*" in (label or "")
 
             if (not answer or not str(answer).strip()):
                 if is_required:
                     self.log(
                         f"[REQUIRED] No answer generated for required field '{label}'. Forcing default safe answer.")
-                    answer = "N/A" if (await element.get_attribute("type")) == "text" else "Yes"
+                    answer = "N/A" if etype == "text" else "Yes"
                 else:
                     self.log("Answer empty or whitespace, skipping optional field")
                     continue
@@ -1417,12 +1422,12 @@ class GreenhouseBot(BaseATSBot):
             # 1. REACT-SELECT HANDLER (must come before all other logic!)
             # ------------------------------------------------------------
 
-            is_combobox = (await element.get_attribute("role")) == "combobox"
+            is_combobox = field.attr("role") == "combobox"
             is_react = "select__input" in css_class or "css-" in css_class  # self-host often uses css hash classes
             if is_combobox or is_react:
                 self.log(f"Detected react-select input for '{label}'")
                 await self.handle_react_select(element, label, profile_answers, ai_data)
-                await asyncio.sleep(random.uniform(0.9, 1.4))
+                await self.pacing.sleep(0.9, 1.4)
                 continue
 
             # ------------------------------------------------------------
@@ -1445,7 +1450,7 @@ class GreenhouseBot(BaseATSBot):
 
                 elif tag == "select":
                     self.log("Selecting option for <select>")
-                    await self.select_random_option(element)
+                    await self.select_random_option(element, [o["value"] for o in field.options])
 
                 elif tag == "input" and etype == "checkbox":
 
@@ -1500,24 +1505,27 @@ class GreenhouseBot(BaseATSBot):
                 self.log(f"Failed to fill custom field {name}: {e}")
 
             # small pause between fields
-            await asyncio.sleep(random.uniform(2.3, 3.4))
-
-    async def select_random_option(self, select_element):
-        try:
-            opts = select_element.locator("option")
-            count = await opts.count()
-        except Exception as e:
-            self.log(f"Option locator error: {e}")
-            return
+            await self.pacing.field_pause()
 
+    async def select_random_option(self, select_element, option_values=None):
         values = []
-        for i in range(count):
+        if option_values is not None:
+            values = [v for v in option_values if (v or "").strip()]
+        else:
             try:
-                value = await opts.nth(i).get_attribute("value")
-                if (value or "").strip():
-                    values.append(value)
+                opts = select_element.locator("option")
+                count = await opts.count()
             except Exception as e:
-                self.log(f"Error reading option {i}: {e}")
+                self.log(f"Option locator error: {e}")
+                return
+
+            for i in range(count):
+                try:
+                    value = await opts.nth(i).get_attribute("value")
+                    if (value or "").strip():
+                        values.append(value)
+                except Exception as e:
+                    self.log(f"Error reading option {i}: {e}")
 
         if values:
             choice = random.choice(values)
@@ -1531,45 +1539,6 @@ class GreenhouseBot(BaseATSBot):
         else:
             self.log("No valid options found for dropdown")
 
-    async def find_label(self, form, element):
-        """
-        Robust multi-strategy label extraction that works for self-hosted forms.
-        """
-
-        # 1. label[for=id]
-        try:
-            el_id = await element.get_attribute("id")
-            if el_id:
-                lbl = form.locator(f"label[for='{el_id}']")
-                if await lbl.count() > 0:
-                    txt = await lbl.first.inner_text()
-                    if txt:
-                        return txt.strip()
-        except:
-            pass
-
-        # 2. Closest ancestor <label>
-        try:
-            wrapper = element.locator("xpath=ancestor::label")
-            if await wrapper.count() > 0:
-                txt = await wrapper.first.inner_text()
-                if txt:
-                    return txt.strip()
-        except:
-            pass
-
-        # 3. Self-hosted field wrappers like: <div class="field"> <label>Question</label>
-        try:
-            wrapper = element.locator("xpath=ancestor::*[label][1]")
-            if await wrapper.count() > 0:
-                txt = await wrapper.locator("label").first.inner_text()
-                if txt:
-                    return txt.strip()
-        except:
-            pass
-
-        return "Question"
-
     # ----------------- routing and LLM -----------------
 
     async def route_question_answer(
@@ -1587,28 +1556,47 @@ class GreenhouseBot(BaseATSBot):
         Decide whether to answer deterministically from ai_data
         or with LLM, and in which style.
         """
-        label_norm = (label or "").lower().strip()
+        direct = self.deterministic_answer(label, ai_data, profile_answers)
+        if direct is not None:
+            return direct
+
+        return await self.llm_generate_answer(
+            label,
+            ai_data,
+            profile_answers,
+            job_title,
+            company_name,
+            job_description,
+            max_length=maxlength,
+        )
+
+    def deterministic_answer(self, label: str, ai_data: dict, profile_answers: dict):
+        """
+        Answer from ai_data / profile answers without the LLM.
+        Returns None when the question needs the LLM.
+        """
+        intents = classify(label)
 
         # PERSONAL INFO
-        if "phone" in label_norm:
+        if "phone" in intents:
             return ai_data.get("phone") or self.g(profile_answers, "phone", "")
 
-        if "email" in label_norm:
+        if "email" in intents:
             return ai_data.get("email") or self.g(profile_answers, "email", "")
 
-        if "preferred first" in label_norm:
+        if "preferred_first_name" in intents:
             return ai_data.get("first_name") or self.g(profile_answers, "first_name", "")
 
-        if "first name" in label_norm and "preferred" not in label_norm:
+        if "first_name" in intents:
             return ai_data.get("first_name") or self.g(profile_answers, "first_name", "")
 
-        if "last name" in label_norm:
+        if "last_name" in intents:
             return ai_data.get("last_name") or self.g(profile_answers, "last_name", "")
 
-        if "address" in label_norm and "email" not in label_norm:
+        if "address" in intents:
             return ai_data.get("address") or self.g(profile_answers, "address", "")
 
-        if "city" in label_norm and "state" not in label_norm:
+        if "city" in intents:
             addr = ai_data.get("address") or self.g(profile_answers, "address", "")
             if addr and "," in addr:
                 parts = [p.strip() for p in addr.split(",") if p.strip()]
@@ -1619,33 +1607,31 @@ class GreenhouseBot(BaseATSBot):
         # SOCIAL
         add_det = ai_data.get("additional_details", {}) if isinstance(ai_data.get("additional_details"), dict) else {}
 
-        if "linkedin" in label_norm:
-            return add_det.get("linkedin", "")
+        if "linkedin" in intents:
+            return add_det.get("linkedin") or ""
 
-        if "website" in label_norm or "portfolio" in label_norm:
-            return add_det.get("portfolio", "")
+        if "website" in intents:
+            return add_det.get("portfolio") or ""
 
         # HIGH-RISK EMPLOYABILITY QUESTIONS (ALWAYS ANSWER SAFELY)
-        q = label_norm
-
         # Non-compete, confidentiality, restrictive covenants
-        if "restrictive" in q or "covenant" in q or "non compete" in q or "non-compete" in q:
+        if "restrictive_covenant" in intents:
             return "No"
 
         # Legal limitations on duties
-        if "limited" in q and "job" in q:
+        if "duty_limitation" in intents:
             return "No"
 
         # Can you provide a copy of the agreement?
-        if "agreement" in q and "copy" in q:
+        if "agreement_copy" in intents:
             return "N/A"
 
         # Previous interview within past year (safest is No)
-        if "previously interviewed" in q or "interviewed with" in q:
+        if "previously_interviewed" in intents:
             return "No"
 
         # Willingness to commute / local area questions
-        if "local" in q or "commute" in q:
+        if "commute" in intents:
             return "Yes"  # Always positive unless profile says otherwise
 
         # EDUCATION
@@ -1655,18 +1641,18 @@ class GreenhouseBot(BaseATSBot):
             institution = edu[0].get("institution", "")
             graduation = edu[0].get("graduation_year", "")
 
-            if "school" in label_norm or "university" in label_norm or "institution" in label_norm:
+            if "school" in intents:
                 return institution
 
-            if "degree" in label_norm:
+            if "degree" in intents:
                 return degree
 
-            if "discipline" in label_norm:
+            if "discipline" in intents:
                 if "nurs" in degree.lower():
                     return "Nursing"
                 return degree.split()[0] if degree else "General Studies"
 
-            if "graduation" in label_norm or ("year" in label_norm and "start" not in label_norm and "end" not in label_norm):
+            if "graduation_year" in intents:
                 return graduation or "2012"
 
         # EXPERIENCE
@@ -1685,84 +1671,32 @@ class GreenhouseBot(BaseATSBot):
                 m = re.search(r"\d{4}", s)
                 return m.group(0) if m else "2020"
 
-            if "start date month" in label_norm:
+            if "exp_start_month" in intents:
                 return extract_month(start_date)
 
-            if "start date year" in label_norm:
+            if "exp_start_year" in intents:
                 return extract_year(start_date)
 
-            if "end date month" in label_norm:
+            if "exp_end_month" in intents:
                 return extract_month(end_date)
 
-            if "end date year" in label_norm:
+            if "exp_end_year" in intents:
                 return extract_year(end_date)
 
-            if "company" in label_norm:
+            if "company" in intents:
                 return company
 
-            if "role" in label_norm or "title" in label_norm:
+            if "role_title" in intents:
                 return role
 
-        # TRULY GENERIC LABEL
-        if not label_norm or label_norm == "question" or len(label_norm) < 3:
-            return await self.llm_generate_answer(
-                label,
-                ai_data,
-                profile_answers,
-                job_title,
-                company_name,
-                job_description,
-                short_mode=True,
-            )
-
-        # DECIDE SHORT OR LONG LLM ANSWER
-        long_keywords = [
-            "why",
-            "explain",
-            "describe",
-            "tell us",
-            "motivation",
-            "cover letter",
-            "biggest strength",
-            "biggest weakness",
-            "challenge",
-            "impact",
-            "project",
-            "situation",
-            "example",
-        ]
-        is_long = any(k in label_norm for k in long_keywords)
-
-        return await self.llm_generate_answer(
-            label,
-            ai_data,
-            profile_answers,
-            job_title,
-            company_name,
-            job_description,
-            max_length=maxlength,
-        )
-
-    async def llm_generate_answer(
-        self,
-        question: str,
-        ai_data: dict,
-        profile_answers: dict,
-        job_title: str,
-        company_name: str,
-        job_description: str,
-        max_length: int | None,
-    ):
-        summary = ai_data.get("summary", "")
-        skills = ai_data.get("skills", [])
-        titles = ai_data.get("job_titles", [])[:3]
-        experience = ai_data.get("experience", [])
-        if not max_length:
-            # Default max for text fields
-            max_length = 255
+        return None
 
+    def answer_context(self, ai_data, profile_answers, job_title, company_name, job_description):
+        """
+        Candidate + job context shared by every LLM answer on one form.
+        """
         experience_snippets = []
-        for exp in experience[:2]:
+        for exp in ai_data.get("experience", [])[:2]:
             if not isinstance(exp, dict):
                 continue
             experience_snippets.append(
@@ -1777,48 +1711,83 @@ class GreenhouseBot(BaseATSBot):
         for key in ["race", "gender", "disability_status", "veteran_status"]:
             safe_app.pop(key, None)
 
-        is_salary_question = any(
-            kw in (question or "").lower()
-            for kw in [
-                "salary",
-                "compensation",
-                "pay range",
-                "remuneration",
-                "annual pay",
-                "expected pay",
-                "expected earnings",
-                "ctc",
-            ]
+        return {
+            "job_title": job_title,
+            "company_name": company_name,
+            "job_description": job_description,
+            "cv_summary": ai_data.get("summary", ""),
+            "skills": ai_data.get("skills", []),
+            "target_job_titles": ai_data.get("job_titles", [])[:3],
+            "experience_highlights": experience_snippets,
+            "application_data": safe_app,
+        }
+
+    def answer_question(self, question: str, max_length: int | None) -> Question:
+        max_length = max_length or 255
+        return Question(
+            text=question,
+            style=f"max:{max_length}",
+            payload={
+                "max_character_length": max_length,
+                "allow_salary_mention": "salary" in classify(question),
+            },
         )
 
+    async def prefetch_answers(self, form, ai_data, profile_answers):
+        """
+        Read every visible free-text question in one evaluate() and start
+        a single batched LLM call for those that can't be answered from
+        the profile.
+        """
+        try:
+            fields = await snapshot_fields(form)
+        except Exception as e:
+            self.log(f"[Prefetch] question scan failed: {e}")
+            return
+
+        questions = []
+        for f in fields:
+            if f.width < 3 or f.height < 3 or "iti__" in f.css_class:
+                continue
+            if f.type in ["hidden", "submit", "button", "file"]:
+                continue
+            if f.name in ["first_name", "last_name", "email", "phone"] or f.id in ["first_name", "last_name", "email", "phone"]:
+                continue
+            label = f.label
+            if label.lower().strip() in ["first name*", "last name*", "email*", "email", "first name", "last name"]:
+                continue
+            if self.deterministic_answer(label, ai_data, profile_answers) is None:
+                questions.append(self.answer_question(label, f.maxlength))
+
+        self.log(f"[Prefetch] {len(questions)} questions queued for batch answering")
+        if questions:
+            self.form_answers.prefetch(questions)
+
+    async def llm_generate_answer(
+        self,
+        question: str,
+        ai_data: dict,
+        profile_answers: dict,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        max_length: int | None,
+    ):
+        spec = self.answer_question(question, max_length)
+        max_length = spec.payload["max_character_length"]
+
         system_msg = (
-            "You help candidates answer Greenhouse job application questions. "
-            "Your goal is to provide responses that maximize the candidate’s chance of progressing to an interview. "
-            "If the candidate profile does not provide a clear answer, choose the safest, most positive, generally acceptable answer. "
-            "Never select or generate an answer that could disadvantage the candidate unless their profile explicitly requires it. "
-            "Do NOT invent factual information such as degrees, immigration status, job history, or legal restrictions. "
-            "If uncertain, choose the response most commonly expected by employers and least risky to the candidate. "
-            "Maintain a professional, concise tone. "
-            "For long questions, produce thoughtful but safe answers. "
-            "For short questions or yes/no questions, choose the most interview-friendly option. "
-            f"- Your answer MUST NOT exceed {max_length} characters. If necessary, shorten or summarise the answer."
+            GREENHOUSE_ANSWER_SYSTEM_MSG
+            + f"- Your answer MUST NOT exceed {max_length} characters. If necessary, shorten or summarise the answer."
         )
 
         user_msg = {
             "question": question,
-            "job_title": job_title,
-            "company_name": company_name,
-            "job_description": job_description,
-            "cv_summary": summary,
-            "skills": skills,
-            "target_job_titles": titles,
-            "experience_highlights": experience_snippets,
-            "application_data": safe_app,
-            "max_character_length": max_length,
-            "allow_salary_mention": is_salary_question,
+            **self.answer_context(ai_data, profile_answers, job_title, company_name, job_description),
+            **spec.payload,
         }
 
-        try:
+        async def generate():
             resp = await client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -1828,7 +1797,13 @@ class GreenhouseBot(BaseATSBot):
                 max_tokens=260,
                 temperature=0.45,
             )
-            answer = resp.choices[0].message.content.strip()
+            return resp.choices[0].message.content.strip()
+
+        try:
+            if self.form_answers:
+                answer = await self.form_answers.answer(spec, generate)
+            else:
+                answer = await generate()
         except Exception as e:
             if self.debug:
                 print("[Greenhouse DEBUG] LLM error:", e)
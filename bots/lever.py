@@ -12,7 +12,9 @@ from openai import AsyncOpenAI
 from bs4 import BeautifulSoup
 
 from bots.base import BaseATSBot, ApplyResult
-from utils.s3_uploader import upload_to_s3
+from utils.s3_uploader import upload_to_s3_async
+from utils.question_router import classify
+from bots.pacing import Pacer
 
 import requests
 
@@ -41,11 +43,14 @@ class LeverBot(BaseATSBot):
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
         ]
 
+        # human pauses / typing speed (BOT_PACING) and per-phase timing
+        self.pacing = Pacer()
+
     # ============================================================
     # Human style helpers
     # ============================================================
     async def human_sleep(self, min_s=0.4, max_s=1.2):
-        await asyncio.sleep(random.uniform(min_s, max_s))
+        await self.pacing.sleep(min_s, max_s)
 
     async def human_mouse_move(self, page, target_x, target_y, steps=20):
         # Start from some random point in the viewport
@@ -59,7 +64,7 @@ class LeverBot(BaseATSBot):
             xt = start_x + (target_x - start_x) * (t * t)
             yt = start_y + (target_y - start_y) * (t * t)
             await page.mouse.move(xt, yt, steps=1)
-            await asyncio.sleep(random.uniform(0.01, 0.04))
+            await self.pacing.sleep(0.01, 0.04)
 
     async def human_type(self, locator, text: str):
         try:
@@ -72,8 +77,7 @@ class LeverBot(BaseATSBot):
         except Exception:
             pass
 
-        for ch in text:
-            await locator.type(ch, delay=random.randint(40, 120))
+        await self.pacing.type(locator, text)
 
     async def move_mouse_to_locator(self, page, locator):
         try:
@@ -103,6 +107,7 @@ class LeverBot(BaseATSBot):
             profile_answers = {}
 
         q = (question or "").strip().lower()
+        intents = classify(q)
 
         # Profile stored answers
         if profile_answers:
@@ -112,52 +117,50 @@ class LeverBot(BaseATSBot):
                     return str(val)
 
         # Simple resume based answers
-        if "name" in q and "full" in q:
+        if "full_name" in intents:
             first = ai_data.get("first_name", "")
             last = ai_data.get("last_name", "")
             full = f"{first} {last}".strip()
             if full:
                 return full
 
-        if "first name" in q:
+        if "first_name" in intents or "preferred_first_name" in intents:
             return ai_data.get("first_name", "") or ai_data.get("given_name", "")
 
-        if "last name" in q or "surname" in q or "family name" in q:
+        if "last_name" in intents:
             return ai_data.get("last_name", "") or ai_data.get("family_name", "")
 
-        if "email" in q:
+        if "email" in intents:
             return ai_data.get("email", "")
 
-        if "phone" in q or "mobile" in q or "telephone" in q:
+        if "phone" in intents:
             return ai_data.get("phone", "")
 
-        if "skills" in q:
+        if "skills" in intents:
             skills = ai_data.get("skills", [])
             if isinstance(skills, list):
                 return ", ".join(skills[:8])
             return str(skills)
 
-        if "experience" in q:
+        if "experience" in intents:
             return ai_data.get("summary", "I have strong relevant experience for this role.")
 
         # Eligibility and logistics
-        if "authorized" in q or "authorised" in q:
-            return "Yes"
-        if "work permit" in q or "work authorization" in q or "work authorisation" in q:
+        if "work_authorization" in intents:
             return "Yes"
-        if "sponsor" in q or "visa" in q:
+        if "sponsorship" in intents:
             return "No"
-        if "relocate" in q or "relocation" in q:
+        if "relocation" in intents:
             return "Yes"
-        if "start" in q or "availability" in q or "available to begin" in q:
+        if "start" in intents or "availability" in intents:
             return "Immediately"
-        if "salary" in q or "compensation" in q or "pay expectation" in q:
+        if "salary" in intents:
             return "Open to a fair market rate"
 
         # Common yes or no style
-        if "criminal" in q or "offence" in q or "offense" in q:
+        if "criminal_record" in intents:
             return "No"
-        if "disability" in q and "accommodation" in q:
+        if "disability_accommodation" in intents:
             return "No accommodation is required."
 
         # Default positive answer
@@ -669,6 +672,7 @@ Then end with a finish action.
 
         proxy_config = self.pick_proxy()
         user_agent = self.pick_user_agent()
+        self.pacing.reset()
 
         try:
             async with async_playwright() as p:
@@ -688,6 +692,7 @@ Then end with a finish action.
                     )
 
                     page = await context.new_page()
+                    self.pacing.mark("launch")
 
                     await page.goto(job_url, timeout=60000)
                     await page.wait_for_load_state("domcontentloaded")
@@ -707,6 +712,7 @@ Then end with a finish action.
                                 await self.random_scroll(page)
                     except Exception:
                         pass
+                    self.pacing.mark("open_page")
 
                     state = {
                         "submit_clicked": False,
@@ -743,6 +749,7 @@ Then end with a finish action.
                             break
 
                         await self.human_sleep(0.8, 1.5)
+                    self.pacing.mark("agent_loop")
 
                     # Hybrid resume upload fallback
                     if not state["cv_uploaded"]:
@@ -771,7 +778,7 @@ Then end with a finish action.
                                     )
                                     await self.human_sleep(0.4, 1.0)
                                     await page.mouse.down()
-                                    await asyncio.sleep(random.uniform(0.05, 0.25))
+                                    await self.pacing.sleep(0.05, 0.25)
                                     await page.mouse.up()
                                     await self.human_sleep(0.6, 1.3)
 
@@ -785,17 +792,20 @@ Then end with a finish action.
                         # Backend parseResume path kept disabled for now
                         # to avoid complexity and risk of mismatch
 
+                    self.pacing.mark("resume")
+
                     final_url = page.url
                     screenshot_path = f"/tmp/lever_agent_{user.get('user_id')}_{job.get('id')}.png"
                     screenshot_url = None
 
                     try:
                         await page.screenshot(path=screenshot_path, full_page=True)
-                        screenshot_url = upload_to_s3(
+                        screenshot_url = await upload_to_s3_async(
                             screenshot_path, folder="screenshots"
                         )
                     except Exception:
                         pass
+                    self.pacing.mark("screenshot")
 
                     if self.test_mode:
                         return ApplyResult("success", "Test mode complete", screenshot_url)
@@ -853,3 +863,7 @@ Then end with a finish action.
 
         except Exception as e:
             return ApplyResult("retry", f"Lever agent error: {str(e)}")
+
+        finally:
+            self.pacing.mark("finish")
+            print(f"[LeverBot] Timings {self.pacing.summary()}")
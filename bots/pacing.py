@@ -0,0 +1,181 @@
+# bots/pacing.py
+
+"""
+Shared pacing for the ATS bots.
+
+All deliberate waits (human-like pauses, per-character typing, the scroll
+before the final screenshot) go through a Pacer built from a named profile,
+so fixture / test runs can use "fast" while production keeps "standard".
+The Pacer also records how long each apply() phase took and how much of
+that was spent in deliberate waits.
+
+    BOT_PACING=fast python scripts/...
+"""
+
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PacingProfile:
+    name: str
+    sleep_scale: float            # multiplier on every human pause
+    type_per_char: bool           # False → fill() the whole value at once
+    type_delay_ms: tuple          # per-character key delay range
+    field_pause: tuple            # pause between custom questions (seconds)
+    screenshot_step_px: int       # scroll step before the final screenshot, 0 = no scroll-through
+    screenshot_step_s: float
+    screenshot_settle_s: float
+    condition_timeout_ms: int     # cap for wait-for-condition calls that replaced fixed waits
+
+
+PROFILES = {
+    "standard": PacingProfile(
+        name="standard",
+        sleep_scale=1.0,
+        type_per_char=True,
+        type_delay_ms=(40, 120),
+        field_pause=(2.3, 3.4),
+        screenshot_step_px=600,
+        screenshot_step_s=0.25,
+        screenshot_settle_s=1.2,
+        condition_timeout_ms=10000,
+    ),
+    "fast": PacingProfile(
+        name="fast",
+        sleep_scale=0.0,
+        type_per_char=False,
+        type_delay_ms=(0, 0),
+        field_pause=(0, 0),
+        screenshot_step_px=0,
+        screenshot_step_s=0,
+        screenshot_settle_s=0,
+        condition_timeout_ms=5000,
+    ),
+}
+
+DEFAULT_PACING = os.getenv("BOT_PACING", "standard")
+
+
+def get_profile(name: str | None = None) -> PacingProfile:
+    name = (name or DEFAULT_PACING).lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown pacing profile '{name}' (expected one of {sorted(PROFILES)})")
+    return PROFILES[name]
+
+
+class Pacer:
+    def __init__(self, profile: PacingProfile | str | None = None):
+        self.profile = profile if isinstance(profile, PacingProfile) else get_profile(profile)
+        self.reset()
+
+    # ---------------- waits ----------------
+
+    async def sleep(self, min_s: float, max_s: float | None = None):
+        """A human pause of uniform(min_s, max_s), scaled by the profile."""
+        seconds = random.uniform(min_s, max_s if max_s is not None else min_s) * self.profile.sleep_scale
+        await self._wait(seconds)
+
+    async def _wait(self, seconds: float):
+        if seconds <= 0:
+            return
+        self.waited += seconds
+        await asyncio.sleep(seconds)
+
+    async def field_pause(self):
+        await self.sleep(*self.profile.field_pause)
+
+    def key_delay(self, low: int | None = None, high: int | None = None) -> int:
+        """Per-character delay (ms) for locator.type(); 0 in the fast profile."""
+        if not self.profile.type_per_char:
+            return 0
+        lo, hi = self.profile.type_delay_ms
+        return random.randint(low if low is not None else lo, high if high is not None else hi)
+
+    async def type(self, locator, text: str):
+        """
+        Type `text` into a focused, cleared field: per character in the
+        standard profile, a single fill() in the fast one.
+        """
+        if not self.profile.type_per_char:
+            await locator.fill(text)
+            return
+
+        started = time.perf_counter()
+        for ch in text:
+            await locator.type(ch, delay=self.key_delay())
+        self.waited += time.perf_counter() - started
+
+    async def wait_for(self, locator, state: str = "visible", timeout_ms: int | None = None) -> bool:
+        """Wait for `locator` to reach `state`. Returns False on timeout instead of raising."""
+        try:
+            await locator.first.wait_for(state=state, timeout=timeout_ms or self.profile.condition_timeout_ms)
+            return True
+        except Exception:
+            return False
+
+    async def wait_for_text(self, page, phrases, timeout_ms: int | None = None) -> bool:
+        """Wait until the page body contains any of `phrases` (case-insensitive)."""
+        try:
+            await page.wait_for_function(
+                """(phrases) => {
+                    const body = (document.body && document.body.innerText || "").toLowerCase();
+                    return phrases.some(p => body.includes(p));
+                }""",
+                arg=[p.lower() for p in phrases],
+                timeout=timeout_ms or self.profile.condition_timeout_ms,
+            )
+            return True
+        except Exception:
+            return False
+
+    async def wait_for_load(self, page, state: str = "load", timeout_ms: int | None = None) -> bool:
+        try:
+            await page.wait_for_load_state(state, timeout=timeout_ms or self.profile.condition_timeout_ms)
+            return True
+        except Exception:
+            return False
+
+    async def scroll_through(self, page):
+        """Scroll the whole page so lazy content renders, then back to the top."""
+        step = self.profile.screenshot_step_px
+        if step:
+            full_height = await page.evaluate("() => document.body.scrollHeight")
+            for _ in range(0, full_height, step):
+                await page.mouse.wheel(0, step)
+                await self._wait(self.profile.screenshot_step_s)
+
+            # Let async rendering settle
+            await self._wait(self.profile.screenshot_settle_s)
+
+        await page.evaluate("window.scrollTo(0, 0)")
+
+    # ---------------- phase timing ----------------
+
+    def reset(self):
+        """Start timing a new application."""
+        self.timings = {}
+        self.waited = 0.0
+        self._started = time.perf_counter()
+        self._lap = self._started
+        self._lap_waited = 0.0
+
+    def mark(self, phase: str):
+        """Close the current phase: time since the previous mark goes to `phase`."""
+        now = time.perf_counter()
+        elapsed = now - self._lap
+        waited = self.waited - self._lap_waited
+        prev = self.timings.get(phase, (0.0, 0.0))
+        self.timings[phase] = (prev[0] + elapsed, prev[1] + waited)
+        self._lap = now
+        self._lap_waited = self.waited
+
+    def total(self) -> float:
+        return time.perf_counter() - self._started
+
+    def summary(self) -> str:
+        parts = [f"{phase}={elapsed:.2f}s (wait {waited:.2f}s)" for phase, (elapsed, waited) in self.timings.items()]
+        return f"[{self.profile.name}] total={self.total():.2f}s wait={self.waited:.2f}s | " + ", ".join(parts)
@@ -11,8 +11,12 @@ from playwright.async_api import async_playwright
 from openai import AsyncOpenAI
 
 from bots.base import BaseATSBot, ApplyResult
-from utils.s3_uploader import upload_to_s3
+from utils.s3_uploader import upload_to_s3_async
 from utils.capsolver import CapSolverClient
+from utils.answer_engine import FormAnswerer, Question
+from utils.question_router import classify
+from bots.form_snapshot import snapshot_fields
+from bots.pacing import Pacer
 import requests
 
 load_dotenv()
@@ -21,6 +25,89 @@ client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 import re
 
+WORKABLE_ANSWER_SYSTEM_MSG = (
+    "You help candidates answer Workable job application questions. "
+    "Use a professional and confident tone. "
+    "For long, open questions, write strong mini cover letter style answers of around three to five sentences. "
+    "For short questions, respond with a very concise factual answer. "
+    "If answer_style is 'short', respond with one to three words only, no greetings, no sign offs, no candidate name. "
+    "Use the job title, company name and job description to tailor the answer when longer context is needed. "
+    "Explicitly match the candidate skills and experience to the role where relevant. "
+    "Only mention salary or compensation if the question explicitly asks about it. "
+    "Never include greetings, sign offs, or the candidate name. "
+    "Do not include closings such as best regards or yours sincerely. "
+    "Do not invent employers, dates or qualifications."
+)
+
+# One-round-trip summary of every field block answer_custom_questions
+# walks: label (as _extract_label_text), block kind, radio option labels
+# and the attributes used to decide short vs long answers.
+PREFETCH_FIELDS_JS = """
+() => {
+    const firstLine = (t) => (t || "").trim().split("\\n")[0];
+    const blocks = document.querySelectorAll(
+        "form[data-ui='application-form'] [data-ui='field'], " +
+        "form[data-ui='application-form'] div.styles--3IYUq"
+    );
+
+    return Array.from(blocks).map((block) => {
+        let label = null;
+        const span = block.querySelector("label span[id$='_label']");
+        if (span && span.innerText.trim()) label = span.innerText.trim();
+        if (!label) {
+            const l = block.querySelector("label");
+            if (l && l.innerText.trim()) label = firstLine(l.innerText);
+        }
+        if (!label) label = firstLine(block.innerText);
+
+        const field = {label, kind: "none", options: []};
+
+        if (block.querySelector("[class*='checkboxOption'], [class*='radioOption']")) {
+            field.kind = "checkbox_group";
+            return field;
+        }
+        if (block.querySelector("fieldset[role='radiogroup']")) {
+            field.kind = "radiogroup";
+            for (const opt of block.querySelectorAll("fieldset[role='radiogroup'] div[role='radio']")) {
+                let sib = opt.nextElementSibling;
+                while (sib && sib.tagName !== "SPAN") sib = sib.nextElementSibling;
+                if (sib && sib.innerText) field.options.push(sib.innerText);
+            }
+            return field;
+        }
+        if (block.querySelector("div[role='checkbox']")) {
+            field.kind = "gdpr";
+            return field;
+        }
+
+        const input = block.querySelector("textarea, select, input");
+        if (!input) return field;
+
+        const tag = input.tagName.toLowerCase();
+        const type = input.getAttribute("type") || "";
+        const ml = input.getAttribute("maxlength");
+        let short = false;
+        if (ml !== null) {
+            const n = parseInt(ml, 10);
+            short = Number.isNaN(n) ? true : n <= 200;
+        } else if (tag === "input" && (type === "text" || type === "")) {
+            short = true;
+        }
+
+        Object.assign(field, {
+            kind: "input",
+            tag,
+            type,
+            dataUi: input.getAttribute("data-ui") || "",
+            name: (input.getAttribute("name") || "").toLowerCase(),
+            combobox: !!block.querySelector("input[role='combobox']"),
+            short,
+        });
+        return field;
+    });
+}
+"""
+
 def submit_to_workable_api(job_id, fields, turnstile_token, user_agent, cookies=None):
     """
     Submit the application directly to Workable /apply API.
@@ -78,11 +165,17 @@ class WorkableBot(BaseATSBot):
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
         ]
 
+        # per-application answer cache/batcher, set up in apply()
+        self.form_answers = None
+
+        # human pauses / typing speed (BOT_PACING) and per-phase timing
+        self.pacing = Pacer()
+
     # =============================================================
     # Human helpers
     # =============================================================
     async def human_sleep(self, min_s=0.4, max_s=1.2):
-        await asyncio.sleep(random.uniform(min_s, max_s))
+        await self.pacing.sleep(min_s, max_s)
 
 
 
@@ -97,7 +190,7 @@ class WorkableBot(BaseATSBot):
             xt = start_x + (target_x - start_x) * (t * t)
             yt = start_y + (target_y - start_y) * (t * t)
             await page.mouse.move(xt, yt, steps=1)
-            await asyncio.sleep(random.uniform(0.01, 0.04))
+            await self.pacing.sleep(0.01, 0.04)
 
     async def move_mouse_to_locator(self, page, locator):
         try:
@@ -121,8 +214,7 @@ class WorkableBot(BaseATSBot):
         except Exception:
             pass
 
-        for ch in text:
-            await locator.type(ch, delay=random.randint(40, 120))
+        await self.pacing.type(locator, text)
 
     async def random_scroll(self, page):
         try:
@@ -156,18 +248,7 @@ class WorkableBot(BaseATSBot):
         return None
 
     def _is_negative_eligibility_question(self, text: str) -> bool:
-        t = text.lower()
-        return any(k in t for k in [
-            "convicted",
-            "criminal",
-            "felony",
-            "misdemeanor",
-            "criminal record",
-            "offence",
-            "offense",
-            "arrested",
-            "charged with a crime",
-        ])
+        return "criminal_record" in classify(text)
 
     def pick_user_agent(self):
         return random.choice(self.user_agents)
@@ -282,24 +363,26 @@ class WorkableBot(BaseATSBot):
         if not company_name:
             company_name = "the company"
 
-        # Description
+        # Description: the worker's condensed brief when there is one
+        job_description = job.get("condensed_description") or ""
         selectors = [
             "[data-ui='job-description']",
             "section[data-ui='job-description']",
             "div[data-ui='job-description']",
             "div.styles--O7O7H",
         ]
-        for sel in selectors:
-            try:
-                loc = page.locator(sel)
-                if await loc.count() > 0:
-                    jd = await loc.first.inner_text()
-                    jd = re.sub(r"\s+", " ", jd).strip()
-                    if jd:
-                        job_description = jd
-                        break
-            except Exception:
-                pass
+        if not job_description:
+            for sel in selectors:
+                try:
+                    loc = page.locator(sel)
+                    if await loc.count() > 0:
+                        jd = await loc.first.inner_text()
+                        jd = re.sub(r"\s+", " ", jd).strip()
+                        if jd:
+                            job_description = jd
+                            break
+                except Exception:
+                    pass
 
         if len(job_description) > 2000:
             job_description = job_description[:2000]
@@ -503,169 +586,138 @@ class WorkableBot(BaseATSBot):
 
             fields = []
 
-            # TEXT INPUTS + TEXTAREA
-            text_like = page.locator(
-                "input[type='text'], input[type='email'], input[type='tel'], "
-                "input[type='url'], input[type='number'], textarea"
+            # One evaluate() for every input on the page instead of a
+            # round trip per element / attribute.
+            snapshot = await snapshot_fields(
+                page,
+                closest={
+                    "qa": "[data-ui^='QA_']",
+                    "form": "form[data-ui='application-form']",
+                },
             )
-            for i in range(await text_like.count()):
-                el = text_like.nth(i)
-                name = await el.get_attribute("name")
-                if not name:
-                    continue
-                if not await el.is_visible():
-                    continue
+            inputs = [f for f in snapshot if f.tag == "input"]
 
-                value = (await el.input_value()).strip()
-                if value:
-                    fields.append({"name": name, "value": value})
+            def has_field(name):
+                return any(f["name"] == name for f in fields)
+
+            # TEXT INPUTS + TEXTAREA
+            for el in snapshot:
+                if el.tag == "textarea" or (
+                    el.tag == "input" and el.type in ("text", "email", "tel", "url", "number")
+                ):
+                    if not el.name or not el.visible:
+                        continue
+                    value = el.value.strip()
+                    if value:
+                        fields.append({"name": el.name, "value": value})
 
             # SELECT DROPDOWNS
-            selects = page.locator("select")
-            for i in range(await selects.count()):
-                el = selects.nth(i)
-                name = await el.get_attribute("name")
-                if not name:
+            for el in snapshot:
+                if el.tag != "select" or not el.name:
                     continue
 
-                # Multi-select vs single
-                is_multi = await el.get_attribute("multiple") is not None
-
                 # single selection
-                if not is_multi:
-                    value = await el.input_value()
-                    if value:
-                        fields.append({"name": name, "value": value})
+                if el.attr("multiple") is None:
+                    if el.value:
+                        fields.append({"name": el.name, "value": el.value})
                     continue
 
                 # multi selection → array
-                options = el.locator("option:checked")
-                selected = []
-                for j in range(await options.count()):
-                    selected.append(await options.nth(j).get_attribute("value"))
+                selected = [o["value"] for o in el.options if o["selected"]]
                 if selected:
-                    fields.append({"name": name, "value": selected})
+                    fields.append({"name": el.name, "value": selected})
 
             # RADIO GROUPS → boolean OR array
-            radios = page.locator("input[type='radio']")
-            if await radios.count() > 0:
-                names = set()
-                for i in range(await radios.count()):
-                    name = await radios.nth(i).get_attribute("name")
-                    if name:
-                        names.add(name)
-
-                for name in names:
-                    checked = page.locator(f"input[type='radio'][name='{name}']:checked")
-                    if await checked.count() == 0:
-                        continue
+            radios = [f for f in inputs if f.type == "radio"]
+            for name in {r.name for r in radios if r.name}:
+                checked = [r for r in radios if r.name == name and r.checked]
+                if not checked:
+                    continue
 
-                    value = await checked.first.get_attribute("value")
+                value = checked[0].attr("value")
 
-                    # Case 1: boolean radio ("true" / "false")
-                    if value in ("true", "false"):
-                        fields.append({"name": name, "value": value == "true"})
-                        continue
+                # Case 1: boolean radio ("true" / "false")
+                if value in ("true", "false"):
+                    fields.append({"name": name, "value": value == "true"})
+                    continue
 
-                    # Case 2: regular multi-choice → array of IDs
-                    fields.append({"name": name, "value": [value]})
+                # Case 2: regular multi-choice → array of IDs
+                fields.append({"name": name, "value": [value]})
 
             # CHECKBOX GROUPS (multi-select) + GDPR (boolean)
             # CHECKBOX GROUPS → detect single-choice disguised as checkboxes
-            checkboxes = page.locator("input[type='checkbox']")
-            if await checkboxes.count() > 0:
-
-                # Group by container (Workable uses data-ui="QA_xxxx")
-                containers = page.locator("[data-ui^='QA_']")
-                for c in range(await containers.count()):
-                    container = containers.nth(c)
-                    group_boxes = container.locator("input[type='checkbox']")
-
-                    if await group_boxes.count() == 0:
-                        continue
+            checkboxes = [f for f in inputs if f.type == "checkbox"]
 
-                    # Check if all are required → Workable "single choice checkbox"
-                    all_required = True
-                    for i in range(await group_boxes.count()):
-                        req = await group_boxes.nth(i).get_attribute("required")
-                        if not req:
-                            all_required = False
+            # Group by container (Workable uses data-ui="QA_xxxx")
+            groups = {}
+            for cb in checkboxes:
+                container = cb.ancestors.get("qa")
+                if container is not None:
+                    groups.setdefault(container, []).append(cb)
+
+            for field_name, group_boxes in groups.items():
+                # Check if all are required → Workable "single choice checkbox"
+                all_required = all(cb.attr("required") for cb in group_boxes)
+
+                if all_required:
+                    # Single-choice disguised as checkbox group — exactly ONE must be checked.
+                    checked = None
+                    for cb in group_boxes:
+                        if cb.checked:
+                            checked = cb.attr("value") or cb.name
                             break
 
-                    field_name = await container.get_attribute("data-ui")
+                    # If user didn't check anything, fallback to first checkbox value
+                    if not checked:
+                        checked = group_boxes[0].attr("value")
 
-                    if all_required:
-                        # Single-choice disguised as checkbox group — exactly ONE must be checked.
-                        checked = None
-                        for i in range(await group_boxes.count()):
-                            el = group_boxes.nth(i)
-                            if await el.is_checked():
-                                checked = await el.get_attribute("value") or await el.get_attribute("name")
-                                break
+                    fields.append({
+                        "name": field_name,
+                        "value": checked
+                    })
 
-                        # If user didn't check anything, fallback to first checkbox value
-                        if not checked:
-                            checked = await group_boxes.first.get_attribute("value")
+                else:
+                    # REAL multi-select → return array
+                    selected = [cb.attr("value") or cb.name for cb in group_boxes if cb.checked]
 
+                    if selected:
                         fields.append({
                             "name": field_name,
-                            "value": checked
+                            "value": selected
                         })
 
-                    else:
-                        # REAL multi-select → return array
-                        selected = []
-                        for i in range(await group_boxes.count()):
-                            el = group_boxes.nth(i)
-                            if await el.is_checked():
-                                val = await el.get_attribute("value") or await el.get_attribute("name")
-                                selected.append(val)
-
-                        if selected:
-                            fields.append({
-                                "name": field_name,
-                                "value": selected
-                            })
-
             # ---- PATCH: Force-capture GDPR consent ----
             # Look specifically for the standard Workable GDPR checkbox pattern
-            gdpr_box = page.locator("input[type='checkbox'][name='gdpr']")
-            if await gdpr_box.count() > 0:
-                el = gdpr_box.first
-                if await el.is_checked():
-                    fields.append({
-                        "name": "gdpr",
-                        "value": True
-                    })
+            gdpr_boxes = [cb for cb in checkboxes if cb.name == "gdpr"]
+            if gdpr_boxes and gdpr_boxes[0].checked:
+                fields.append({
+                    "name": "gdpr",
+                    "value": True
+                })
 
             # ----- NEW: capture hidden Workable value inputs -----
-            hidden = page.locator(
-                "form[data-ui='application-form'] input[type='hidden'][name][value]"
-            )
-            for i in range(await hidden.count()):
-                el = hidden.nth(i)
-                name = await el.get_attribute("name")
-                value = await el.get_attribute("value")
+            form_inputs = [f for f in inputs if f.ancestors.get("form") is not None]
+            for el in form_inputs:
+                if el.type != "hidden" or el.name is None or el.attr("value") is None:
+                    continue
+                name = el.name
+                value = el.attr("value")
 
                 # Skip resume (already handled)
                 if name in {"resume", "csrf", "causal_token"}:
                     continue
 
                 # Add only if not already in fields
-                if name and value and not any(f["name"] == name for f in fields):
+                if name and value and not has_field(name):
                     fields.append({"name": name, "value": value})
 
             # ----- Workable "fake hidden" inputs for combo values -----
-            backend_inputs = page.locator(
-                "form[data-ui='application-form'] input[name][value]"
-                ":not([type='file']):not([type='checkbox']):not([type='radio'])"
-            )
-
-            for i in range(await backend_inputs.count()):
-                el = backend_inputs.nth(i)
+            for el in form_inputs:
+                if el.type in ("file", "checkbox", "radio"):
+                    continue
 
-                name = await el.get_attribute("name")
-                value = await el.get_attribute("value")
+                name = el.name
+                value = el.attr("value")
 
                 if not name or not value:
                     continue
@@ -679,9 +731,11 @@ class WorkableBot(BaseATSBot):
                 # even though they are logically hidden.
 
                 # Don't overwrite existing fields
-                if not any(f["name"] == name for f in fields):
+                if not has_field(name):
                     fields.append({"name": name, "value": value})
 
+            hidden_names = {f.name for f in inputs if f.name and (f.type == "hidden" or f.type is None)}
+
             # ----- Safe numeric conversion for QA fields only -----
             # ----- Safe numeric conversion for QA fields only -----
             for field in fields:
@@ -694,9 +748,7 @@ class WorkableBot(BaseATSBot):
                 if not isinstance(value, str):
                     continue
 
-                hidden_input = page.locator(
-                    f"input[name='{name}'][type='hidden'], input[name='{name}']:not([type])")
-                if await hidden_input.count() > 0:
+                if name in hidden_names:
                     continue
 
                 raw = value.strip()
@@ -764,6 +816,9 @@ class WorkableBot(BaseATSBot):
         if not job_url:
             return ApplyResult(status="failed", message="No job URL found")
 
+        self.pacing.reset()
+        self.form_answers = None
+
         if self.debug:
             print(f"[Workable DEBUG] Starting apply for {job_url}")
 
@@ -814,14 +869,22 @@ class WorkableBot(BaseATSBot):
                     )
 
                     page = await context.new_page()
+                    self.pacing.mark("launch")
                     await page.goto(
                         job_url,
                         wait_until="domcontentloaded",
                         timeout=60000
                     )
 
-                    # Cookies
-                    await self.human_sleep(4.8, 5.6)
+                    # Cookies: wait for the app to render instead of a fixed 5s
+                    await self.pacing.wait_for(
+                        page.locator(
+                            "[data-ui='cookie-consent'], "
+                            "[data-ui='application-form-tab'], "
+                            "form[data-ui='application-form']"
+                        )
+                    )
+                    await self.human_sleep(0.8, 1.6)
                     await self.accept_cookies_if_present(page)
                     await self.human_sleep(1.8, 2.6)
 
@@ -835,21 +898,36 @@ class WorkableBot(BaseATSBot):
                     except Exception:
                         if self.debug:
                             print("[Workable DEBUG] app form selector wait failed")
+                    self.pacing.mark("open_page")
 
                     # Job context
                     job_title, company_name, job_description = await self.extract_job_context(
                         page, job
                     )
 
+                    # Batch-answer the open questions in the background while we fill the basics
+                    self.form_answers = FormAnswerer(
+                        user_id=user.get("user_id"),
+                        source="workable",
+                        system_msg=WORKABLE_ANSWER_SYSTEM_MSG,
+                        context=self.answer_context(
+                            ai_data, profile_answers, job_title, company_name, job_description
+                        ),
+                    )
+                    await self.prefetch_answers(page, ai_data, profile_answers, user)
+                    self.pacing.mark("job_context")
+
                     await self.human_sleep(0.8, 1.6)
                     await self.random_scroll(page)
 
                     # Core info
                     await self.fill_basic_info(page, ai_data, user)
+                    self.pacing.mark("basic_fields")
 
                     # CV
                     resume_url = await self.upload_cv(page, cv_path)
                     cv_uploaded = True if resume_url else False
+                    self.pacing.mark("resume")
 
                     # Questions
                     await self.answer_custom_questions(
@@ -862,27 +940,23 @@ class WorkableBot(BaseATSBot):
                         job_description,
                     )
                     await self.handle_checkboxes(page)
+                    self.pacing.mark("custom_questions")
 
                     # Screenshot after full render
                     screenshot_path = f"/tmp/workable_{user.get('user_id')}_{job.get('id')}.png"
 
-                    full_height = await page.evaluate("() => document.body.scrollHeight")
-                    for _ in range(0, full_height, 600):
-                        await page.mouse.wheel(0, 600)
-                        await asyncio.sleep(0.25)
-
-                    await asyncio.sleep(1.2)
-                    await page.evaluate("window.scrollTo(0, 0)")
-                    await asyncio.sleep(0.2)
+                    await self.pacing.scroll_through(page)
+                    await self.pacing.sleep(0.2)
 
                     await page.screenshot(path=screenshot_path, full_page=True)
-                    screenshot_url = upload_to_s3(
+                    screenshot_url = await upload_to_s3_async(
                         screenshot_path, folder="screenshots"
                     )
                     try:
                         os.remove(screenshot_path)
                     except:
                         pass
+                    self.pacing.mark("screenshot")
 
                     if self.test_mode:
                         return ApplyResult(
@@ -892,7 +966,17 @@ class WorkableBot(BaseATSBot):
                         )
 
                     submitted = await self.click_submit(page)
-                    await asyncio.sleep(10)
+
+                    # Wait for the captcha or the confirmation instead of a fixed 10s
+                    await self.pacing.wait_for(
+                        page.locator(
+                            "div[id^='turnstile-container']:not([hidden]), "
+                            "symbol#thankyou, "
+                            "h1:has-text('Thank'), h2:has-text('Thank'), h3:has-text('Thank')"
+                        ),
+                        state="attached",
+                    )
+                    self.pacing.mark("submit")
 
                     # Check for captcha
                     try:
@@ -1002,6 +1086,10 @@ class WorkableBot(BaseATSBot):
                 print("[Workable DEBUG] Top level error:", e)
             return ApplyResult(status="retry", message=str(e))
 
+        finally:
+            self.pacing.mark("finish")
+            print(f"[Workable] Timings {self.pacing.summary()}")
+
     # =============================================================
     # Basic info
     # =============================================================
@@ -1534,6 +1622,7 @@ class WorkableBot(BaseATSBot):
                             company_name,
                             job_description,
                             short_mode=True,
+                            options=tuple(lbl for lbl in labels if lbl),
                         )
 
                     desired_norm = self._normalise_text(desired)
@@ -1704,13 +1793,7 @@ class WorkableBot(BaseATSBot):
             # --------------------------------------------------------------------
             # 5. Salary inputs
             # --------------------------------------------------------------------
-            is_salary_question = any(
-                kw in label_norm
-                for kw in [
-                    "salary", "compensation", "pay range", "remuneration",
-                    "annual pay", "expected pay", "expected earnings", "ctc",
-                ]
-            )
+            is_salary_question = "salary" in classify(label_norm)
             if is_salary_question and tag_name == "input" and input_type == "number":
                 raw_sal = profile_answers.get("desired_salary") or ""
                 numeric_sal = self._extract_salary_lower_bound(raw_sal) or "50000"
@@ -1803,36 +1886,27 @@ class WorkableBot(BaseATSBot):
         current_employer: str | None,
         short_mode: bool,
     ) -> str | None:
+        intents = classify(label_norm)
+
         # Employer name
-        if "employer" in label_norm or ("current" in label_norm and "company" in label_norm):
+        if "current_employer" in intents:
             if current_employer:
                 return current_employer if not short_mode else current_employer[:50]
 
         # Notice period
-        if "notice" in label_norm or "availability" in label_norm:
+        if "notice_period" in intents or "availability" in intents:
             np = profile_answers.get("notice_period")
             if np:
                 return np if not short_mode else np[:50]
 
         # Work authorization
-        if any(
-            k in label_norm
-            for k in [
-                "right to work",
-                "work authorization",
-                "work authorisation",
-                "eligible to work",
-                "legal right to work",
-                "legally allowed",
-                "visa status",
-            ]
-        ):
+        if "work_authorization" in intents or "visa_status" in intents:
             wa = profile_answers.get("work_authorization")
             if wa:
                 return wa if not short_mode else wa[:50]
 
         # Years of experience
-        if "years of experience" in label_norm or "experience in this field" in label_norm:
+        if "years_experience" in intents or "field_experience" in intents:
             ye = profile_answers.get("years_experience")
             if ye:
                 if short_mode:
@@ -1840,7 +1914,7 @@ class WorkableBot(BaseATSBot):
                 return f"{ye} years of experience"
 
         # Location preference
-        if any(k in label_norm for k in ["remote", "hybrid", "work preference"]):
+        if "remote_preference" in intents:
             lp = profile_answers.get("location_preference")
             if lp:
                 return lp if not short_mode else lp[:50]
@@ -1910,23 +1984,12 @@ class WorkableBot(BaseATSBot):
     # =============================================================
     # AI answer generator
     # =============================================================
-    async def _generate_ai_answer(
-        self,
-        question: str,
-        ai_data: dict,
-        profile_answers: dict,
-        job_title: str,
-        company_name: str,
-        job_description: str,
-        short_mode: bool,
-    ) -> str:
-        summary = ai_data.get("summary", "")
-        skills = ai_data.get("skills", [])
-        titles = ai_data.get("job_titles", [])[:3]
-        experience = ai_data.get("experience", [])
-
+    def answer_context(self, ai_data, profile_answers, job_title, company_name, job_description) -> dict:
+        """
+        Candidate + job context shared by every AI answer on one form.
+        """
         experience_snippets = []
-        for exp in experience[:2]:
+        for exp in ai_data.get("experience", [])[:2]:
             experience_snippets.append(
                 {
                     "title": exp.get("title"),
@@ -1939,59 +2002,147 @@ class WorkableBot(BaseATSBot):
         for key in ["race", "gender", "disability_status", "veteran_status"]:
             app_data_safe.pop(key, None)
 
-        is_salary_question = any(
-            kw in question
-            for kw in [
-                "salary",
-                "compensation",
-                "pay range",
-                "remuneration",
-                "annual pay",
-                "expected pay",
-                "expected earnings",
-                "ctc",
-            ]
-        )
-
-        system_msg = (
-            "You help candidates answer Workable job application questions. "
-            "Use a professional and confident tone. "
-            "For long, open questions, write strong mini cover letter style answers of around three to five sentences. "
-            "For short questions, respond with a very concise factual answer. "
-            "If answer_style is 'short', respond with one to three words only, no greetings, no sign offs, no candidate name. "
-            "Use the job title, company name and job description to tailor the answer when longer context is needed. "
-            "Explicitly match the candidate skills and experience to the role where relevant. "
-            "Only mention salary or compensation if the question explicitly asks about it. "
-            "Never include greetings, sign offs, or the candidate name. "
-            "Do not include closings such as best regards or yours sincerely. "
-            "Do not invent employers, dates or qualifications."
-        )
-
-        user_msg = {
-            "question": question,
+        return {
             "job_title": job_title,
             "company_name": company_name,
             "job_description": job_description,
-            "cv_summary": summary,
-            "skills": skills,
-            "target_job_titles": titles,
+            "cv_summary": ai_data.get("summary", ""),
+            "skills": ai_data.get("skills", []),
+            "target_job_titles": ai_data.get("job_titles", [])[:3],
             "experience_highlights": experience_snippets,
             "application_data": app_data_safe,
-            "answer_style": "short" if short_mode else "long",
-            "allow_salary_mention": is_salary_question,
         }
 
+    def answer_question(self, question: str, short_mode: bool, options=()) -> Question:
+        return Question(
+            text=question,
+            options=tuple(options),
+            style="short" if short_mode else "long",
+            payload={
+                "answer_style": "short" if short_mode else "long",
+                "allow_salary_mention": "salary" in classify(question),
+            },
+        )
+
+    async def prefetch_answers(self, page, ai_data, profile_answers, user):
+        """
+        Snapshot the form's field blocks in one evaluate() and start
+        batched AI answers for every question answer_custom_questions will
+        send to the model (short and long answers use different models).
+        """
+        if not isinstance(profile_answers, dict):
+            profile_answers = {}
+
         try:
+            fields = await page.evaluate(PREFETCH_FIELDS_JS)
+        except Exception as e:
+            if self.debug:
+                print("[Workable DEBUG] prefetch scan failed:", e)
+            return
+
+        current_employer = None
+        try:
+            exp_list = ai_data.get("experience") or []
+            if exp_list:
+                current_employer = exp_list[0].get("company")
+        except Exception:
+            current_employer = None
+
+        short_qs, long_qs = [], []
+        for f in fields:
+            if not f.get("label"):
+                continue
+            label_norm = self._normalise_text(f["label"])
+            if self._is_negative_eligibility_question(label_norm):
+                continue
+
+            options = ()
+            if f["kind"] == "radiogroup":
+                short = True
+                options = tuple(f["options"])
+                direct = self._high_conf_profile_answer(
+                    label_norm, profile_answers, ai_data, user, current_employer, short_mode=True
+                )
+            elif f["kind"] == "input":
+                if f["dataUi"] in {"firstname", "lastname", "email", "phone", "resume"}:
+                    continue
+                if f["name"] in {"firstname", "first_name", "lastname", "last_name", "email", "phone"}:
+                    continue
+                if f["type"] == "email":
+                    continue
+                if f["dataUi"] == "address" or "address" in label_norm or "location" in label_norm:
+                    continue
+
+                short = f["short"]
+                is_salary = "salary" in classify(label_norm)
+                if f["combobox"]:
+                    direct = self._high_conf_profile_answer(
+                        label_norm, profile_answers, ai_data, user, current_employer, short_mode=short
+                    )
+                elif is_salary and f["tag"] == "input" and f["type"] == "number":
+                    continue
+                elif f["tag"] == "select" or (f["tag"] in {"textarea", "input"} and f["type"] in {"text", ""}):
+                    direct = self._high_conf_profile_answer(
+                        label_norm, profile_answers, ai_data, user, current_employer, short_mode=True
+                    ) if short else None
+                else:
+                    continue
+            else:
+                continue
+
+            if direct:
+                continue
+            (short_qs if short else long_qs).append(self.answer_question(label_norm, short, options))
+
+        if self.debug:
+            print(f"[Workable DEBUG] prefetching {len(short_qs)} short / {len(long_qs)} long answers")
+
+        if short_qs:
+            self.form_answers.prefetch(short_qs, model="gpt-4o-mini")
+        if long_qs:
+            self.form_answers.prefetch(long_qs, model="gpt-4o")
+
+    # =============================================================
+    # AI answer generator
+    # =============================================================
+    async def _generate_ai_answer(
+        self,
+        question: str,
+        ai_data: dict,
+        profile_answers: dict,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        short_mode: bool,
+        options=(),
+    ) -> str:
+        spec = self.answer_question(question, short_mode, options)
+
+        user_msg = {
+            "question": question,
+            **self.answer_context(ai_data, profile_answers, job_title, company_name, job_description),
+            **spec.payload,
+        }
+        if spec.options:
+            user_msg["options"] = list(spec.options)
+
+        async def generate():
             resp = await client.chat.completions.create(
                 model="gpt-4o" if not short_mode else "gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": system_msg},
+                    {"role": "system", "content": WORKABLE_ANSWER_SYSTEM_MSG},
                     {"role": "user", "content": json.dumps(user_msg)},
                 ],
                 max_tokens=260,
                 temperature=0.45,
             )
-            answer = resp.choices[0].message.content.strip()
+            return resp.choices[0].message.content.strip()
+
+        try:
+            if self.form_answers:
+                answer = await self.form_answers.answer(spec, generate)
+            else:
+                answer = await generate()
         except Exception as e:
             if self.debug:
                 print("[Workable DEBUG] AI call error:", e)
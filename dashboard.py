@@ -1,88 +1,253 @@
 from flask import Blueprint, render_template, redirect, url_for, request, flash, send_file, redirect, jsonify
 from flask_login import login_required, current_user
-from models import db, Profile, PendingApplication, Application, Match, Job, CreditBalance, UserSubscription, DismissedMatch
+from models import db, Profile, PendingApplication, Application, ApplicationDailyCount, Match, Job, CreditBalance, CreditReservation, UserSubscription, DismissedMatch
 
 from datetime import datetime
-from sqlalchemy import desc
-import hashlib
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 import requests
 from io import BytesIO
 from onboarding import require_onboarding_complete
+from utils.dashboard_cache import dashboard_cache, invalidate_dashboard
 
 
 dashboard = Blueprint('dashboard', __name__)
 
+ACTIVITY_PAGE_SIZE = 25
+MANUAL_PAGE_SIZE = 10
+MATCH_PAGE_SIZE = 50
 
-@dashboard.route("/")
-@login_required
-@require_onboarding_complete
-def dashboard_home():
+SENT_STATUSES = ("success", "manual_success")
 
-    profile = current_user.profile
 
-    subscription = (
-        UserSubscription.query
-        .filter_by(user_id=current_user.id)
-        .order_by(UserSubscription.created_at.desc())
-        .first()
-    )
+def encode_cursor(app):
+    return f"{app.created_at.isoformat()}_{app.id}"
 
-    credit_balance = CreditBalance.query.filter_by(
-        user_id=current_user.id
-    ).first()
-    available_credits = credit_balance.available_credits if credit_balance else 0
 
-    # Fetch recent applications
-    activity = Application.query \
-        .filter(Application.user_id == current_user.id) \
-        .filter(Application.status != "manual_required") \
-        .order_by(Application.created_at.desc()) \
-        .all()
+def decode_cursor(value):
+    created_at, _, app_id = value.rpartition("_")
+    return datetime.fromisoformat(created_at), int(app_id)
+
+
+def application_page(user_id, manual, before=None):
+    """
+    One page of a user's applications, newest first, keyset-paginated on
+    (created_at, id) so every page costs the same however long the history
+    is. `manual` selects the manual_required list instead of the activity
+    feed. Returns (applications, cursor of the next page or None).
+    """
+    limit = MANUAL_PAGE_SIZE if manual else ACTIVITY_PAGE_SIZE
 
-    manual_required = Application.query \
-        .filter_by(user_id=current_user.id, status="manual_required") \
-        .order_by(Application.created_at.desc()) \
+    query = Application.query.filter(Application.user_id == user_id)
+    if manual:
+        query = query.filter(Application.status == "manual_required")
+    else:
+        query = query.filter(Application.status != "manual_required")
+
+    if before:
+        query = query.filter(tuple_(Application.created_at, Application.id) < before)
+
+    apps = (
+        query
+        .order_by(Application.created_at.desc(), Application.id.desc())
+        .limit(limit + 1)
         .all()
+    )
+
+    next_cursor = encode_cursor(apps[limit - 1]) if len(apps) > limit else None
+    return apps[:limit], next_cursor
+
+
+def encode_match_cursor(row):
+    return f"{row.score!r}_{row.id}"
+
+
+def decode_match_cursor(value):
+    score, _, match_id = value.rpartition("_")
+    return float(score), int(match_id)
 
-    matches = (
+
+def match_page(user_id, limit=MATCH_PAGE_SIZE, after=None):
+    """
+    One page of a user's open matches, best first, with the job columns the
+    feeds show - a single query. Applied jobs and dismissed matches are
+    dropped with anti-joins on (user_id, job_id) / (user_id, match_id),
+    and pages are keyset-paginated on (score, id). Returns (rows, cursor
+    of the next page or None).
+    """
+    query = (
         db.session.query(
-            Match,
+            Match.id,
+            Match.job_url,
+            Match.job_id,
+            Match.score,
+            Match.is_remote,
             Job.title.label("job_title"),
             Job.company.label("company"),
             Job.city.label("city"),
             Job.state.label("state"),
             Job.country.label("country"),
-            Job.is_remote.label("remote_flag")
+            Job.is_remote.label("remote_flag"),
         )
         .join(Job, Match.job_id == Job.id)
-        .filter(Match.user_id == current_user.id)
+        .filter(Match.user_id == user_id)
         .filter(
-            ~db.session.query(Application)
-            .filter(Application.user_id == current_user.id)
-            .filter(Application.job_id == Match.job_id)
+            ~select(Application.id)
+            .where(Application.user_id == user_id)
+            .where(Application.job_id == Match.job_id)
             .exists()
         )
         .filter(
-            ~db.session.query(DismissedMatch)
-            .filter(DismissedMatch.user_id == current_user.id)
-            .filter(DismissedMatch.match_id == Match.id)
+            ~select(DismissedMatch.id)
+            .where(DismissedMatch.user_id == user_id)
+            .where(DismissedMatch.match_id == Match.id)
             .exists()
         )
-        .order_by(desc(Match.score))
-        .limit(20)
+    )
+
+    if after:
+        query = query.filter(tuple_(Match.score, Match.id) < after)
+
+    rows = (
+        query
+        .order_by(Match.score.desc(), Match.id.desc())
+        .limit(limit + 1)
         .all()
     )
 
-    total_sent = Application.query.filter(
-        Application.user_id == current_user.id,
-        Application.status.in_(["success", "manual_success"])
-    ).count()
+    next_cursor = encode_match_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def create_application_from_match(user_id, match_id):
+    """
+    Queue an application for one of the user's matches in one round trip:
+    INSERT ... SELECT from the match and its job, deduped by the
+    (user_id, job_url_hash) constraint. Returns the new application id, or
+    None if the match isn't the user's, its job is gone, or the user
+    already applied.
+    """
+    job_url_hash = func.encode(func.sha256(func.convert_to(Job.job_url, "UTF8")), "hex")
+    location = func.nullif(func.concat_ws(", ", func.nullif(Job.city, ""), Job.state), "")
+
+    source = (
+        select(
+            Match.user_id,
+            Job.job_url,
+            job_url_hash,
+            Job.title,
+            Job.company,
+            location,
+            literal("pending"),
+            func.now(),
+            func.now(),
+            Job.id,
+            literal(False),
+            literal(False),
+        )
+        .join(Job, Job.id == Match.job_id)
+        .where(Match.id == match_id, Match.user_id == user_id)
+    )
 
-    match_count = Match.query.filter_by(user_id=current_user.id).count()
+    stmt = (
+        pg_insert(Application)
+        .from_select(
+            [
+                "user_id", "job_url", "job_url_hash", "job_title", "company", "location",
+                "status", "created_at", "updated_at", "job_id", "manual_started", "credit_consumed",
+            ],
+            source,
+        )
+        .on_conflict_do_nothing(constraint="unique_user_job_application")
+        .returning(Application.id)
+    )
 
-    stats = {
+    app_id = db.session.execute(stmt).scalar()
+    db.session.commit()
+    return app_id
+
+
+def spendable_credits(user_id):
+    """The balance plus credits still held for the user's queued applications."""
+    held = (
+        select(func.coalesce(func.sum(CreditReservation.reserved - CreditReservation.consumed), 0))
+        .where(CreditReservation.user_id == user_id)
+        .where(CreditReservation.status == "open")
+        .scalar_subquery()
+    )
+    credits = (
+        db.session.query(CreditBalance.available_credits + held)
+        .filter(CreditBalance.user_id == user_id)
+        .scalar()
+    )
+    return credits or 0
+
+
+def build_dashboard_summary(user_id):
+    """
+    Everything on the dashboard except the application lists, as plain
+    JSON-able data for dashboard_cache. Matches are
+    [match, job_title, company, city, state, country, remote] rows with
+    the match as a dict (Jinja reads m.id / m.score / m.job_url from it).
+    """
+    subscription = (
+        UserSubscription.query
+        .filter_by(user_id=user_id)
+        .order_by(UserSubscription.created_at.desc())
+        .first()
+    )
+
+    available_credits = spendable_credits(user_id)
+
+    matches, _ = match_page(user_id, limit=20)
+
+    total_sent = db.session.query(
+        func.coalesce(func.sum(ApplicationDailyCount.count), 0)
+    ).filter(
+        ApplicationDailyCount.user_id == user_id,
+        ApplicationDailyCount.status.in_(SENT_STATUSES)
+    ).scalar()
+
+    match_count = Match.query.filter_by(user_id=user_id).count()
+
+    return {
+        "available_credits": available_credits,
         "applications_sent": total_sent,
         "match_count": match_count,
+        "subscription": {
+            "plan": {"name": subscription.plan.name},
+            "current_period_end": (
+                subscription.current_period_end.isoformat() if subscription.current_period_end else None
+            ),
+        } if subscription else None,
+        "matches": [
+            [{"id": m.id, "job_url": m.job_url, "score": m.score},
+             m.job_title, m.company, m.city, m.state, m.country, m.remote_flag]
+            for m in matches
+        ],
+    }
+
+
+@dashboard.route("/")
+@login_required
+@require_onboarding_complete
+def dashboard_home():
+
+    profile = current_user.profile
+
+    summary = dashboard_cache.get_or_build(current_user.id, lambda: build_dashboard_summary(current_user.id))
+
+    subscription = summary["subscription"]
+    if subscription and subscription["current_period_end"]:
+        subscription["current_period_end"] = datetime.fromisoformat(subscription["current_period_end"])
+
+    # First page of each list; the rest is loaded from dashboard_activity
+    activity, activity_next = application_page(current_user.id, manual=False)
+    manual_required, manual_next = application_page(current_user.id, manual=True)
+
+    stats = {
+        "applications_sent": summary["applications_sent"],
+        "match_count": summary["match_count"],
         "profile_completion": 60
     }
 
@@ -94,12 +259,50 @@ def dashboard_home():
         stats=stats,
         automation_running=automation_running,
         activity=activity,
-        matches=matches,
+        activity_next=activity_next,
+        matches=summary["matches"],
         manual_required=manual_required,
-        available_credits=available_credits,
+        manual_next=manual_next,
+        available_credits=summary["available_credits"],
         subscription=subscription,
     )
 
+
+@dashboard.route("/dashboard/activity")
+@login_required
+def dashboard_activity():
+    """
+    Next page of the activity feed (kind=activity) or manual_required list
+    (kind=manual) after the `before` cursor, as HTML fragments.
+    """
+    manual = request.args.get("kind") == "manual"
+
+    try:
+        before = decode_cursor(request.args["before"]) if request.args.get("before") else None
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    apps, next_cursor = application_page(current_user.id, manual=manual, before=before)
+
+    if manual:
+        return jsonify({
+            "rows_html": render_template("components/manual_required_items.html", manual_required=apps),
+            "cards_html": "",
+            "next_cursor": next_cursor,
+        })
+
+    available_credits = spendable_credits(current_user.id)
+
+    return jsonify({
+        "rows_html": render_template(
+            "components/activity_rows.html", activity=apps, available_credits=available_credits
+        ),
+        "cards_html": render_template(
+            "components/activity_cards.html", activity=apps, available_credits=available_credits
+        ),
+        "next_cursor": next_cursor,
+    })
+
 @dashboard.route("/application/<int:app_id>/manual-complete", methods=["POST"])
 @login_required
 def manual_application_complete(app_id):
@@ -301,16 +504,18 @@ def view_application_screenshot(app_id):
 @login_required
 def dashboard_matches():
 
-    matches = Match.query \
-        .filter_by(user_id=current_user.id) \
-        .order_by(Match.score.desc()) \
-        .limit(50) \
-        .all()
+    after = request.args.get("after")
+    try:
+        after = decode_match_cursor(after) if after else None
+    except ValueError:
+        after = None
 
+    matches, next_cursor = match_page(current_user.id, after=after)
 
     return render_template(
             "matches.html",
             matches=matches,
+            next_cursor=next_cursor,
             profile=current_user.profile,
             automation_running=(current_user.profile.application_mode == "auto")
         )
@@ -320,72 +525,43 @@ def dashboard_matches():
 @login_required
 def apply_from_match(match_id):
 
-    # Fetch match object
+    if create_application_from_match(current_user.id, match_id):
+        invalidate_dashboard(current_user.id)
+        flash("AI is now preparing your application…", "success")
+        return redirect(url_for("dashboard.dashboard_home"))
+
+    # Nothing inserted - work out why (only on this path)
     match = Match.query.get_or_404(match_id)
 
     # Ensure this match belongs to the logged-in user (via profile.id)
     if match.user_id != current_user.id:
         flash("Unauthorized access.", "error")
-        return redirect(url_for("dashboard.dashboard_home"))
-
-    # Fetch job details from Job table
-    job = Job.query.get(match.job_id)
-    if not job:
+    elif not db.session.get(Job, match.job_id):
         flash("Job no longer available.", "error")
-        return redirect(url_for("dashboard.dashboard_home"))
-
-    # Generate hash for dedupe
-    job_hash = hashlib.sha256(job.job_url.encode()).hexdigest()
-
-    # Check application already exists
-    existing = Application.query.filter_by(
-        user_id=current_user.id,
-        job_url_hash=job_hash
-    ).first()
-
-    if existing:
+    else:
         flash("You've already applied to this job.", "info")
-        return redirect(url_for("dashboard.dashboard_home"))
-
-    # Create new application entry
-    new_app = Application(
-        user_id=current_user.id,
-        job_url=job.job_url,
-        job_url_hash=job_hash,
-        job_title=job.title,
-        company=job.company,
-        location=f"{job.city}, {job.state}" if job.city else None,
-        salary=None,
-        status="pending",
-        job_id=job.id,
-    )
-
-    db.session.add(new_app)
-    db.session.commit()
-
-    flash("AI is now preparing your application…", "success")
     return redirect(url_for("dashboard.dashboard_home"))
 
 @dashboard.route("/dashboard/metrics")
 @login_required
 def dashboard_metrics():
-    from datetime import datetime, timedelta
-    from sqlalchemy import func
+    from datetime import timedelta
 
-    sixty_days_ago = datetime.utcnow() - timedelta(days=60)
+    sixty_days_ago = (datetime.utcnow() - timedelta(days=60)).date()
 
     rows = (
         db.session.query(
-            func.date(Application.created_at),
-            func.count().label("count")
+            ApplicationDailyCount.day,
+            func.sum(ApplicationDailyCount.count).label("count")
         )
         .filter(
-            Application.user_id == current_user.id,
-            Application.status.in_(["success", "manual_success"]),
-            Application.created_at >= sixty_days_ago,
+            ApplicationDailyCount.user_id == current_user.id,
+            ApplicationDailyCount.status.in_(SENT_STATUSES),
+            ApplicationDailyCount.day >= sixty_days_ago,
         )
-        .group_by(func.date(Application.created_at))
-        .order_by(func.date(Application.created_at))
+        .group_by(ApplicationDailyCount.day)
+        .having(func.sum(ApplicationDailyCount.count) > 0)
+        .order_by(ApplicationDailyCount.day)
         .all()
     )
 
@@ -7,7 +7,8 @@ MAILGUN_DOMAIN = os.getenv("MAILGUN_DOMAIN")
 MAILGUN_API_KEY = os.getenv("MAILGUN_API_KEY")
 
 
-def send_credits_exhausted_email(user):
+def build_credits_exhausted_email(user):
+    """Mailgun message fields for `user`."""
 
     html_body = render_template(
         "emails/credits_exhausted.html",
@@ -23,14 +24,21 @@ Log in to continue applying:
 https://app.hirednowai.com/
 """
 
+    return {
+        "to": [user.email],
+        "subject": "Your applications are paused – add credits to continue",
+        "text": text_body,
+        "html": html_body,
+    }
+
+
+def send_credits_exhausted_email(user):
+
     return requests.post(
         f"https://api.eu.mailgun.net/v3/{MAILGUN_DOMAIN}/messages",
         auth=("api", MAILGUN_API_KEY),
         data={
             "from": f"HiredNow AI <no-reply@{MAILGUN_DOMAIN}>",
-            "to": [user.email],
-            "subject": "Your applications are paused – add credits to continue",
-            "text": text_body,
-            "html": html_body,
+            **build_credits_exhausted_email(user),
         }
     )
@@ -9,7 +9,8 @@ load_dotenv()
 MAILGUN_DOMAIN = os.getenv("MAILGUN_DOMAIN")
 MAILGUN_API_KEY = os.getenv("MAILGUN_API_KEY")
 
-def send_onboarding_bounce_email(user):
+def build_onboarding_bounce_email(user):
+    """Mailgun message fields for `user` (needs user.profile loaded)."""
     html_body = render_template(
         "emails/onboarding_bounce.html",
         first_name=user.profile.first_name,
@@ -26,14 +27,20 @@ You can start applying to real company jobs today - no payment required.
 Log back in to continue.
 """
 
+    return {
+        "to": [user.email],
+        "subject": "You still have 5 free applications waiting",
+        "text": text_body,
+        "html": html_body,
+    }
+
+
+def send_onboarding_bounce_email(user):
     requests.post(
         f"https://api.eu.mailgun.net/v3/{MAILGUN_DOMAIN}/messages",
         auth=("api", MAILGUN_API_KEY),
         data={
             "from": f"HiredNow AI <no-reply@{MAILGUN_DOMAIN}>",
-            "to": [user.email],
-            "subject": "You still have 5 free applications waiting",
-            "text": text_body,
-            "html": html_body,
+            **build_onboarding_bounce_email(user),
         }
     )
@@ -11,6 +11,9 @@ from dotenv import load_dotenv
 
 import heapq
 
+from utils.dashboard_cache import invalidate_dashboard
+from utils.keyword_engine import JobKeywordHits, PhraseIndex, keyword_score
+
 load_dotenv()
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -120,7 +123,12 @@ def generate_embedding(text: str):
 # --------------------------------------------------------
 # MAIN MATCH FUNCTION
 # --------------------------------------------------------
-def match_user(conn, user_id: int, limit=200):
+def match_user(conn, user_id: int, limit=200, keyword_hits: Optional[JobKeywordHits] = None):
+    """
+    keyword_hits: shared across users by the daily run (see
+    workers/daily_match_worker.py) so each job's text is scanned once per
+    run; a per-call index over this user's titles is used otherwise.
+    """
     import itertools
     counter = itertools.count()
 
@@ -169,6 +177,13 @@ def match_user(conn, user_id: int, limit=200):
     # --------------------------------------------------------
     keywords = title_list  # Already cleaned and lowercased
 
+    keyword_ids = keyword_hits.index.ids_for(keywords) if keyword_hits else None
+    if keyword_ids is None:
+        # A handful of phrases, each job seen once: plain substring checks
+        # beat building and running an automaton here
+        keyword_hits = JobKeywordHits(PhraseIndex(keywords, use_automaton=False), cache=False)
+        keyword_ids = keyword_hits.index.ids_for(keywords)
+
     max_miles = profile.get("miles_distance")
     max_km = max_miles * 1.60934 if max_miles else None
 
@@ -261,15 +276,8 @@ def match_user(conn, user_id: int, limit=200):
             # NEW combined keyword logic
             # Score boosts based on ANY matched title keyword
             # --------------------------------------------------------
-            job_title_lower = (job["title"] or "").lower()
-            job_desc_lower  = (job["description"] or "").lower()
-
-            kw_score = 0.0
-            for kw in keywords:
-                if kw in job_title_lower:
-                    kw_score += 0.7
-                elif kw in job_desc_lower:
-                    kw_score += 0.4
+            title_hits, desc_hits = keyword_hits.get(job)
+            kw_score = keyword_score(keyword_ids, title_hits, desc_hits)
 
             # --------------------------------------------------------
             # Other scores
@@ -327,6 +335,7 @@ def match_user(conn, user_id: int, limit=200):
             stored_count += 1
 
     conn.commit()
+    invalidate_dashboard(profile["user_id"])
 
     print(f"[MATCH] Found {len(top_matches)} matches in area for user {user_id}")
     print(f"[MATCH] Stored {stored_count} matches above matching threshold")
@@ -175,12 +175,53 @@ class Application(db.Model):
     user = db.relationship("User", backref="applications")
     manual_started = db.Column(db.Boolean, default=False)
     credit_consumed = db.Column(db.Boolean, default=False, nullable=False)
+    # batch credit reservation this application draws on (auto mode)
+    reservation_id = db.Column(db.BigInteger, db.ForeignKey("credit_reservations.id"))
 
     # prevent duplicates for a user+job
     __table_args__ = (
         db.UniqueConstraint("user_id", "job_url_hash", name="unique_user_job_application"),
+        # dashboard feeds: keyset pages on (created_at, id), per user and status
+        db.Index("idx_applications_user_status_created", "user_id", "status", "created_at", "id"),
+        db.Index("idx_applications_user_created", "user_id", "created_at", "id"),
+        # match feed anti-join
+        db.Index("idx_applications_user_job", "user_id", "job_id"),
     )
 
+
+class ApplicationDailyCount(db.Model):
+    """
+    Applications per user, day (of created_at) and status. Maintained by
+    the triggers in sql/create_tables/application_daily_counts.sql; read only.
+    """
+    __tablename__ = "application_daily_counts"
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class UserStats(db.Model):
+    """
+    Per-user aggregates for the admin users table. Maintained by the
+    triggers in sql/create_tables/user_stats.sql; read only.
+    """
+    __tablename__ = "user_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    application_count = db.Column(db.Integer, nullable=False, default=0)
+    last_application_at = db.Column(db.DateTime)
+    available_credits = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("idx_user_stats_application_count", "application_count", "user_id"),
+        db.Index("idx_user_stats_last_application", "last_application_at", "user_id"),
+        db.Index("idx_user_stats_credits", "available_credits", "user_id"),
+    )
+
+
 class Job(db.Model):
     __tablename__ = "jobs"
 
@@ -204,6 +245,8 @@ class Job(db.Model):
     source_ats = db.Column(db.Text)
     source_job_id = db.Column(db.Text)
     feed_source = db.Column(db.Text)
+    condensed_description = db.Column(db.Text)
+    condensed_hash = db.Column(db.Text)
 
     # optional: for fast matching UI
     def display_location(self):
@@ -226,6 +269,8 @@ class Match(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "job_url", name="unique_user_job"),
+        # match feed: keyset pages on (score, id) per user
+        db.Index("idx_matches_user_score", "user_id", "score", "id"),
     )
 
 class CreditBalance(db.Model):
@@ -250,6 +295,26 @@ class CreditBalance(db.Model):
 
     user = db.relationship("User", backref=db.backref("credit_balance", uselist=False))
 
+
+class CreditReservation(db.Model):
+    """
+    Credits taken off the balance for a batch of queued applications and
+    charged as they succeed; see sql/create_tables/credit_reservations.sql.
+    """
+    __tablename__ = "credit_reservations"
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    reserved = db.Column(db.Integer, nullable=False)
+    consumed = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String, nullable=False, default="open")   # open | settled
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    settled_at = db.Column(db.DateTime)
+
 class CreditLedger(db.Model):
     __tablename__ = "credit_ledger"
 
@@ -534,6 +599,14 @@ class StripeWebhookEvent(db.Model):
         nullable=True
     )
 
+    # Queue state (workers/stripe_webhook_worker.py)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # due time / lease; NULL = not queued (bad signature) or given up
+    next_attempt_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    # per-customer ordering key, and Stripe's event timestamp
+    customer_id = db.Column(db.String(255), nullable=True)
+    stripe_created = db.Column(db.BigInteger, nullable=True)
+
     def mark_processed(self):
         self.processed = True
         self.processed_at = datetime.utcnow()
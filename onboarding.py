@@ -1,14 +1,12 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from models import db, Profile, SubscriptionPlan
 from werkzeug.utils import secure_filename
-from utils.cv_parser import extract_cv_text
-from utils.cv_ai import parse_cv_with_ai
+from utils.cv_ingest import enqueue_cv, latest_cv_ingest, CV_MAX_UPLOAD_BYTES
 from utils.geocode import geocode_city
 from matching import match_user
 import psycopg2
 import os
-from utils.s3_uploader import upload_to_s3
 from utils.background import run_async
 from utils.credits import init_credit_balance
 from utils.onboarding import resume_onboarding, recommend_plan
@@ -170,26 +168,22 @@ def step3():
         print(file)
         if file and file.filename:
             filename = secure_filename(file.filename)
-
-            # Always use true temp dir in Render
-            cv_path = os.path.join("/tmp", filename)
             file.stream.seek(0)
-            file.save(cv_path)
-
-            # Parse the CV locally BEFORE upload
-            raw_text = extract_cv_text(cv_path)
-            parsed = parse_cv_with_ai(raw_text)
-            profile.ai_cv_data = parsed
+            data = file.read(CV_MAX_UPLOAD_BYTES + 1)
+            if len(data) > CV_MAX_UPLOAD_BYTES:
+                flash(f"Your CV is too large, please upload a file under {CV_MAX_UPLOAD_BYTES // (1024 * 1024)} MB", "error")
+                return redirect(request.url)
 
-            # Upload to S3 after parsing
-            s3_url = upload_to_s3(cv_path, folder=f"user-cvs/{current_user.id}")
-            profile.cv_location = s3_url
-
-            # Optionally remove temp file
+            # Extraction, AI parsing and the S3 upload run in the CV ingest
+            # worker; the UI polls onboarding.cv_status until it is done
             try:
-                os.remove(cv_path)
-            except:
-                pass
+                conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+                enqueue_cv(conn, current_user.id, filename, data)
+                conn.close()
+            except Exception as e:
+                print("Failed to queue CV:", e)
+                flash("We couldn't save your CV, please try again", "error")
+                return redirect(request.url)
 
         # Mark onboarding complete
         profile.onboarding_step = 4
@@ -214,6 +208,41 @@ def step3():
     return render_template("onboarding_step3.html", profile=profile, step=3, progress=60)
 
 
+def get_cv_status(user_id):
+    """
+    Status of the user's latest CV upload: pending, processing, done,
+    failed, or none when nothing was queued.
+    """
+    try:
+        conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+        row = latest_cv_ingest(conn, user_id)
+        conn.close()
+    except Exception as e:
+        print("CV status lookup failed:", e)
+        row = None
+
+    if not row:
+        return {"status": "none", "error": None}
+    return {"status": row["status"], "error": row["error"]}
+
+
+@onboarding.route("/onboarding/cv-status")
+@login_required
+def cv_status():
+    return jsonify(get_cv_status(current_user.id))
+
+
+def cv_processing_page(profile):
+    """
+    Shown instead of the CV pages while the upload is still being read,
+    so the user never edits (and saves) an empty CV.
+    """
+    status = get_cv_status(current_user.id)
+    if status["status"] in ("pending", "processing") or (status["status"] == "failed" and not profile.ai_cv_data):
+        return render_template("cv_processing.html", cv_status=status)
+    return None
+
+
 @onboarding.route("/onboarding/step4", methods=["GET", "POST"])
 @login_required
 def step4():
@@ -246,7 +275,13 @@ def step4():
         # Redirect to success dashboard or next step
         return redirect(url_for("onboarding.onboarding_intent"))
 
-    return render_template("onboarding_step4.html", profile=profile, step=4, progress=80)
+    return render_template(
+        "onboarding_step4.html",
+        profile=profile,
+        cv_status=get_cv_status(user.id),
+        step=4,
+        progress=80,
+    )
 
 
 
@@ -258,6 +293,10 @@ def step4():
 def cv_preview():
 
     profile = get_or_create_profile()
+    waiting = cv_processing_page(profile)
+    if waiting:
+        return waiting
+
     if not profile.onboarding_complete:
         profile.onboarding_complete = True
         db.session.commit()
@@ -276,6 +315,11 @@ def edit_cv():
         profile.onboarding_step = 7
         db.session.commit()
 
+    if request.method == "GET":
+        waiting = cv_processing_page(profile)
+        if waiting:
+            return waiting
+
     if request.method == "POST":
 
         def split_clean(value):
@@ -0,0 +1,378 @@
+"""
+Offline benchmark for the ATS bots.
+
+Serves the recorded application pages in scripts/fixtures/ats from a local
+HTTP server (form posts and Workable's resume upload are stubbed), swaps
+every OpenAI client for a fake one, and runs GreenhouseBot.apply,
+WorkableBot.apply and LeverBot.apply against them. For each run it reports:
+
+  - result status and wall time
+  - per-phase timings from the bot's Pacer (wall time and deliberate waits)
+  - browser round trips (Playwright protocol messages, by method)
+  - LLM calls made through the fake client
+  - Python peak allocations (tracemalloc) and process max RSS
+
+No network, database, S3 or API keys are needed, only a Playwright browser:
+
+    python -m playwright install chromium
+    python scripts/bench_bots.py                      # all bots, fast pacing
+    python scripts/bench_bots.py --bots greenhouse --runs 3 --pacing standard
+    python scripts/bench_bots.py --llm-latency-ms 800 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before the bots are imported (proxy list and pacing default)
+os.environ.setdefault("PROXY_FILE", "/nonexistent")
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ats")
+
+FIXTURE_JOBS = {
+    "greenhouse": {"id": 9001, "path": "/greenhouse/job.html", "company": "Acme", "title": "Senior Backend Engineer"},
+    "workable": {"id": 9002, "path": "/workable/job.html", "company": "Northwind", "title": "Data Analyst"},
+    "lever": {"id": 9003, "path": "/lever/job.html", "company": "Globex", "title": "Product Designer"},
+}
+
+POST_ROUTES = {
+    "/greenhouse/submit": "greenhouse/thanks.html",
+    "/lever/submit": "lever/thanks.html",
+}
+
+FIXTURE_USER = {
+    "user_id": 1,
+    "first_name": "Jane",
+    "last_name": "Doe",
+    "email": "jane.doe@example.com",
+    "phone": "07700 900123",
+    "city": "London",
+    "country": "United Kingdom",
+    "cover_letter_text": "I would love to bring my experience to your team.",
+    "ai_cv_data": json.dumps({
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "email": "jane.doe@example.com",
+        "phone": "+447700900123",
+        "address": "London, United Kingdom",
+        "summary": "Engineer and analyst with eight years of experience shipping data products.",
+        "skills": ["Python", "SQL", "PostgreSQL", "Figma", "Dashboards"],
+        "experience": [
+            {"role": "Senior Engineer", "company": "Initech", "start_date": "March 2019", "end_date": "Present",
+             "description": "Built booking APIs and the reporting warehouse."},
+            {"role": "Analyst", "company": "Hooli", "start_date": "June 2016", "end_date": "February 2019",
+             "description": "Owned finance dashboards."},
+        ],
+        "education": [{"degree": "BSc Computer Science", "institution": "University of Leeds", "graduation_year": "2016"}],
+        "additional_details": {"linkedin": "https://www.linkedin.com/in/janedoe", "portfolio": "https://janedoe.dev"},
+    }),
+    "application_data": json.dumps({
+        "legally_allowed": True,
+        "sponsorship_required": False,
+        "willing_to_relocate": False,
+        "notice_period": "1 month",
+        "desired_salary": "85000",
+        "years_experience": "8",
+        "work_authorization": "Yes, I have the right to work in the UK",
+        "location_preference": "Hybrid",
+    }),
+}
+
+
+# ---------------------------------------------------------------------------
+# Local fixture server
+# ---------------------------------------------------------------------------
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    requests_seen = Counter()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        FixtureHandler.requests_seen[f"GET {self.path.split('?')[0]}"] += 1
+        path = self.translate_path(self.path)
+        if path.endswith(".html") and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                html = f.read().replace("{{BASE_URL}}", self.server.base_url)
+            self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+            return
+        super().do_GET()
+
+    def do_POST(self):
+        route = self.path.split("?")[0]
+        FixtureHandler.requests_seen[f"POST {route}"] += 1
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        if route == "/form/upload/resume":
+            body = json.dumps({"downloadUrl": f"{self.server.base_url}/uploads/resume.pdf"})
+            self._send(200, body.encode("utf-8"), "application/json")
+            return
+
+        if route in POST_ROUTES:
+            with open(os.path.join(FIXTURES_DIR, POST_ROUTES[route]), "rb") as f:
+                self._send(200, f.read(), "text/html; charset=utf-8")
+            return
+
+        self._send(200, b"{}", "application/json")
+
+
+def start_fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Fake LLM
+# ---------------------------------------------------------------------------
+
+LEVER_AGENT_ACTIONS = [
+    {"action": "upload", "selector": "input[name='resume']", "value": "<cv>"},
+    {"action": "click", "selector": "button[type='submit']"},
+    {"action": "finish", "status": "success", "message": "Submitted"},
+]
+
+
+class FakeCompletions:
+    def __init__(self, stats, latency_s):
+        self.stats = stats
+        self.latency_s = latency_s
+
+    async def create(self, model=None, messages=None, response_format=None, **kwargs):
+        self.stats["llm_calls"] += 1
+        self.stats[f"llm_calls[{model}]"] += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+
+        user_msg = next((m["content"] for m in reversed(messages or []) if m["role"] == "user"), "")
+        content = self._answer(user_msg, response_format)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=len(user_msg) // 4, completion_tokens=len(content) // 4,
+                                  total_tokens=(len(user_msg) + len(content)) // 4),
+        )
+
+    @staticmethod
+    def _answer(user_msg, response_format):
+        if "browser automation planner for Lever" in user_msg:
+            return json.dumps(LEVER_AGENT_ACTIONS)
+
+        if response_format and response_format.get("type") == "json_object":
+            try:
+                payload = json.loads(user_msg)
+            except ValueError:
+                payload = {}
+            if "questions" in payload:
+                answers = {}
+                for q in payload["questions"]:
+                    opts = q.get("options") or []
+                    answers[q["id"]] = opts[0] if opts else "I have relevant experience and would welcome the chance to discuss it."
+                return json.dumps({"answers": answers})
+            return "{}"
+
+        if "select" in user_msg.lower() and "option" in user_msg.lower():
+            return "Yes"
+        return "I have relevant experience and would welcome the chance to discuss it."
+
+
+class FakeOpenAI:
+    def __init__(self, stats, latency_s):
+        self.chat = SimpleNamespace(completions=FakeCompletions(stats, latency_s))
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+def count_browser_round_trips(stats):
+    """Count every Playwright protocol message sent to the browser, by method."""
+    from playwright._impl import _connection
+
+    original = _connection.Connection._send_message_to_server
+
+    def counting(self, *args, **kwargs):
+        method = kwargs.get("method") or (args[1] if len(args) > 1 else "?")
+        if not str(method).startswith("__"):
+            stats["round_trips"] += 1
+            stats[f"rt[{method}]"] += 1
+        return original(self, *args, **kwargs)
+
+    _connection.Connection._send_message_to_server = counting
+
+
+def install_fakes(stats, latency_s):
+    import bots.greenhouse
+    import bots.lever
+    import bots.workable
+    import utils.answer_engine
+
+    fake = FakeOpenAI(stats, latency_s)
+    for module in (bots.greenhouse, bots.workable, bots.lever, utils.answer_engine):
+        module.client = fake
+
+    async def fake_upload(local_path, folder, custom_filename=None):
+        stats["s3_uploads"] += 1
+        return f"file://{local_path}"
+
+    for module in (bots.greenhouse, bots.workable, bots.lever):
+        module.upload_to_s3_async = fake_upload
+
+
+def make_bot(name, pacing):
+    from bots.pacing import Pacer
+
+    if name == "greenhouse":
+        from bots.greenhouse import GreenhouseBot
+        bot = GreenhouseBot()
+    elif name == "workable":
+        from bots.workable import WorkableBot
+        bot = WorkableBot()
+        # Workable submits through its public API after the browser step; stop at the filled form
+        bot.test_mode = True
+    else:
+        from bots.lever import LeverBot
+        bot = LeverBot()
+        bot.test_mode = False
+
+    bot.show_browser = False
+    bot.pacing = Pacer(pacing)
+    return bot
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+async def run_one(name, base_url, cv_path, pacing, stats):
+    from utils.answer_engine import answer_cache
+
+    spec = FIXTURE_JOBS[name]
+    job = {
+        "id": spec["id"],
+        "apply_url": base_url + spec["path"],
+        "company": spec["company"],
+        "title": spec["title"],
+    }
+
+    bot = make_bot(name, pacing)
+    answer_cache.memory.clear()
+    before = Counter(stats)
+    FixtureHandler.requests_seen.clear()
+
+    started = time.perf_counter()
+    result = await bot.apply(job, dict(FIXTURE_USER), cv_path)
+    elapsed = time.perf_counter() - started
+
+    delta = Counter(stats)
+    delta.subtract(before)
+    return {
+        "bot": name,
+        "status": result.status,
+        "message": (result.message or "")[:120],
+        "seconds": round(elapsed, 3),
+        "waited_seconds": round(bot.pacing.waited, 3),
+        "phases": {k: {"seconds": round(v[0], 3), "waited": round(v[1], 3)} for k, v in bot.pacing.timings.items()},
+        "round_trips": delta["round_trips"],
+        "top_round_trips": {
+            k[3:-1]: v for k, v in sorted(
+                ((k, v) for k, v in delta.items() if k.startswith("rt[")), key=lambda kv: -kv[1]
+            )[:8]
+        },
+        "llm_calls": delta["llm_calls"],
+        "http_requests": dict(FixtureHandler.requests_seen),
+    }
+
+
+def print_result(r):
+    print(f"\n=== {r['bot']}  status={r['status']}  {r['seconds']:.2f}s (deliberate waits {r['waited_seconds']:.2f}s)")
+    if r["message"]:
+        print(f"    message: {r['message']}")
+    print(f"    {'phase':<18}{'seconds':>10}{'waited':>10}")
+    for phase, t in r["phases"].items():
+        print(f"    {phase:<18}{t['seconds']:>10.3f}{t['waited']:>10.3f}")
+    print(f"    browser round trips: {r['round_trips']}  " +
+          ", ".join(f"{k}={v}" for k, v in r["top_round_trips"].items()))
+    print(f"    LLM calls: {r['llm_calls']}")
+    print(f"    fixture HTTP requests: {sum(r['http_requests'].values())}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bots", default="greenhouse,workable,lever")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--pacing", default="fast", help="pacing profile (fast / standard)")
+    parser.add_argument("--llm-latency-ms", type=int, default=0, help="simulated latency per LLM call")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    stats = Counter()
+    count_browser_round_trips(stats)
+    install_fakes(stats, args.llm_latency_ms / 1000)
+
+    server = start_fixture_server()
+    print(f"Fixture server on {server.base_url}  pacing={args.pacing}  llm_latency={args.llm_latency_ms}ms")
+
+    fd, cv_path = tempfile.mkstemp(prefix="bench_cv_", suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"%PDF-1.4\n% offline benchmark CV\n")
+
+    tracemalloc.start()
+    results = []
+    try:
+        for _ in range(args.runs):
+            for name in [b.strip() for b in args.bots.split(",") if b.strip()]:
+                r = await run_one(name, server.base_url, cv_path, args.pacing, stats)
+                print_result(r)
+                results.append(r)
+    finally:
+        server.shutdown()
+        os.remove(cv_path)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"\nPython peak allocations: {peak / 1e6:.1f} MB   process max RSS: {max_rss_mb:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "pacing": args.pacing,
+                "llm_latency_ms": args.llm_latency_ms,
+                "python_peak_mb": round(peak / 1e6, 1),
+                "max_rss_mb": round(max_rss_mb, 1),
+                "runs": results,
+            }, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark for utils.keyword_engine against the keyword loop match_user
+used before it (per user, per job: lowercase title and description, then
+`kw in text` per title keyword).
+
+Builds a synthetic job block (titles plus descriptions of a few thousand
+characters) and a set of users with comma-separated title lists drawn
+from a shared pool, as in profile.job_titles. Both paths score every
+user against every job, as the daily run does. Reports total time, time
+per user, and checks that every score is identical.
+
+    python scripts/bench_keyword_engine.py [--jobs 5000] [--users 200] [--no-automaton]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.keyword_engine import JobKeywordHits, PhraseIndex, keyword_score, ahocorasick
+
+
+TITLES = [
+    "software engineer", "senior software engineer", "backend engineer", "frontend developer",
+    "full stack developer", "data engineer", "data analyst", "data scientist",
+    "machine learning engineer", "product manager", "product owner", "project manager",
+    "program manager", "ux designer", "ui designer", "product designer", "marketing manager",
+    "content writer", "customer success manager", "account executive", "account manager",
+    "sales manager", "business analyst", "finance manager", "accountant", "recruiter",
+    "hr manager", "operations manager", "devops engineer", "site reliability engineer",
+    "qa engineer", "engineering manager", "nurse", "teacher", "engineer", "manager",
+]
+
+FILLER = (
+    "we are looking for a motivated person to join our growing team. you will work "
+    "closely with stakeholders across the business, own projects end to end and "
+    "help shape how we build. experience with modern tooling is a plus. "
+).split()
+
+
+def make_jobs(n, rng, desc_chars):
+    jobs = []
+    for i in range(n):
+        title = rng.choice(["", "Senior ", "Lead ", "Junior "]) + rng.choice(TITLES).title()
+        words, length = [], 0
+        while length < desc_chars:
+            words.append(rng.choice(TITLES) if rng.random() < 0.01 else rng.choice(FILLER))
+            length += len(words[-1]) + 1
+        jobs.append({"id": i, "title": title, "description": " ".join(words).capitalize()})
+    return jobs
+
+
+def make_users(n, rng):
+    return [[t.lower() for t in rng.sample(TITLES, rng.randint(1, 4))] for _ in range(n)]
+
+
+def legacy_scores(jobs, keywords):
+    scores = []
+    for job in jobs:
+        job_title_lower = (job["title"] or "").lower()
+        job_desc_lower = (job["description"] or "").lower()
+
+        kw_score = 0.0
+        for kw in keywords:
+            if kw in job_title_lower:
+                kw_score += 0.7
+            elif kw in job_desc_lower:
+                kw_score += 0.4
+        scores.append(kw_score)
+    return scores
+
+
+def engine_scores(jobs, keywords, keyword_hits):
+    keyword_ids = keyword_hits.index.ids_for(keywords)
+    scores = []
+    for job in jobs:
+        title_hits, desc_hits = keyword_hits.get(job)
+        scores.append(keyword_score(keyword_ids, title_hits, desc_hits))
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--desc-chars", type=int, default=4000)
+    parser.add_argument("--no-automaton", action="store_true", help="use the substring fallback")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    jobs = make_jobs(args.jobs, rng, args.desc_chars)
+    users = make_users(args.users, rng)
+    print(f"{len(jobs)} jobs, {len(users)} users, pyahocorasick {'off' if args.no_automaton or ahocorasick is None else 'on'}")
+
+    started = time.perf_counter()
+    legacy = [legacy_scores(jobs, keywords) for keywords in users]
+    legacy_secs = time.perf_counter() - started
+
+    started = time.perf_counter()
+    phrases = sorted({t for keywords in users for t in keywords})
+    keyword_hits = JobKeywordHits(PhraseIndex(phrases, use_automaton=not args.no_automaton))
+    first_user = engine_scores(jobs, users[0], keyword_hits)
+    first_secs = time.perf_counter() - started
+    engine = [first_user] + [engine_scores(jobs, keywords, keyword_hits) for keywords in users[1:]]
+    engine_secs = time.perf_counter() - started
+
+    mismatches = sum(a != b for la, lb in zip(legacy, engine) for a, b in zip(la, lb))
+
+    print(f"legacy loop   {legacy_secs:8.2f}s  {legacy_secs / len(users) * 1000:8.1f} ms/user")
+    print(f"keyword engine {engine_secs:7.2f}s  {engine_secs / len(users) * 1000:8.1f} ms/user "
+          f"(index + scan of {keyword_hits.scanned} jobs {first_secs:.2f}s, {len(phrases)} phrases)")
+    print(f"speedup {legacy_secs / engine_secs:.1f}x, score mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
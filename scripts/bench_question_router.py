@@ -0,0 +1,128 @@
+"""
+Benchmark for utils.question_router.classify().
+
+Runs a corpus of question labels seen on Greenhouse / Workable / Lever
+forms through the classifier and reports cold (first call, regex scan)
+and warm (memoized) cost per question, plus how many questions resolve
+to at least one intent without the LLM.
+
+    python scripts/bench_question_router.py [--rounds 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import question_router
+from utils.question_router import classify
+
+
+CORPUS = [
+    "First Name",
+    "Last Name",
+    "Preferred First Name",
+    "Email",
+    "Phone",
+    "Mobile phone number",
+    "Address",
+    "City",
+    "Location (City)",
+    "LinkedIn Profile",
+    "Website",
+    "Portfolio URL",
+    "Full name",
+    "Are you legally authorized to work in the United States?",
+    "Are you authorised to work in the UK?",
+    "Do you have the right to work in the country where this job is located?",
+    "Are you eligible to work in Canada without restriction?",
+    "Will you now or in the future require sponsorship for employment visa status (e.g. H-1B visa status)?",
+    "Do you require visa sponsorship?",
+    "What is your current visa status?",
+    "Are you willing to relocate?",
+    "Would you be open to relocation to London?",
+    "Are you able to commute to our office in Austin, TX?",
+    "Do you live locally to the office?",
+    "What is your work preference? (Remote / Hybrid / On-site)",
+    "Are you open to hybrid working (3 days in office)?",
+    "What are your salary expectations?",
+    "Expected annual compensation (USD)",
+    "Desired pay range",
+    "Current CTC",
+    "What is your notice period?",
+    "When are you available to start?",
+    "What is your earliest start date?",
+    "Availability",
+    "How many years of experience do you have with Python?",
+    "Years of experience in this field",
+    "Do you have experience in this field?",
+    "Please describe your experience with distributed systems.",
+    "List your key skills",
+    "School",
+    "Degree",
+    "Discipline",
+    "Graduation year",
+    "Start date month",
+    "Start date year",
+    "End date month",
+    "End date year",
+    "Company name",
+    "Current employer",
+    "Current company",
+    "Title",
+    "What is your current role?",
+    "Have you ever been convicted of a criminal offence?",
+    "Have you ever been convicted of a felony or misdemeanor?",
+    "Are you bound by any restrictive covenants or non-compete agreements?",
+    "Are there any legal limitations on your ability to perform this job?",
+    "If yes, can you provide a copy of the agreement?",
+    "Have you previously interviewed with us?",
+    "What is your race/ethnicity?",
+    "Gender",
+    "Disability Status",
+    "Do you require any accommodation due to a disability?",
+    "Veteran Status",
+    "Why do you want to work at Acme?",
+    "What excites you about this role?",
+    "Tell us about a project you are proud of.",
+    "Cover letter",
+    "How did you hear about this job?",
+    "Anything else you would like to share?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    question_router._classify_normalized.cache_clear()
+
+    t0 = time.perf_counter()
+    results = [classify(q) for q in CORPUS]
+    cold = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(args.rounds):
+        for q in CORPUS:
+            classify(q)
+    warm = time.perf_counter() - t0
+
+    resolved = sum(1 for r in results if r)
+    n = len(CORPUS)
+
+    print(f"questions:        {n}")
+    print(f"resolved:         {resolved}/{n} ({resolved / n:.0%})")
+    print(f"cold per call:    {cold / n * 1e6:.1f} µs")
+    print(f"warm per call:    {warm / (n * args.rounds) * 1e6:.2f} µs")
+    print(f"cache:            {question_router.cache_info()}")
+    print()
+
+    for q, r in zip(CORPUS, results):
+        print(f"  {', '.join(sorted(r)) or '-':<40} {q}")
+
+
+if __name__ == "__main__":
+    main()
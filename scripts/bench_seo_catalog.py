@@ -0,0 +1,130 @@
+"""
+Benchmark for the SEO snapshot catalog (workers/seo_snapshot_worker.py and
+utils/seo_catalog.py) against a local Postgres and a local S3 stand-in.
+
+--seed fills an empty scratch database with synthetic live jobs spread
+over the catalog's role families, countries and a few hundred cities
+(only the jobs columns the worker reads, plus the trigram index it
+relies on). The worker then runs once in full and once incrementally;
+it prints page counts and generation time per 1000 pages itself.
+
+    createdb seo_bench
+    export DATABASE_URL=postgresql://localhost/seo_bench
+    python scripts/bench_seo_catalog.py --seed --jobs 300000
+
+    # files under a local directory instead of S3 (hashes are not stored)
+    python scripts/bench_seo_catalog.py --out /tmp/seo-out
+
+    # a local S3 stand-in (minio / moto server); the bucket must exist
+    export AWS_S3_ENDPOINT_URL=http://localhost:9000 SEO_S3_BUCKET=seo-bench
+    python scripts/bench_seo_catalog.py
+
+Never point DATABASE_URL or the S3 settings at production.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "workers"))
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from utils.seo_catalog import COUNTRIES, ROLE_FAMILIES
+
+SCHEMA = """
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_url TEXT NOT NULL,
+        title TEXT NOT NULL,
+        company TEXT NULL,
+        city TEXT NOT NULL,
+        state TEXT NOT NULL DEFAULT '',
+        country TEXT NOT NULL,
+        is_remote BOOL DEFAULT FALSE,
+        posted_at DATE NULL,
+        scraped_at TIMESTAMP DEFAULT NOW(),
+        expires_at DATE DEFAULT (CURRENT_DATE + INTERVAL '14 days'),
+        source_job_id TEXT NOT NULL,
+        id BIGSERIAL,
+        PRIMARY KEY (job_url, city, state, country, source_job_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_title_trgm ON jobs USING gin (title gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs (country);
+    CREATE TABLE IF NOT EXISTS seo_snapshot_state (
+        slug TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        job_count INT NULL,
+        uploaded_at TIMESTAMP NOT NULL DEFAULT NOW()
+    );
+"""
+
+LEVELS = ["", "Senior ", "Junior ", "Lead ", "Staff ", "Principal "]
+
+
+def seed(conn, n_jobs, n_cities):
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA)
+        cur.execute("SELECT COUNT(*) FROM jobs")
+        if cur.fetchone()[0]:
+            print("jobs is not empty, skipping seed")
+            conn.commit()
+            return
+
+    rng = random.Random(42)
+    keywords = [k for family in ROLE_FAMILIES.values() for k in family]
+    countries = list(COUNTRIES)
+    # Long-tailed city sizes, like the real feed
+    cities = {c: [f"City {c.upper()} {i}" for i in range(n_cities // len(countries))] for c in countries}
+
+    started = time.monotonic()
+    batch = []
+    with conn.cursor() as cur:
+        for i in range(n_jobs):
+            country = rng.choice(countries)
+            city_list = cities[country]
+            city = city_list[min(int(rng.paretovariate(1.2)) - 1, len(city_list) - 1)]
+            title = f"{rng.choice(LEVELS)}{rng.choice(keywords).title()}"
+            remote = rng.random() < 0.2
+            batch.append((
+                f"https://jobs.example.com/{i}", title, f"Company {rng.randrange(5000)}",
+                "Remote" if remote else city, country, remote, str(i),
+            ))
+            if len(batch) == 5000:
+                execute_values(cur, "INSERT INTO jobs (job_url, title, company, city, country, is_remote, source_job_id) VALUES %s", batch)
+                batch = []
+        if batch:
+            execute_values(cur, "INSERT INTO jobs (job_url, title, company, city, country, is_remote, source_job_id) VALUES %s", batch)
+        cur.execute("ANALYZE jobs")
+    conn.commit()
+    print(f"seeded {n_jobs} jobs in {time.monotonic() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="store_true", help="create and fill the scratch tables")
+    parser.add_argument("--jobs", type=int, default=200000)
+    parser.add_argument("--cities", type=int, default=1400)
+    parser.add_argument("--out", help="write files to this directory instead of S3")
+    args = parser.parse_args()
+
+    if args.seed:
+        conn = psycopg2.connect(os.environ["DATABASE_URL"])
+        seed(conn, args.jobs, args.cities)
+        conn.close()
+
+    import seo_snapshot_worker
+
+    print("--- full run")
+    seo_snapshot_worker.run(full=True, out_dir=args.out)
+    if not args.out:
+        print("--- incremental run")
+        seo_snapshot_worker.run()
+
+
+if __name__ == "__main__":
+    main()
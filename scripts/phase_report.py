@@ -0,0 +1,56 @@
+"""
+p50 / p95 per ATS and phase from application_phase_timings.
+
+    python scripts/phase_report.py --days 7
+    python scripts/phase_report.py --days 1 --ats greenhouse
+"""
+
+import argparse
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import psycopg2
+
+
+REPORT_QUERY = """
+    SELECT
+        COALESCE(ats, '-') AS ats,
+        phase,
+        COUNT(*) AS n,
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms) AS p50,
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms) AS p95,
+        AVG(prompt_tokens) AS prompt_tokens,
+        AVG(completion_tokens) AS completion_tokens
+    FROM application_phase_timings
+    WHERE created_at > NOW() - make_interval(days => %s)
+      AND (%s::text IS NULL OR ats = %s)
+    GROUP BY 1, 2
+    ORDER BY 1, p95 DESC
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--ats", default=None)
+    args = parser.parse_args()
+
+    db_url = os.environ.get("DATABASE_URL")
+    if not db_url:
+        raise RuntimeError("DATABASE_URL not set")
+
+    with psycopg2.connect(db_url) as conn, conn.cursor() as cur:
+        cur.execute(REPORT_QUERY, (args.days, args.ats, args.ats))
+        rows = cur.fetchall()
+
+    print(f"{'ats':<12} {'phase':<24} {'n':>6} {'p50':>9} {'p95':>9}  avg tokens (in+out)")
+    for ats, phase, n, p50, p95, prompt_tokens, completion_tokens in rows:
+        tokens = f"{prompt_tokens:.0f}+{completion_tokens:.0f}" if prompt_tokens is not None else ""
+        print(f"{ats:<12} {phase:<24} {n:>6} {p50 / 1000:8.2f}s {p95 / 1000:8.2f}s  {tokens}")
+
+
+if __name__ == "__main__":
+    main()
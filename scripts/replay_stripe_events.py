@@ -0,0 +1,68 @@
+"""
+Replay recorded Stripe events through the webhook queue.
+
+Each file holds one event as Stripe sends it (the JSON body of a webhook
+or `stripe events retrieve`), a JSON array of events, or one event per
+line. Events are queued exactly as the webhook would queue them - minus
+the signature check - and, with --process, drained in-process the way
+workers/stripe_webhook_worker.py does. Events already stored (same id)
+are skipped. Point DATABASE_URL at a dev database.
+
+    python scripts/replay_stripe_events.py events/*.json --process
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from billing import claim_stripe_events, enqueue_stripe_event, process_stripe_event, webhook_queue_stats
+
+
+def load_events(path):
+    with open(path) as f:
+        raw = f.read().strip()
+    if raw.startswith("["):
+        return json.loads(raw)
+    try:
+        return [json.loads(raw)]
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--process", action="store_true", help="drain the queue after enqueueing")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        queued = 0
+        for path in args.files:
+            for event in load_events(path):
+                enqueue_stripe_event(event, json.dumps(event))
+                queued += 1
+        print(f"Queued {queued} events")
+
+        if args.process:
+            done = failed = 0
+            while True:
+                rows = claim_stripe_events()
+                if not rows:
+                    break
+                for row in rows:
+                    if process_stripe_event(row):
+                        done += 1
+                    else:
+                        failed += 1
+            print(f"Processed {done}, failed {failed}")
+
+        print(webhook_queue_stats())
+
+
+if __name__ == "__main__":
+    main()
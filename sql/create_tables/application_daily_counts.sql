@@ -0,0 +1,70 @@
+-- Per-user, per-day application counts by status (day = created_at date),
+-- kept in step with `applications` by triggers so readers do point lookups
+-- instead of scanning applications:
+--   dashboard.dashboard_metrics    sent applications per day, last 60 days
+--   dashboard.build_dashboard_summary   total sent
+--   workers/matches_to_apply.py    today's count for the daily quota
+--
+-- Run once as a whole; the backfill at the end holds a lock on applications
+-- so no write lands between it and the triggers.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS application_daily_counts (
+    user_id INT NOT NULL,
+    day DATE NOT NULL,
+    status TEXT NOT NULL,
+    count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day, status)
+);
+
+-- Rows without created_at have no day and are not counted, here or in the
+-- backfill below.
+CREATE OR REPLACE FUNCTION application_daily_counts_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.created_at IS NOT NULL THEN
+        UPDATE application_daily_counts
+        SET count = count - 1
+        WHERE user_id = OLD.user_id
+          AND day = OLD.created_at::date
+          AND status = COALESCE(OLD.status, 'pending');
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.created_at IS NOT NULL THEN
+        INSERT INTO application_daily_counts (user_id, day, status, count)
+        VALUES (NEW.user_id, NEW.created_at::date, COALESCE(NEW.status, 'pending'), 1)
+        ON CONFLICT (user_id, day, status)
+        DO UPDATE SET count = application_daily_counts.count + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_application_daily_counts_ins_del ON applications;
+CREATE TRIGGER trg_application_daily_counts_ins_del
+    AFTER INSERT OR DELETE ON applications
+    FOR EACH ROW EXECUTE FUNCTION application_daily_counts_sync();
+
+-- Only status moves (or a re-dated / re-assigned row) change the counts
+DROP TRIGGER IF EXISTS trg_application_daily_counts_upd ON applications;
+CREATE TRIGGER trg_application_daily_counts_upd
+    AFTER UPDATE OF status, user_id, created_at ON applications
+    FOR EACH ROW
+    WHEN (
+        OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.user_id IS DISTINCT FROM NEW.user_id
+        OR OLD.created_at IS DISTINCT FROM NEW.created_at
+    )
+    EXECUTE FUNCTION application_daily_counts_sync();
+
+-- Backfill
+LOCK TABLE applications IN SHARE ROW EXCLUSIVE MODE;
+DELETE FROM application_daily_counts;
+INSERT INTO application_daily_counts (user_id, day, status, count)
+SELECT user_id, created_at::date, COALESCE(status, 'pending'), COUNT(*)
+FROM applications
+WHERE created_at IS NOT NULL
+GROUP BY 1, 2, 3;
+
+COMMIT;
@@ -0,0 +1,13 @@
+CREATE TABLE application_phase_timings (
+    id BIGSERIAL PRIMARY KEY,
+    application_id INT NOT NULL,
+    ats TEXT NULL,
+    status TEXT NULL,                          -- final worker outcome (success, retry, manual_required, crashed, ...)
+    phase TEXT NOT NULL,                       -- load, jd_fetch, cv_generate, cv_llm, s3_upload, bot_apply, bot.<phase>, total
+    duration_ms INT NOT NULL,
+    prompt_tokens INT NULL,                    -- model token usage, for LLM phases (cv_llm)
+    completion_tokens INT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX idx_phase_timings_created ON application_phase_timings (created_at);
+CREATE INDEX idx_phase_timings_ats_phase ON application_phase_timings (ats, phase, created_at);
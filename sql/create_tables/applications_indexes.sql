@@ -0,0 +1,6 @@
+-- Dashboard activity feeds (dashboard.application_page): keyset pages on
+-- (created_at, id) per user, for one status (manual_required) or all others.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_applications_user_status_created
+    ON applications (user_id, status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_applications_user_created
+    ON applications (user_id, created_at DESC, id DESC);
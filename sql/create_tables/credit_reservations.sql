@@ -0,0 +1,157 @@
+-- Credit reservations: matches_to_apply takes the credits for a batch of
+-- queued applications off credit_balance in one go (reserve_credits), the
+-- apply worker consumes them against the reservation row instead of the
+-- balance row (consume_application_credit), and the reconciliation job
+-- hands unused credits back once the batch is finished
+-- (settle_credit_reservations, workers/credit_reconcile.py).
+--
+-- Invariant checked by the reconciliation job, per user:
+--   available_credits + SUM(reserved - consumed of open reservations)
+--     = SUM(credit_ledger.change_amount)
+
+CREATE TABLE IF NOT EXISTS credit_reservations (
+    id BIGSERIAL PRIMARY KEY,
+    user_id INT NOT NULL REFERENCES "user" (id) ON DELETE CASCADE,
+    reserved INT NOT NULL,
+    consumed INT NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'open',        -- open | settled
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    settled_at TIMESTAMP NULL,
+    CHECK (consumed <= reserved)
+);
+CREATE INDEX IF NOT EXISTS idx_credit_reservations_open
+    ON credit_reservations (user_id) WHERE status = 'open';
+
+ALTER TABLE applications ADD COLUMN IF NOT EXISTS reservation_id BIGINT NULL REFERENCES credit_reservations (id);
+CREATE INDEX IF NOT EXISTS idx_applications_reservation
+    ON applications (reservation_id) WHERE reservation_id IS NOT NULL;
+
+
+-- Move up to p_count credits from the balance into a new reservation.
+-- Returns no row when the user has no credits.
+CREATE OR REPLACE FUNCTION reserve_credits(p_user_id INT, p_count INT)
+RETURNS TABLE (reservation_id BIGINT, reserved INT) AS $$
+DECLARE
+    v_take INT;
+BEGIN
+    SELECT LEAST(cb.available_credits, p_count) INTO v_take
+    FROM credit_balance cb
+    WHERE cb.user_id = p_user_id
+    FOR UPDATE;
+
+    IF v_take IS NULL OR v_take <= 0 THEN
+        RETURN;
+    END IF;
+
+    UPDATE credit_balance
+    SET available_credits = available_credits - v_take,
+        updated_at = NOW()
+    WHERE user_id = p_user_id;
+
+    RETURN QUERY
+    INSERT INTO credit_reservations (user_id, reserved)
+    VALUES (p_user_id, v_take)
+    RETURNING credit_reservations.id, credit_reservations.reserved;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Charge one credit for a successful application, at most once.
+-- Draws on the application's reservation while it is open and has
+-- credits left, otherwise on the balance.
+-- Returns 'consumed', 'already_consumed' or 'insufficient'.
+CREATE OR REPLACE FUNCTION consume_application_credit(p_app_id BIGINT)
+RETURNS TEXT AS $$
+DECLARE
+    v_user_id INT;
+    v_reservation_id BIGINT;
+    v_consumed BOOLEAN;
+BEGIN
+    SELECT user_id, reservation_id, credit_consumed
+    INTO v_user_id, v_reservation_id, v_consumed
+    FROM applications
+    WHERE id = p_app_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Application % not found', p_app_id;
+    END IF;
+
+    IF v_consumed THEN
+        RETURN 'already_consumed';
+    END IF;
+
+    UPDATE credit_reservations
+    SET consumed = consumed + 1
+    WHERE id = v_reservation_id
+      AND status = 'open'
+      AND consumed < reserved;
+
+    IF NOT FOUND THEN
+        UPDATE credit_balance
+        SET available_credits = available_credits - 1,
+            lifetime_spent = lifetime_spent + 1,
+            updated_at = NOW()
+        WHERE user_id = v_user_id
+          AND available_credits > 0;
+
+        IF NOT FOUND THEN
+            RETURN 'insufficient';
+        END IF;
+    END IF;
+
+    INSERT INTO credit_ledger (user_id, change_amount, reason, reference_id, created_at)
+    VALUES (v_user_id, -1, 'application_success', p_app_id::TEXT, NOW());
+
+    UPDATE applications
+    SET credit_consumed = TRUE
+    WHERE id = p_app_id;
+
+    RETURN 'consumed';
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Close reservations whose applications have all left the queue (or that
+-- are older than p_max_age), returning unused credits to the balance and
+-- adding the used ones to lifetime_spent. Returns the number settled.
+CREATE OR REPLACE FUNCTION settle_credit_reservations(p_max_age INTERVAL DEFAULT INTERVAL '2 days')
+RETURNS INT AS $$
+DECLARE
+    r RECORD;
+    n INT := 0;
+BEGIN
+    FOR r IN
+        SELECT cr.id
+        FROM credit_reservations cr
+        WHERE cr.status = 'open'
+          AND (
+              cr.created_at < NOW() - p_max_age
+              OR NOT EXISTS (
+                  SELECT 1 FROM applications a
+                  WHERE a.reservation_id = cr.id
+                    AND a.status IN ('pending', 'processing')
+              )
+          )
+        ORDER BY cr.id
+        FOR UPDATE SKIP LOCKED
+    LOOP
+        WITH settled AS (
+            UPDATE credit_reservations
+            SET status = 'settled', settled_at = NOW()
+            WHERE id = r.id
+            RETURNING user_id, reserved, consumed
+        )
+        UPDATE credit_balance cb
+        SET available_credits = cb.available_credits + (s.reserved - s.consumed),
+            lifetime_spent = cb.lifetime_spent + s.consumed,
+            updated_at = NOW()
+        FROM settled s
+        WHERE cb.user_id = s.user_id;
+
+        n := n + 1;
+    END LOOP;
+
+    RETURN n;
+END;
+$$ LANGUAGE plpgsql;
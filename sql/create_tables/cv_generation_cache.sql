@@ -0,0 +1,14 @@
+CREATE TABLE cv_generation_cache (
+    cache_key TEXT PRIMARY KEY,                -- sha256(prompt_version | base_cv_hash | job_text_hash)
+    user_id INT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    base_cv_hash TEXT NOT NULL,
+    company TEXT NULL,
+    job_simhash BIGINT NOT NULL,               -- 64-bit simhash of the normalized job text
+    cv_json JSONB NOT NULL,
+    hit_count INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    last_used_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX idx_cv_cache_user_last_used ON cv_generation_cache (user_id, last_used_at DESC);
+CREATE INDEX idx_cv_cache_similar ON cv_generation_cache (base_cv_hash, prompt_version, company);
@@ -0,0 +1,13 @@
+CREATE TABLE cv_ingest_queue (
+    id SERIAL PRIMARY KEY,
+    user_id INT NOT NULL,
+    filename TEXT NOT NULL,
+    file_data BYTEA NULL,                      -- uploaded file, cleared once ingested or failed
+    status TEXT NOT NULL DEFAULT 'pending',    -- pending | processing | done | failed
+    error TEXT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX idx_cv_ingest_open ON cv_ingest_queue (created_at) WHERE status IN ('pending', 'processing');
+CREATE INDEX idx_cv_ingest_user ON cv_ingest_queue (user_id, created_at DESC);
@@ -25,6 +25,8 @@ CREATE TABLE public.jobs (
 	feed_source text NULL,
 	hash text NULL,
 	geo public.geography(point, 4326) NULL,
+	condensed_description text NULL, -- compact brief used in LLM prompts (utils/job_condenser.py)
+	condensed_hash text NULL, -- hash of the description text the brief was made from
 	CONSTRAINT jobs_pkey PRIMARY KEY (job_url, city, state, country, source_job_id)
 );
 CREATE INDEX idx_jobs_city ON public.jobs USING btree (city);
@@ -36,4 +38,8 @@ CREATE INDEX idx_jobs_lon ON public.jobs USING btree (longitude);
 CREATE INDEX idx_jobs_remote ON public.jobs USING btree (is_remote);
 CREATE INDEX idx_jobs_salary_max ON public.jobs USING btree (salary_max);
 CREATE INDEX idx_jobs_salary_min ON public.jobs USING btree (salary_min);
-CREATE INDEX idx_jobs_title_trgm ON public.jobs USING gin (title gin_trgm_ops);
\ No newline at end of file
+CREATE INDEX idx_jobs_title_trgm ON public.jobs USING gin (title gin_trgm_ops);
+
+-- Existing databases:
+-- ALTER TABLE public.jobs ADD COLUMN IF NOT EXISTS condensed_description text NULL;
+-- ALTER TABLE public.jobs ADD COLUMN IF NOT EXISTS condensed_hash text NULL;
@@ -0,0 +1,7 @@
+-- Match feed (dashboard.match_page): best-first keyset pages on (score, id)
+-- per user, with applied jobs and dismissed matches removed by anti-joins.
+-- dismissed_matches is already covered by uq_user_dismissed_match (user_id, match_id).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_matches_user_score
+    ON matches (user_id, score DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_applications_user_job
+    ON applications (user_id, job_id);
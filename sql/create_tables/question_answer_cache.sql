@@ -0,0 +1,9 @@
+CREATE TABLE question_answer_cache (
+    cache_key TEXT PRIMARY KEY,                -- sha256(prompt version, ATS, user, job scope, question, options, style)
+    user_id INT NOT NULL,
+    source TEXT NOT NULL,                      -- 'greenhouse', 'workable', ...
+    question TEXT NOT NULL,                    -- normalized question text, for inspection
+    answer TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX idx_qa_cache_user ON question_answer_cache (user_id);
@@ -0,0 +1,11 @@
+-- Content hash of the last uploaded version of each SEO snapshot (and of
+-- the sitemap index, under slug '__sitemap__', and its shards, under
+-- '__sitemap__/sitemaps/sitemap-N.xml'); workers/seo_snapshot_worker.py
+-- skips uploads whose hash is unchanged and were uploaded within the last
+-- SEO_AGE_REFRESH_DAYS.
+CREATE TABLE seo_snapshot_state (
+    slug TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    job_count INT NULL,
+    uploaded_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,16 @@
+-- stripe_webhook_events doubles as the webhook work queue
+-- (billing.claim_stripe_events / workers/stripe_webhook_worker.py).
+ALTER TABLE stripe_webhook_events ADD COLUMN IF NOT EXISTS attempts INT NOT NULL DEFAULT 0;
+ALTER TABLE stripe_webhook_events ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ NULL;  -- due time / lease; NULL = not queued
+ALTER TABLE stripe_webhook_events ADD COLUMN IF NOT EXISTS customer_id VARCHAR(255) NULL;     -- per-customer ordering
+ALTER TABLE stripe_webhook_events ADD COLUMN IF NOT EXISTS stripe_created BIGINT NULL;        -- event.created
+
+CREATE INDEX IF NOT EXISTS idx_stripe_webhook_due
+    ON stripe_webhook_events (next_attempt_at) WHERE processed = FALSE;
+CREATE INDEX IF NOT EXISTS idx_stripe_webhook_customer_open
+    ON stripe_webhook_events (customer_id, stripe_created, id) WHERE processed = FALSE;
+
+-- Events that were stored but never processed before the queue existed are
+-- left alone (next_attempt_at NULL). To replay them:
+-- UPDATE stripe_webhook_events SET next_attempt_at = NOW()
+-- WHERE processed = FALSE AND stripe_event_id IS NOT NULL;
@@ -0,0 +1,117 @@
+-- Per-user aggregates for the admin users table (admin/routes.dashboard):
+-- application count, last application and available credits, kept in step
+-- by triggers on "user", applications and credit_balance so the table can
+-- be sorted and paginated on indexes instead of grouping applications.
+--
+-- Run once as a whole; the backfill at the end holds locks on the source
+-- tables so no write lands between it and the triggers.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INT PRIMARY KEY REFERENCES "user" (id) ON DELETE CASCADE,
+    application_count INT NOT NULL DEFAULT 0,
+    last_application_at TIMESTAMP NULL,
+    available_credits INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_user_stats_application_count ON user_stats (application_count, user_id);
+CREATE INDEX IF NOT EXISTS idx_user_stats_last_application ON user_stats (last_application_at, user_id);
+CREATE INDEX IF NOT EXISTS idx_user_stats_credits ON user_stats (available_credits, user_id);
+
+
+CREATE OR REPLACE FUNCTION user_stats_user_sync() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_stats (user_id) VALUES (NEW.id)
+    ON CONFLICT (user_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_stats_user ON "user";
+CREATE TRIGGER trg_user_stats_user
+    AFTER INSERT ON "user"
+    FOR EACH ROW EXECUTE FUNCTION user_stats_user_sync();
+
+
+CREATE OR REPLACE FUNCTION user_stats_applications_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        -- The removed row may have been the latest; recompute from the
+        -- (user_id, created_at) index.
+        UPDATE user_stats
+        SET application_count = GREATEST(application_count - 1, 0),
+            last_application_at = (
+                SELECT MAX(created_at) FROM applications WHERE user_id = OLD.user_id
+            ),
+            updated_at = NOW()
+        WHERE user_id = OLD.user_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_stats (user_id, application_count, last_application_at)
+        VALUES (NEW.user_id, 1, NEW.created_at)
+        ON CONFLICT (user_id) DO UPDATE
+        SET application_count = user_stats.application_count + 1,
+            last_application_at = GREATEST(user_stats.last_application_at, EXCLUDED.last_application_at),
+            updated_at = NOW();
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_stats_applications_ins_del ON applications;
+CREATE TRIGGER trg_user_stats_applications_ins_del
+    AFTER INSERT OR DELETE ON applications
+    FOR EACH ROW EXECUTE FUNCTION user_stats_applications_sync();
+
+DROP TRIGGER IF EXISTS trg_user_stats_applications_upd ON applications;
+CREATE TRIGGER trg_user_stats_applications_upd
+    AFTER UPDATE OF user_id, created_at ON applications
+    FOR EACH ROW
+    WHEN (
+        OLD.user_id IS DISTINCT FROM NEW.user_id
+        OR OLD.created_at IS DISTINCT FROM NEW.created_at
+    )
+    EXECUTE FUNCTION user_stats_applications_sync();
+
+
+CREATE OR REPLACE FUNCTION user_stats_credits_sync() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_stats (user_id, available_credits)
+    VALUES (NEW.user_id, NEW.available_credits)
+    ON CONFLICT (user_id) DO UPDATE
+    SET available_credits = EXCLUDED.available_credits,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_stats_credits ON credit_balance;
+CREATE TRIGGER trg_user_stats_credits
+    AFTER INSERT OR UPDATE OF available_credits ON credit_balance
+    FOR EACH ROW EXECUTE FUNCTION user_stats_credits_sync();
+
+
+-- Backfill
+LOCK TABLE "user", applications, credit_balance IN SHARE ROW EXCLUSIVE MODE;
+INSERT INTO user_stats (user_id, application_count, last_application_at, available_credits)
+SELECT u.id,
+       COALESCE(a.application_count, 0),
+       a.last_application_at,
+       COALESCE(cb.available_credits, 0)
+FROM "user" u
+LEFT JOIN (
+    SELECT user_id, COUNT(*) AS application_count, MAX(created_at) AS last_application_at
+    FROM applications
+    GROUP BY user_id
+) a ON a.user_id = u.id
+LEFT JOIN credit_balance cb ON cb.user_id = u.id
+ON CONFLICT (user_id) DO UPDATE
+SET application_count = EXCLUDED.application_count,
+    last_application_at = EXCLUDED.last_application_at,
+    available_credits = EXCLUDED.available_credits,
+    updated_at = NOW();
+
+COMMIT;
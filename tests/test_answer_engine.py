@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from utils.answer_engine import is_job_specific, normalize_question
+
+
+@pytest.mark.parametrize("question", [
+    "Why do you want to work here?",
+    "Why are you interested in this role?",
+    "What excites you about our product?",
+    "Why should we hire you?",
+    "What attracted you to the company?",
+    "Tell us why you would be a great fit for us",
+    "How would you contribute to this team?",
+    "Please paste your cover letter",
+    "Are you interested in joining a fast-growing startup?",
+])
+def test_job_specific_questions(question):
+    assert is_job_specific(normalize_question(question))
+
+
+@pytest.mark.parametrize("question", [
+    "Are you authorised to work in the UK?",
+    "Tell us about yourself",
+    "Please let us know your notice period",
+    "Where are you currently based?",
+    "Is there anything else you'd like to share?",
+    "How many users did your last product serve?",
+    "Do you usually work in a team or alone?",
+    "Have you managed a team before?",
+    "Why did you leave your last job?",
+    "What is your current company?",
+    "What are your salary expectations?",
+])
+def test_generic_questions(question):
+    assert not is_job_specific(normalize_question(question))
@@ -0,0 +1,66 @@
+import json
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from utils.cv_builder import CvDocxStream, build_docx_from_json
+from utils.json_stream import TopLevelJsonStream
+
+
+CV = {
+    "first_name": "Jane",
+    "last_name": "Doe",
+    "email": "jane@example.com",
+    "phone": "+44 7700 900123",
+    "summary": "Data analyst with eight years of experience.",
+    "skills": ["SQL", "Python", "dbt"],
+    "experience": [
+        {
+            "title": f"T{i}",
+            "company": f"Company {i}",
+            "location": "London",
+            "start_date": "2020",
+            "end_date": "2022",
+            "responsibilities": [f"Responsibility {i}"],
+            "achievements": [f"Achievement {i}"],
+        }
+        for i in range(4)
+    ],
+    "education": [
+        {"degree": "BSc Mathematics", "institution": "Leeds", "date": "2016"},
+        {"degree": "MSc Statistics", "institution": "UCL", "date": "2017"},
+    ],
+}
+
+
+def paragraphs(doc):
+    return [(p.style.name, p.text) for p in doc.paragraphs]
+
+
+def stream_docx(text, cuts):
+    reader = TopLevelJsonStream()
+    builder = CvDocxStream()
+    start = 0
+    for cut in list(cuts) + [len(text)]:
+        builder.feed(reader.feed(text[start:cut]))
+        start = cut
+    return builder.finish(json.loads(text))
+
+
+def test_every_split_matches_build_docx_from_json():
+    text = json.dumps(CV)
+    expected = paragraphs(build_docx_from_json(CV))
+
+    for cut in range(len(text) + 1):
+        assert paragraphs(stream_docx(text, [cut])) == expected, cut
+
+
+def test_three_chunks_split_inside_sections():
+    text = json.dumps(CV)
+    expected = paragraphs(build_docx_from_json(CV))
+    skills = text.index('"skills"')
+    t1 = text.index('"T1"')
+
+    for a in range(skills - 6, skills + 6):
+        for b in range(t1 - 6, t1 + 6):
+            assert paragraphs(stream_docx(text, [a, b])) == expected, (a, b)
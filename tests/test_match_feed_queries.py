@@ -0,0 +1,104 @@
+"""
+Statement counts for the match feed and apply-from-match. These run
+against a scratch Postgres (the insert relies on ON CONFLICT and
+sha256), named by TEST_DATABASE_URL; never point it at production.
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+from flask import Flask
+from sqlalchemy import event
+
+from dashboard import create_application_from_match, decode_match_cursor, match_page
+from models import db, User, Profile, Job, Match, Application, DismissedMatch, CreditReservation
+
+
+TABLES = [t.__table__ for t in (User, Profile, Job, Match, CreditReservation, Application, DismissedMatch)]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = TEST_DATABASE_URL
+    db.init_app(app)
+
+    with app.app_context():
+        db.metadata.drop_all(db.engine, tables=TABLES)
+        db.metadata.create_all(db.engine, tables=TABLES)
+        try:
+            yield app
+        finally:
+            db.session.remove()
+            db.metadata.drop_all(db.engine, tables=TABLES)
+
+
+@pytest.fixture
+def feed(app):
+    user = User(id=1, email="jane@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(Profile(id=1, user_id=1))
+    for i in range(1, 8):
+        db.session.add(Job(id=i, job_url=f"https://jobs.example.com/{i}", title=f"Data Analyst {i}", city="Leeds", state="UK"))
+    db.session.flush()
+    for i in range(1, 8):
+        db.session.add(Match(id=i, user_id=1, job_url=f"https://jobs.example.com/{i}", job_id=i, score=1.0 - i / 10))
+    db.session.flush()
+    db.session.add(DismissedMatch(user_id=1, match_id=2))
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def statements(app):
+    seen = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        yield seen
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+
+
+def test_match_page_is_one_statement_per_page(feed, statements):
+    create_application_from_match(1, 3)
+    statements.clear()
+
+    first, cursor = match_page(1, limit=3)
+    assert len(statements) == 1
+    assert [row.id for row in first] == [1, 4, 5]
+    assert cursor
+
+    second, cursor = match_page(1, limit=3, after=decode_match_cursor(cursor))
+    assert len(statements) == 2
+    assert [row.id for row in second] == [6, 7]
+    assert cursor is None
+
+
+def test_apply_from_match_is_one_round_trip(feed, statements):
+    app_id = create_application_from_match(1, 4)
+
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("INSERT")
+    application = db.session.get(Application, app_id)
+    assert application.job_id == 4
+    assert application.job_url == "https://jobs.example.com/4"
+    assert application.location == "Leeds, UK"
+    assert application.status == "pending"
+
+
+def test_apply_from_match_twice_inserts_once(feed, statements):
+    assert create_application_from_match(1, 4) is not None
+    assert create_application_from_match(1, 4) is None
+    assert len(statements) == 2
+    assert Application.query.count() == 1
@@ -0,0 +1,54 @@
+import pytest
+
+from utils.question_router import classify
+
+
+@pytest.mark.parametrize("question", [
+    "How many years of payroll experience do you have?",
+    "Do you have experience with PayPal?",
+    "Are you familiar with payment systems?",
+    "Have you worked on a pay-per-click campaign?",
+])
+def test_pay_words_are_not_salary(question):
+    assert "salary" not in classify(question)
+
+
+@pytest.mark.parametrize("question", [
+    "What is your expected salary?",
+    "What is your expected pay?",
+    "What pay range are you looking for?",
+    "Annual pay expectation (GBP)",
+    "Current CTC",
+    "Compensation expectations",
+])
+def test_salary_questions(question):
+    assert "salary" in classify(question)
+
+
+@pytest.mark.parametrize("question,expected", [
+    ("Are you legally authorized to work in the United States?", True),
+    ("Do you have the right to work in the UK?", True),
+    ("Do you require a work permit?", True),
+    ("Work authorisation status", True),
+    ("Have you managed authorized users in Salesforce?", False),
+    ("Describe your experience with OAuth authorization flows", False),
+])
+def test_work_authorization(question, expected):
+    assert ("work_authorization" in classify(question)) is expected
+
+
+@pytest.mark.parametrize("question,expected", [
+    ("How many years of payroll experience do you have?", True),
+    ("Years of experience", True),
+    ("How many years' experience do you have with Python?", True),
+    ("What experience do you have with year-end closing?", False),
+    ("Describe your experience from last year", False),
+])
+def test_years_experience(question, expected):
+    assert ("years_experience" in classify(question)) is expected
+
+
+def test_availability():
+    assert "availability" in classify("What is your availability?")
+    assert "availability" in classify("When are you available to start?")
+    assert "availability" not in classify("Is the product available in your country?")
@@ -0,0 +1,101 @@
+import asyncio
+
+import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+
+mock_aws = pytest.importorskip("moto").mock_aws
+
+from utils import s3_uploader
+from utils.s3_uploader import upload_to_s3, upload_to_s3_async
+
+
+BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def s3(monkeypatch, tmp_path):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_REGION", "eu-west-1")
+    monkeypatch.setenv("AWS_S3_BUCKET", BUCKET)
+    monkeypatch.delenv("AWS_S3_ENDPOINT_URL", raising=False)
+    monkeypatch.setattr(s3_uploader, "_client", None)
+
+    with mock_aws():
+        client = boto3.client("s3", region_name="eu-west-1")
+        client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "eu-west-1"})
+        yield client
+
+
+@pytest.fixture
+def cv(tmp_path):
+    path = tmp_path / "cv.docx"
+    path.write_bytes(b"PK\x03\x04 not really a docx")
+    return str(path)
+
+
+def test_upload_to_s3(s3, cv):
+    url = upload_to_s3(cv, folder="cv-variants", custom_filename="jane.docx")
+
+    assert url == f"https://{BUCKET}.s3.eu-west-1.amazonaws.com/cv-variants/jane.docx"
+    obj = s3.get_object(Bucket=BUCKET, Key="cv-variants/jane.docx")
+    assert obj["Body"].read() == b"PK\x03\x04 not really a docx"
+    assert obj["ContentType"] == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def test_upload_to_s3_uuid_key(s3, cv):
+    url = upload_to_s3(cv, folder="user-cvs/7")
+
+    key = url.split(".amazonaws.com/", 1)[1]
+    assert key.startswith("user-cvs/7/") and key.endswith(".docx")
+    s3.head_object(Bucket=BUCKET, Key=key)
+
+
+def test_upload_to_s3_async(s3, cv):
+    url = asyncio.run(upload_to_s3_async(cv, folder="cv-variants", custom_filename="async.docx"))
+
+    assert url.endswith("/cv-variants/async.docx")
+    s3.head_object(Bucket=BUCKET, Key="cv-variants/async.docx")
+
+
+class _EmptyBody:
+    def stream(self, **kwargs):
+        return iter([b""])
+
+
+def _fail_first(n):
+    calls = []
+
+    def handler(request, **kwargs):
+        calls.append(request.url)
+        if len(calls) <= n:
+            return AWSResponse(request.url, 503, {}, _EmptyBody())
+        return None
+
+    return handler, calls
+
+
+def test_upload_to_s3_retries_in_client(s3, cv, monkeypatch):
+    client = s3_uploader.get_s3_client()
+    handler, calls = _fail_first(1)
+    client.meta.events.register("before-send.s3.PutObject", handler)
+    monkeypatch.setattr("botocore.retries.standard.ExponentialBackoff.delay_amount", lambda self, context: 0)
+
+    url = upload_to_s3(cv, folder="cv-variants", custom_filename="retry.docx")
+
+    assert len(calls) == 2
+    assert url.endswith("/cv-variants/retry.docx")
+    s3.head_object(Bucket=BUCKET, Key="cv-variants/retry.docx")
+
+
+def test_upload_to_s3_gives_up_after_retries(s3, cv, monkeypatch):
+    client = s3_uploader.get_s3_client()
+    handler, calls = _fail_first(100)
+    client.meta.events.register("before-send.s3.PutObject", handler)
+    monkeypatch.setattr("botocore.retries.standard.ExponentialBackoff.delay_amount", lambda self, context: 0)
+
+    with pytest.raises(Exception):
+        upload_to_s3(cv, folder="cv-variants", custom_filename="fail.docx")
+
+    assert len(calls) == s3_uploader.S3_UPLOAD_RETRIES
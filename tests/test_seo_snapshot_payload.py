@@ -0,0 +1,58 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "workers"))
+
+import seo_snapshot_worker
+from seo_snapshot_worker import build_payload, payload_hash
+
+
+SNAPSHOT = {"slug": "uk-data-analyst-jobs", "content": {"intro": "Data analyst jobs"}}
+
+
+def rows(posted):
+    return [
+        {
+            "id": i,
+            "title": f"Data Analyst {i}",
+            "company": "Acme",
+            "city": "London",
+            "job_url": f"https://jobs.example.com/{i}",
+            "posted_at": posted,
+            "scraped_at": datetime(2026, 1, 1),
+        }
+        for i in range(3)
+    ]
+
+
+class FrozenDate(date):
+    today_value = date(2026, 3, 1)
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+def test_hash_ignores_relative_ages(monkeypatch):
+    monkeypatch.setattr(seo_snapshot_worker, "date", FrozenDate)
+    posted = date(2026, 2, 27)
+
+    FrozenDate.today_value = date(2026, 3, 1)
+    first = build_payload(rows(posted), SNAPSHOT)
+    FrozenDate.today_value = date(2026, 3, 2)
+    second = build_payload(rows(posted), SNAPSHOT)
+
+    assert first["jobs"][0]["posted_at"] == "2 days ago"
+    assert second["jobs"][0]["posted_at"] == "3 days ago"
+    assert second["jobs"][0]["posted_date"] == "2026-02-27"
+    assert payload_hash(first) == payload_hash(second)
+
+
+def test_hash_changes_with_jobs():
+    posted = date(2026, 2, 27)
+    base = payload_hash(build_payload(rows(posted), SNAPSHOT))
+
+    assert payload_hash(build_payload(rows(posted + timedelta(days=1)), SNAPSHOT)) != base
+    assert payload_hash(build_payload(rows(posted)[:2], SNAPSHOT)) != base
+    assert payload_hash(build_payload(rows(posted), dict(SNAPSHOT, slug="uk-nurse-jobs"))) != base
@@ -0,0 +1,297 @@
+# utils/answer_engine.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from openai import AsyncOpenAI
+
+
+logger = logging.getLogger(__name__)
+
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Bump when the bots' answer prompts change so stale answers are not reused.
+ANSWER_PROMPT_VERSION = "2025-11-v1"
+
+ANSWER_CACHE_TTL_DAYS = int(os.getenv("ANSWER_CACHE_TTL_DAYS", "90"))
+ANSWER_CACHE_MEMORY_SIZE = int(os.getenv("ANSWER_CACHE_MEMORY_SIZE", "5000"))
+
+# Questions that mention the employer or role get an answer per job;
+# everything else ("Are you authorised to work in...") is reused per user.
+# Whole words only, so "us" / "here" do not fire inside "user" / "where",
+# and the polite "tell us" / "let us know" of generic questions is ignored.
+JOB_SPECIFIC_RE = re.compile(
+    r"\bthis (role|position|job|opportunity|team|company)\b"
+    r"|\bthe (role|position|team|company)\b"
+    r"|\b(our|here)\b"
+    r"|(?<!tell )(?<!let )(?<!give )(?<!show )\bus\b"
+    r"|\bwhy (do you want|would you like|should we|are you (interested|applying|a good fit)|you|join|apply)\b"
+    r"|\binterested in (this|the|our|joining|working|applying)\b"
+    r"|\bcover letter\b|\bmotivat|\bexcite|\battract"
+)
+
+BATCH_INSTRUCTIONS = (
+    " You will receive several questions at once under 'questions', each with an 'id' "
+    "and its own answer settings. Answer each one independently, following its settings. "
+    "If a question lists 'options', answer with exactly one of them. "
+    'Return ONLY a JSON object of the form {"answers": {"<id>": "<answer>", ...}}.'
+)
+
+
+# Context keys describing the job rather than the candidate
+JOB_CONTEXT_KEYS = ("job_title", "company_name", "job_description")
+
+
+def normalize_question(text: str) -> str:
+    t = re.sub(r"\s+", " ", text or "").strip().lower()
+    return t.rstrip("*:?. ").strip()
+
+
+def is_job_specific(question_norm: str) -> bool:
+    return JOB_SPECIFIC_RE.search(question_norm) is not None
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Question:
+    """
+    One form question as seen by the answer engine.
+    `style` is part of the cache key (e.g. "short", "max:255");
+    `payload` is extra per-question data sent to the model.
+    """
+    text: str
+    options: tuple = ()
+    style: str = ""
+    payload: dict = field(default_factory=dict)
+
+
+class AnswerCache:
+    """
+    Per-user answer cache: an in-process LRU in front of the
+    question_answer_cache table. The table is optional — without a pool
+    (e.g. in local runs) only the LRU is used.
+    """
+
+    def __init__(self, max_memory: int = ANSWER_CACHE_MEMORY_SIZE, ttl_days: int = ANSWER_CACHE_TTL_DAYS):
+        self.pool = None
+        self.max_memory = max_memory
+        self.ttl_days = ttl_days
+        self.memory = OrderedDict()
+
+    def attach_pool(self, pool):
+        self.pool = pool
+
+    def _remember(self, key, answer):
+        self.memory[key] = answer
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory:
+            self.memory.popitem(last=False)
+
+    async def get_many(self, keys) -> dict:
+        found = {}
+        missing = []
+        for k in keys:
+            if k in self.memory:
+                self.memory.move_to_end(k)
+                found[k] = self.memory[k]
+            else:
+                missing.append(k)
+
+        if missing and self.pool is not None:
+            try:
+                rows = await self.pool.fetch(
+                    """
+                    SELECT cache_key, answer
+                    FROM question_answer_cache
+                    WHERE cache_key = ANY($1::text[])
+                      AND created_at > now() - make_interval(days => $2)
+                    """,
+                    missing,
+                    self.ttl_days,
+                )
+            except Exception as e:
+                logger.warning(f"[Answers] cache lookup failed: {e}")
+                rows = []
+
+            for row in rows:
+                found[row["cache_key"]] = row["answer"]
+                self._remember(row["cache_key"], row["answer"])
+
+        return found
+
+    async def put_many(self, entries):
+        """entries: iterable of (cache_key, user_id, source, question_norm, answer)"""
+        entries = [e for e in entries if e[4]]
+        if not entries:
+            return
+
+        for key, _, _, _, answer in entries:
+            self._remember(key, answer)
+
+        if self.pool is None:
+            return
+
+        try:
+            await self.pool.execute(
+                """
+                INSERT INTO question_answer_cache (cache_key, user_id, source, question, answer)
+                SELECT * FROM unnest($1::text[], $2::int[], $3::text[], $4::text[], $5::text[])
+                ON CONFLICT (cache_key) DO UPDATE
+                SET answer = EXCLUDED.answer,
+                    created_at = now()
+                """,
+                [e[0] for e in entries],
+                [e[1] for e in entries],
+                [e[2] for e in entries],
+                [e[3] for e in entries],
+                [e[4] for e in entries],
+            )
+        except Exception as e:
+            logger.warning(f"[Answers] cache write failed: {e}")
+
+
+answer_cache = AnswerCache()
+
+
+class FormAnswerer:
+    """
+    Answers for one application form.
+
+    prefetch() resolves every question the bot will need the LLM for in a
+    single structured call (after checking the cache), running in the
+    background while the bot fills the standard fields. answer() then
+    returns the prefetched/cached answer, falling back to the bot's own
+    single-question call when nothing is available.
+    """
+
+    def __init__(self, user_id, source: str, system_msg: str, context: dict,
+                 model: str = "gpt-4o-mini", cache: AnswerCache | None = None):
+        self.user_id = user_id
+        self.source = source
+        self.system_msg = system_msg
+        self.context = context
+        self.model = model
+        self.cache = cache or answer_cache
+        self.job_scope = _sha(f"{context.get('company_name') or ''}|{context.get('job_title') or ''}")[:16]
+        # Candidate data the answers are written from (salary, notice
+        # period, work authorisation...): editing the profile changes the
+        # key, so answers built on the old values are not reused
+        profile = {k: v for k, v in context.items() if k not in JOB_CONTEXT_KEYS}
+        self.profile_scope = _sha(json.dumps(profile, sort_keys=True, default=str))[:16]
+        self.results: dict[str, asyncio.Future] = {}
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    def key(self, question: Question) -> str:
+        norm = normalize_question(question.text)
+        scope = self.job_scope if is_job_specific(norm) else "user"
+        options = "|".join(sorted(normalize_question(o) for o in question.options if o))
+        return _sha("\x1f".join([
+            ANSWER_PROMPT_VERSION, self.source, str(self.user_id), self.profile_scope, scope, norm, options,
+            question.style,
+        ]))
+
+    def prefetch(self, questions, model: str | None = None):
+        """Start resolving `questions` in the background. Returns the task."""
+        loop = asyncio.get_running_loop()
+        batch = []
+        for q in questions:
+            k = self.key(q)
+            if k in self.results:
+                continue
+            self.results[k] = loop.create_future()
+            batch.append((k, q))
+
+        return asyncio.create_task(self._resolve_batch(batch, model or self.model))
+
+    async def _resolve_batch(self, batch, model):
+        resolved = {}
+        try:
+            if not batch:
+                return
+            resolved = await self.cache.get_many([k for k, _ in batch])
+            missing = [(k, q) for k, q in batch if k not in resolved]
+            if missing:
+                generated = await self._batch_llm(missing, model)
+                resolved.update(generated)
+                await self.cache.put_many(
+                    (k, self.user_id, self.source, normalize_question(q.text), generated.get(k))
+                    for k, q in missing
+                )
+        except Exception as e:
+            logger.warning(f"[Answers] batch prefetch failed: {e}")
+        finally:
+            for k, _ in batch:
+                fut = self.results[k]
+                if not fut.done():
+                    fut.set_result(resolved.get(k))
+
+    async def _batch_llm(self, items, model) -> dict:
+        ids = {f"q{i + 1}": k for i, (k, _) in enumerate(items)}
+        questions = []
+        for (qid, _), (_, q) in zip(ids.items(), items):
+            entry = {"id": qid, "question": q.text}
+            if q.options:
+                entry["options"] = list(q.options)
+            entry.update(q.payload)
+            questions.append(entry)
+
+        self.llm_calls += 1
+        started = time.perf_counter()
+        resp = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": self.system_msg + BATCH_INSTRUCTIONS},
+                {"role": "user", "content": json.dumps({**self.context, "questions": questions})},
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=min(4000, 300 * len(items)),
+            temperature=0.45,
+        )
+        self.llm_seconds += time.perf_counter() - started
+
+        data = json.loads(resp.choices[0].message.content)
+        answers = data.get("answers") or {}
+
+        out = {}
+        for qid, k in ids.items():
+            value = answers.get(qid)
+            if value is not None and str(value).strip():
+                out[k] = str(value).strip()
+        return out
+
+    async def answer(self, question: Question, generate) -> str:
+        """
+        Return the answer for `question`. `generate` is an async callable
+        producing a fresh answer when neither prefetch nor cache has one.
+        """
+        k = self.key(question)
+
+        fut = self.results.get(k)
+        if fut is not None:
+            cached = await fut
+            if cached:
+                return cached
+        else:
+            hit = await self.cache.get_many([k])
+            if k in hit:
+                return hit[k]
+
+        self.llm_calls += 1
+        started = time.perf_counter()
+        answer = await generate()
+        self.llm_seconds += time.perf_counter() - started
+        await self.cache.put_many([
+            (k, self.user_id, self.source, normalize_question(question.text), answer)
+        ])
+        return answer
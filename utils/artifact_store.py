@@ -0,0 +1,41 @@
+# utils/artifact_store.py
+
+import os
+import shutil
+import tempfile
+
+
+class ArtifactStore:
+    """
+    Scoped temp directory for the files produced while processing one
+    application (CV variant, screenshots, ...).
+
+    Everything written under `store.dir` is removed when the block exits,
+    whatever the outcome:
+
+        with ArtifactStore(prefix=f"app_{app_id}_") as store:
+            cv_path = store.path("jane_doe_123456.docx")
+    """
+
+    def __init__(self, prefix: str = "hirednow_"):
+        self.prefix = prefix
+        self.dir = None
+
+    def __enter__(self):
+        self.dir = tempfile.mkdtemp(prefix=self.prefix)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+        return False
+
+    def path(self, filename: str) -> str:
+        """Absolute path for `filename` inside the store."""
+        if self.dir is None:
+            raise RuntimeError("ArtifactStore used outside of its context")
+        return os.path.join(self.dir, os.path.basename(filename))
+
+    def cleanup(self):
+        if self.dir:
+            shutil.rmtree(self.dir, ignore_errors=True)
+        self.dir = None
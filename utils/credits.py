@@ -1,6 +1,8 @@
 import psycopg2
 from psycopg2.extras import DictCursor
 
+from utils.dashboard_cache import invalidate_dashboard
+
 
 def init_credit_balance(
     conn,
@@ -76,8 +78,61 @@ def init_credit_balance(
             )
 
             cur.execute("COMMIT")
+            invalidate_dashboard(user_id)
             return True
 
         except Exception:
             cur.execute("ROLLBACK")
             raise
+
+
+def settle_reservations(conn, max_age_hours: int = 48) -> int:
+    """
+    Return unused reserved credits to the balance for every finished (or
+    stale) batch. See sql/create_tables/credit_reservations.sql.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT settle_credit_reservations(make_interval(hours => %s))",
+            (max_age_hours,)
+        )
+        settled = cur.fetchone()[0]
+    conn.commit()
+    return settled
+
+
+def find_balance_drift(conn):
+    """
+    Users whose balance (plus credits held in open reservations) differs
+    from the sum of their ledger entries.
+    """
+    with conn.cursor(cursor_factory=DictCursor) as cur:
+        cur.execute(
+            """
+            WITH ledger AS (
+                SELECT user_id, SUM(change_amount) AS ledger_total
+                FROM credit_ledger
+                GROUP BY user_id
+            ),
+            held AS (
+                SELECT user_id, SUM(reserved - consumed) AS held
+                FROM credit_reservations
+                WHERE status = 'open'
+                GROUP BY user_id
+            )
+            SELECT
+                cb.user_id,
+                cb.available_credits,
+                COALESCE(h.held, 0) AS held,
+                COALESCE(l.ledger_total, 0) AS ledger_total,
+                cb.available_credits + COALESCE(h.held, 0) - COALESCE(l.ledger_total, 0) AS drift
+            FROM credit_balance cb
+            LEFT JOIN ledger l ON l.user_id = cb.user_id
+            LEFT JOIN held h ON h.user_id = cb.user_id
+            WHERE cb.available_credits + COALESCE(h.held, 0) <> COALESCE(l.ledger_total, 0)
+            ORDER BY ABS(cb.available_credits + COALESCE(h.held, 0) - COALESCE(l.ledger_total, 0)) DESC
+            """
+        )
+        rows = cur.fetchall()
+    conn.commit()
+    return rows
@@ -1,5 +1,6 @@
 from openai import AsyncOpenAI
 import json
+import logging
 import tempfile
 import os
 
@@ -9,9 +10,92 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 import random
 import re
 
+from utils.json_stream import TopLevelJsonStream
+from utils.tracing import span, record_usage
+
+
+logger = logging.getLogger(__name__)
 
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Bump whenever the prompt or JSON structure below changes, so cached
+# variants generated with the old prompt are not reused.
+CV_PROMPT_VERSION = "2026-10-v2"
+
+CV_MODEL = "gpt-4.1"
+
+# Structured output (JSON schema) streamed straight into the DOCX builder.
+# Set to false to fall back to the free-form JSON prompt.
+CV_STRUCTURED_OUTPUT = os.getenv("CV_STRUCTURED_OUTPUT", "true").lower() == "true"
+
+# Job text beyond this many characters is cut from the prompt
+CV_JOB_TEXT_LIMIT = int(os.getenv("CV_JOB_TEXT_LIMIT", "6000"))
+
+# Parts of ai_cv_data the model needs to write the CV
+CV_PROMPT_KEYS = (
+    "first_name", "last_name", "email", "phone", "address", "summary", "skills",
+    "job_titles", "experience", "education", "certifications", "languages",
+)
+
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+
+# Key order matches the document, so sections can be rendered as they stream in
+CV_JSON_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": [
+        "first_name", "last_name", "email", "phone", "address", "summary", "skills",
+        "job_titles", "experience", "education", "certifications", "languages",
+        "additional_details",
+    ],
+    "properties": {
+        "first_name": {"type": "string"},
+        "last_name": {"type": "string"},
+        "email": {"type": "string"},
+        "phone": {"type": "string"},
+        "address": {"type": "string"},
+        "summary": {"type": "string"},
+        "skills": _STRINGS,
+        "job_titles": _STRINGS,
+        "experience": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": [
+                    "title", "company", "location", "start_date", "end_date",
+                    "responsibilities", "achievements",
+                ],
+                "properties": {
+                    "title": {"type": "string"},
+                    "company": {"type": "string"},
+                    "location": {"type": "string"},
+                    "start_date": {"type": "string"},
+                    "end_date": {"type": "string"},
+                    "responsibilities": _STRINGS,
+                    "achievements": _STRINGS,
+                },
+            },
+        },
+        "education": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["degree", "institution", "date"],
+                "properties": {
+                    "degree": {"type": "string"},
+                    "institution": {"type": "string"},
+                    "date": {"type": "string"},
+                },
+            },
+        },
+        "certifications": _STRINGS,
+        "languages": _STRINGS,
+        "additional_details": {"type": "string"},
+    },
+}
+
 
 
 def generate_cv_filename(first_name, last_name, ext="docx"):
@@ -29,15 +113,15 @@ def generate_cv_filename(first_name, last_name, ext="docx"):
     return f"{fn}_{ln}_{rand}.{ext}"
 
 
-def build_docx_from_json(cv_json):
-    doc = Document()
-
+def _render_header(doc, cv_json):
     # Name header
     title = doc.add_heading(level=0)
     run = title.add_run(f"{cv_json['first_name']} {cv_json['last_name']}")
     run.bold = True
     run.font.size = Pt(20)
 
+
+def _render_contact(doc, cv_json):
     # Contact line
     contact = doc.add_paragraph()
     contact.alignment = WD_ALIGN_PARAGRAPH.LEFT
@@ -47,50 +131,199 @@ def build_docx_from_json(cv_json):
 
     doc.add_paragraph()
 
-    # Summary
+
+def _render_summary(doc, cv_json):
     doc.add_heading("Profile Summary", level=1)
     doc.add_paragraph(cv_json.get("summary", ""))
 
-    # Skills
+
+def _render_skills(doc, cv_json):
     doc.add_heading("Skills", level=1)
     skills_str = ", ".join(cv_json.get("skills", []))
     doc.add_paragraph(skills_str)
 
-    # Experience
-    doc.add_heading("Professional Experience", level=1)
-    for exp in cv_json.get("experience", []):
-        hdr = doc.add_paragraph()
-        hdr.add_run(f"{exp.get('title','')} - {exp.get('company','')}").bold = True
-        hdr.add_run(f" | {exp.get('location','')}")
-        hdr.add_run(
-            f" ({exp.get('start_date','')} - {exp.get('end_date','')})"
-        )
 
-        # Responsibilities
-        if exp.get("responsibilities"):
-            doc.add_paragraph().add_run("Responsibilities:").bold = True
-            for r in exp["responsibilities"]:
-                doc.add_paragraph(r, style="List Bullet")
+def _render_experience(doc, exp):
+    hdr = doc.add_paragraph()
+    hdr.add_run(f"{exp.get('title','')} - {exp.get('company','')}").bold = True
+    hdr.add_run(f" | {exp.get('location','')}")
+    hdr.add_run(
+        f" ({exp.get('start_date','')} - {exp.get('end_date','')})"
+    )
+
+    # Responsibilities
+    if exp.get("responsibilities"):
+        doc.add_paragraph().add_run("Responsibilities:").bold = True
+        for r in exp["responsibilities"]:
+            doc.add_paragraph(r, style="List Bullet")
+
+    # Achievements
+    if exp.get("achievements"):
+        doc.add_paragraph().add_run("Key Achievements:").bold = True
+        for a in exp["achievements"]:
+            doc.add_paragraph(a, style="List Bullet")
+
+
+def _render_education(doc, edu):
+    p = doc.add_paragraph()
+    p.add_run(f"{edu.get('degree','')} - {edu.get('institution','')}").bold = True
+    p.add_run(f" ({edu.get('date','')})")
+
+
+# Document order. Plain sections render once all their fields are known;
+# list sections render item by item, so a streamed CV fills the document
+# while the model is still writing the rest.
+_SECTIONS = [
+    (("first_name", "last_name"), _render_header),
+    (("email", "phone"), _render_contact),
+    (("summary",), _render_summary),
+    (("skills",), _render_skills),
+    ("experience", "Professional Experience", _render_experience),
+    ("education", "Education", _render_education),
+]
+
+
+class CvDocxStream:
+    """
+    Builds the CV document from fields as they arrive (see
+    utils.json_stream.TopLevelJsonStream). finish() renders whatever is
+    left, so feeding nothing and calling finish(cv_json) is the same as
+    build_docx_from_json(cv_json).
+    """
+
+    def __init__(self):
+        self.doc = Document()
+        self.cv = {}
+        self.section = 0
+        self.heading_added = False
+        self.items_rendered = 0
+        self.items_seen = {}
+
+    def feed(self, events):
+        for kind, key, value in events:
+            if kind == "value":
+                self.cv[key] = value
+                continue
+            index = self.items_seen.get(key, 0)
+            self.items_seen[key] = index + 1
+            # A value earlier in the same chunk may have completed the
+            # sections before this list
+            self._advance()
+            # Items skipped here are rendered from self.cv once the list
+            # completes, so only render while the rendered prefix is whole
+            if self._current_list() == key and index == self.items_rendered:
+                self._open_list()
+                self._render_item(value)
+        self._advance()
+
+    def finish(self, cv_json):
+        self.cv = cv_json
+        self._advance(final=True)
+        return self.doc
+
+    def _current_list(self):
+        if self.section < len(_SECTIONS) and len(_SECTIONS[self.section]) == 3:
+            return _SECTIONS[self.section][0]
+        return None
+
+    def _open_list(self):
+        if not self.heading_added:
+            self.doc.add_heading(_SECTIONS[self.section][1], level=1)
+            self.heading_added = True
+
+    def _render_item(self, item):
+        _SECTIONS[self.section][2](self.doc, item)
+        self.items_rendered += 1
+
+    def _advance(self, final=False):
+        while self.section < len(_SECTIONS):
+            section = _SECTIONS[self.section]
+            if len(section) == 2:
+                keys, render = section
+                if not final and not all(k in self.cv for k in keys):
+                    return
+                render(self.doc, self.cv)
+            else:
+                key = section[0]
+                if not final and key not in self.cv:
+                    return
+                self._open_list()
+                for item in self.cv.get(key, [])[self.items_rendered:]:
+                    self._render_item(item)
+                self.heading_added = False
+                self.items_rendered = 0
+            self.section += 1
+
+
+def build_docx_from_json(cv_json):
+    return CvDocxStream().finish(cv_json)
+
+
+def save_cv_docx(cv_json, out_dir=None, doc=None):
+    doc = doc or build_docx_from_json(cv_json)
+
+    filename = generate_cv_filename(cv_json["first_name"], cv_json["last_name"])
+    tmp_dir = out_dir or tempfile.gettempdir()
+    tmp_path = os.path.join(tmp_dir, filename)
+
+    doc.save(tmp_path)
+
+    return tmp_path, filename
+
 
-        # Achievements
-        if exp.get("achievements"):
-            doc.add_paragraph().add_run("Key Achievements:").bold = True
-            for a in exp["achievements"]:
-                doc.add_paragraph(a, style="List Bullet")
+def _is_empty(value):
+    return value in ("", None, [], {})
 
-    # Education
-    doc.add_heading("Education", level=1)
-    for edu in cv_json.get("education", []):
-        p = doc.add_paragraph()
-        p.add_run(f"{edu.get('degree','')} - {edu.get('institution','')}").bold = True
-        p.add_run(f" ({edu.get('date','')})")
 
-    return doc
+def trim_cv_for_prompt(base_cv_text):
+    """
+    Compact JSON of the ai_cv_data fields the CV is written from, with
+    empty values dropped. Falls back to the raw text if it is not JSON.
+    """
+    try:
+        data = json.loads(base_cv_text)
+    except (TypeError, ValueError):
+        return base_cv_text
+    if not isinstance(data, dict):
+        return base_cv_text
+
+    trimmed = {}
+    for key in CV_PROMPT_KEYS:
+        value = data.get(key)
+        if isinstance(value, list):
+            value = [
+                {k: v for k, v in item.items() if not _is_empty(v)} if isinstance(item, dict) else item
+                for item in value
+                if not _is_empty(item)
+            ]
+        if not _is_empty(value):
+            trimmed[key] = value
+    return json.dumps(trimmed, ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_job_text(job_text):
+    lines = [" ".join(line.split()) for line in (job_text or "").splitlines()]
+    text = "\n".join(line for line in lines if line)
+    return text[:CV_JOB_TEXT_LIMIT]
 
 
-async def generate_custom_cv(base_cv_text, job_text, user):
+STRUCTURED_INSTRUCTIONS = """
+You are a world-class professional CV writer specialising in ATS optimisation, clarity, impact, and job alignment.
 
-    prompt = f"""
+Rewrite the candidate's CV (JSON) into a significantly stronger version for the job below:
+- Fully ATS optimised with natural keyword usage; at least three skills from the job description appear naturally
+- Achievements over responsibilities, strong action verbs, measurable outcomes where logically inferable
+- Sharp, value-driven summary tailored to the job; concise sentences; no filler ("responsible for", "helped with")
+- Skills grouped logically and aligned with the job description
+- Standardised dates, job titles and location style; correct grammar throughout
+- Do NOT fabricate employment, education, tools or certifications; keep all facts anchored in the original CV
+- Infer results ONLY when strongly implied by context
+- Education date is the graduation year or date range; leave fields you cannot fill as "" or []
+""".strip()
+
+
+def _freeform_prompt(base_cv_text, job_text, user):
+    return f"""
     You are a world-class professional CV writer specialising in ATS optimisation, clarity, impact, and job alignment.
     
     Your task is to rewrite and restructure the candidate’s CV into a significantly improved version that:
@@ -161,24 +394,117 @@ async def generate_custom_cv(base_cv_text, job_text, user):
     {user.get("first_name","")} {user.get("last_name","")}
     """
 
-    response = await client.chat.completions.create(
-        model="gpt-4.1",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.25
-    )
+
+async def _generate_freeform(base_cv_text, job_text, user, trace, job_brief=None):
+    with span(trace, "cv_llm"):
+        response = await client.chat.completions.create(
+            model=CV_MODEL,
+            messages=[{"role": "user", "content": _freeform_prompt(base_cv_text, job_brief or job_text, user)}],
+            temperature=0.25
+        )
+    record_usage(trace, "cv_llm", response.usage)
 
     content = response.choices[0].message.content
     cleaned = content.replace("```json", "").replace("```", "").strip()
 
     cv_json = json.loads(cleaned)
+    with span(trace, "cv_docx"):
+        doc = build_docx_from_json(cv_json)
+    return cv_json, doc
 
-    # Build DOCX
-    doc = build_docx_from_json(cv_json)
 
-    filename = generate_cv_filename(cv_json["first_name"], cv_json["last_name"])
-    tmp_dir = tempfile.gettempdir()
-    tmp_path = os.path.join(tmp_dir, filename)
+async def _generate_structured(base_cv_text, job_text, user, trace, job_brief=None):
+    """
+    Stream a schema-constrained CV and build the DOCX as sections complete.
+    Time spent rendering while streaming counts towards cv_llm.
+    """
+    candidate = f"{user.get('first_name','')} {user.get('last_name','')}".strip()
+    prompt = (
+        f"Candidate name: {candidate}\n\n"
+        f"Base CV:\n{trim_cv_for_prompt(base_cv_text)}\n\n"
+        f"Job description:\n{job_brief or compact_job_text(job_text)}"
+    )
 
-    doc.save(tmp_path)
+    reader = TopLevelJsonStream()
+    builder = CvDocxStream()
+    parts = []
+    finish_reason = None
+    usage = None
+
+    with span(trace, "cv_llm"):
+        stream = await client.chat.completions.create(
+            model=CV_MODEL,
+            messages=[
+                {"role": "system", "content": STRUCTURED_INSTRUCTIONS},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.25,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "tailored_cv", "strict": True, "schema": CV_JSON_SCHEMA},
+            },
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            finish_reason = choice.finish_reason or finish_reason
+            text = choice.delta.content
+            if text:
+                parts.append(text)
+                builder.feed(reader.feed(text))
+    record_usage(trace, "cv_llm", usage)
+
+    if finish_reason == "length":
+        raise ValueError("CV generation hit the output token limit")
+
+    cv_json = json.loads("".join(parts))
+    with span(trace, "cv_docx"):
+        doc = builder.finish(cv_json)
+    return cv_json, doc
+
+
+async def generate_custom_cv(base_cv_text, job_text, user, out_dir=None, cache=None, company=None,
+                             job_brief=None, trace=None):
+    """
+    Tailor the base CV to the job and save it as a DOCX.
+    With a CvGenerationCache, a cached variant for the same base CV and
+    job text (or a near-identical posting) is reused instead of calling
+    the model. With a Trace, the cache lookup, model call and DOCX build
+    are timed as cv_cache / cv_llm / cv_docx, and the model's token usage
+    is recorded against cv_llm. `job_brief` (see utils.job_condenser)
+    replaces the job text in the prompt; the cache stays keyed on job_text.
+    Cache errors are logged and treated as a miss / skipped write.
+    """
+    if cache:
+        with span(trace, "cv_cache"):
+            try:
+                cv_json = await cache.get(base_cv_text, job_text, company=company)
+            except Exception as e:
+                logger.warning(f"[CV] cache lookup failed: {e}")
+                cv_json = None
+        if cv_json:
+            with span(trace, "cv_docx"):
+                tmp_path, filename = save_cv_docx(cv_json, out_dir)
+            return cv_json, tmp_path, filename
+
+    if CV_STRUCTURED_OUTPUT:
+        cv_json, doc = await _generate_structured(base_cv_text, job_text, user, trace, job_brief)
+    else:
+        cv_json, doc = await _generate_freeform(base_cv_text, job_text, user, trace, job_brief)
+
+    if cache:
+        with span(trace, "cv_cache"):
+            try:
+                await cache.put(user.get("user_id"), base_cv_text, job_text, cv_json, company=company)
+            except Exception as e:
+                logger.warning(f"[CV] cache write failed: {e}")
+
+    with span(trace, "cv_docx"):
+        tmp_path, filename = save_cv_docx(cv_json, out_dir, doc=doc)
 
     return cv_json, tmp_path, filename
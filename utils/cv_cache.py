@@ -0,0 +1,194 @@
+# utils/cv_cache.py
+
+import hashlib
+import json
+import os
+import re
+
+
+CV_CACHE_TTL_DAYS = int(os.getenv("CV_CACHE_TTL_DAYS", "30"))
+CV_CACHE_MAX_PER_USER = int(os.getenv("CV_CACHE_MAX_PER_USER", "200"))
+
+# 0 disables near-duplicate reuse. 0.95 means job texts whose 64-bit
+# simhashes differ in at most 3 bits reuse each other's variant.
+CV_CACHE_SIMILARITY = float(os.getenv("CV_CACHE_SIMILARITY", "0"))
+
+SIMHASH_BITS = 64
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_job_text(text: str) -> str:
+    return " ".join(_WORD_RE.findall((text or "").lower()))
+
+
+def canonical_cv_text(base_cv_text: str) -> str:
+    """Key-order independent form of the base CV JSON (falls back to raw text)."""
+    try:
+        return json.dumps(json.loads(base_cv_text), sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return base_cv_text or ""
+
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def simhash(normalized_text: str) -> int:
+    """
+    64-bit simhash over word 3-shingles, returned as a signed int so it
+    fits a Postgres BIGINT.
+    """
+    words = normalized_text.split()
+    shingles = [" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if weights[bit] > 0:
+            value |= 1 << bit
+
+    if value >= 1 << 63:
+        value -= 1 << 64
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count("1")
+
+
+class CvGenerationCache:
+    """
+    Tailored CV JSON cache stored in the cv_generation_cache table.
+
+    Exact hits are keyed by (prompt version, base CV hash, normalized job
+    text hash), so a retried application reuses the earlier variant. With
+    CV_CACHE_SIMILARITY set, near-identical postings from the same company
+    also reuse it. Rows expire after CV_CACHE_TTL_DAYS and each user keeps
+    at most CV_CACHE_MAX_PER_USER entries.
+    """
+
+    def __init__(self, pool, prompt_version: str,
+                 ttl_days: int = CV_CACHE_TTL_DAYS,
+                 max_per_user: int = CV_CACHE_MAX_PER_USER,
+                 similarity: float = CV_CACHE_SIMILARITY):
+        self.pool = pool
+        self.prompt_version = prompt_version
+        self.ttl_days = ttl_days
+        self.max_per_user = max_per_user
+        self.max_distance = (
+            int((1 - similarity) * SIMHASH_BITS) if similarity > 0 else None
+        )
+
+    def keys(self, base_cv_text: str, job_text: str):
+        normalized = normalize_job_text(job_text)
+        base_cv_hash = sha256(canonical_cv_text(base_cv_text))
+        job_hash = sha256(normalized)
+        cache_key = sha256(f"{self.prompt_version}|{base_cv_hash}|{job_hash}")
+        return cache_key, base_cv_hash, normalized
+
+    async def get(self, base_cv_text: str, job_text: str, company: str | None = None):
+        cache_key, base_cv_hash, normalized = self.keys(base_cv_text, job_text)
+
+        row = await self.pool.fetchrow(
+            """
+            UPDATE cv_generation_cache
+            SET hit_count = hit_count + 1,
+                last_used_at = now()
+            WHERE cache_key = $1
+              AND created_at > now() - make_interval(days => $2)
+            RETURNING cv_json
+            """,
+            cache_key,
+            self.ttl_days,
+        )
+        if row:
+            return json.loads(row["cv_json"])
+
+        if self.max_distance is None or not company:
+            return None
+
+        target = simhash(normalized)
+        candidates = await self.pool.fetch(
+            """
+            SELECT cache_key, cv_json, job_simhash
+            FROM cv_generation_cache
+            WHERE base_cv_hash = $1
+              AND prompt_version = $2
+              AND company = $3
+              AND created_at > now() - make_interval(days => $4)
+            ORDER BY created_at DESC
+            LIMIT 50
+            """,
+            base_cv_hash,
+            self.prompt_version,
+            company,
+            self.ttl_days,
+        )
+
+        best = min(candidates, key=lambda c: hamming(c["job_simhash"], target), default=None)
+        if best is None or hamming(best["job_simhash"], target) > self.max_distance:
+            return None
+
+        await self.pool.execute(
+            """
+            UPDATE cv_generation_cache
+            SET hit_count = hit_count + 1,
+                last_used_at = now()
+            WHERE cache_key = $1
+            """,
+            best["cache_key"],
+        )
+        return json.loads(best["cv_json"])
+
+    async def put(self, user_id: int, base_cv_text: str, job_text: str, cv_json: dict,
+                  company: str | None = None):
+        cache_key, base_cv_hash, normalized = self.keys(base_cv_text, job_text)
+
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    INSERT INTO cv_generation_cache (
+                        cache_key, user_id, prompt_version, base_cv_hash,
+                        company, job_simhash, cv_json
+                    )
+                    VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET cv_json = EXCLUDED.cv_json,
+                        created_at = now(),
+                        last_used_at = now()
+                    """,
+                    cache_key,
+                    user_id,
+                    self.prompt_version,
+                    base_cv_hash,
+                    company,
+                    simhash(normalized),
+                    json.dumps(cv_json),
+                )
+
+                # Eviction: expired rows, then anything beyond the per-user cap
+                await conn.execute(
+                    """
+                    DELETE FROM cv_generation_cache
+                    WHERE user_id = $1
+                      AND (
+                        created_at <= now() - make_interval(days => $2)
+                        OR cache_key IN (
+                            SELECT cache_key
+                            FROM cv_generation_cache
+                            WHERE user_id = $1
+                            ORDER BY last_used_at DESC
+                            OFFSET $3
+                        )
+                      )
+                    """,
+                    user_id,
+                    self.ttl_days,
+                    self.max_per_user,
+                )
@@ -0,0 +1,140 @@
+# utils/cv_ingest.py
+
+import os
+import tempfile
+
+from psycopg2 import Binary
+from psycopg2.extras import Json, RealDictCursor
+
+from utils.cv_ai import parse_cv_with_ai
+from utils.cv_parser import extract_cv_text
+from utils.s3_uploader import upload_to_s3
+
+
+# A queued CV is retried this many times before it is marked failed
+CV_INGEST_MAX_ATTEMPTS = int(os.getenv("CV_INGEST_MAX_ATTEMPTS", "3"))
+
+# Uploads left in 'processing' this long (a crashed worker) are picked up again
+CV_INGEST_STALE_MINUTES = int(os.getenv("CV_INGEST_STALE_MINUTES", "10"))
+
+
+# Largest CV upload accepted into the queue (stored as BYTEA until ingested)
+CV_MAX_UPLOAD_BYTES = int(os.getenv("CV_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+
+class CvIngestError(Exception):
+    """A CV that can never be ingested (e.g. no readable text); not retried."""
+
+
+def enqueue_cv(conn, user_id, filename, data):
+    """Store an uploaded CV and queue it for the ingest worker. Returns the queue id."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO cv_ingest_queue (user_id, filename, file_data)
+            VALUES (%s, %s, %s)
+            RETURNING id
+            """,
+            (user_id, filename, Binary(data)),
+        )
+        ingest_id = cur.fetchone()[0]
+    conn.commit()
+    return ingest_id
+
+
+def latest_cv_ingest(conn, user_id):
+    """Status row of the user's most recent upload, or None."""
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(
+            """
+            SELECT id, status, error, created_at, updated_at
+            FROM cv_ingest_queue
+            WHERE user_id = %s
+            ORDER BY created_at DESC
+            LIMIT 1
+            """,
+            (user_id,),
+        )
+        return cur.fetchone()
+
+
+def claim_cv_ingest(conn):
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(
+            """
+            UPDATE cv_ingest_queue
+            SET status = 'processing', attempts = attempts + 1, updated_at = NOW()
+            WHERE id = (
+                SELECT id FROM cv_ingest_queue
+                WHERE status = 'pending'
+                   OR (status = 'processing' AND updated_at < NOW() - make_interval(mins => %s))
+                ORDER BY created_at
+                LIMIT 1 FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, user_id, filename, file_data, attempts
+            """,
+            (CV_INGEST_STALE_MINUTES,),
+        )
+        row = cur.fetchone()
+    conn.commit()
+    return row
+
+
+def ingest_cv(conn, item):
+    """
+    Extract, AI-parse and upload one queued CV, then store the result on
+    the profile. The file bytes are dropped from the queue once done.
+    """
+    ext = os.path.splitext(item["filename"] or "")[1].lower() or ".pdf"
+    fd, path = tempfile.mkstemp(prefix=f"cv_{item['user_id']}_", suffix=ext)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(bytes(item["file_data"]))
+
+        raw_text = extract_cv_text(path)
+        if not raw_text.strip():
+            raise CvIngestError("We couldn't read any text from this file")
+
+        parsed = parse_cv_with_ai(raw_text)
+        s3_url = upload_to_s3(path, folder=f"user-cvs/{item['user_id']}")
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE profile
+            SET ai_cv_data = %s, cv_location = %s, updated_at = NOW()
+            WHERE user_id = %s
+            """,
+            (Json(parsed), s3_url, item["user_id"]),
+        )
+        cur.execute(
+            """
+            UPDATE cv_ingest_queue
+            SET status = 'done', error = NULL, file_data = NULL, updated_at = NOW()
+            WHERE id = %s
+            """,
+            (item["id"],),
+        )
+    conn.commit()
+
+
+def fail_cv_ingest(conn, item, error, retry=True):
+    conn.rollback()
+    retry = retry and item["attempts"] < CV_INGEST_MAX_ATTEMPTS
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE cv_ingest_queue
+            SET status = %s, error = %s, updated_at = NOW(),
+                file_data = CASE WHEN %s THEN file_data END
+            WHERE id = %s
+            """,
+            ("pending" if retry else "failed", str(error)[:500], retry, item["id"]),
+        )
+    conn.commit()
+    return retry
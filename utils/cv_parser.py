@@ -1,40 +1,114 @@
 import pdfplumber
 import docx
+import hashlib
 import os
 import pytesseract
 from PIL import Image
 import fitz  # PyMuPDF
 import subprocess
 import tempfile
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 
-def extract_text_from_pdf(path):
-    text = ""
+# OCR settings for scanned PDFs
+CV_OCR_DPI = int(os.getenv("CV_OCR_DPI", "200"))
+CV_OCR_MAX_PAGES = int(os.getenv("CV_OCR_MAX_PAGES", "6"))
+CV_OCR_WORKERS = int(os.getenv("CV_OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
 
-    # 1. try normal text extraction
+# Pages with fewer characters than this are treated as scanned images
+MIN_PAGE_TEXT_CHARS = 20
+
+CV_TEXT_CACHE_SIZE = int(os.getenv("CV_TEXT_CACHE_SIZE", "256"))
+_text_cache = OrderedDict()
+
+_ocr_pool = None
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _get_ocr_pool():
+    # spawn, not fork: the web and worker processes run threads (DB pools,
+    # HTTP clients) that must not be copied into the OCR children
+    global _ocr_pool
+    if _ocr_pool is None:
+        _ocr_pool = ProcessPoolExecutor(
+            max_workers=CV_OCR_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _ocr_pool
+
+
+def _ocr_page(path, page_no, dpi):
+    """Rasterise one page and OCR it. Runs in the OCR process pool."""
+    with fitz.open(path) as doc:
+        pix = doc[page_no].get_pixmap(dpi=dpi)
+    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    return pytesseract.image_to_string(img)
+
+
+def _ocr_pages(path, page_numbers, dpi):
+    if len(page_numbers) == 1 or CV_OCR_WORKERS <= 1:
+        return [_ocr_page(path, n, dpi) for n in page_numbers]
+
+    global _ocr_pool
     try:
-        with pdfplumber.open(path) as pdf:
-            for page in pdf.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
+        return list(_get_ocr_pool().map(_ocr_page, [path] * len(page_numbers), page_numbers, [dpi] * len(page_numbers)))
+    except BrokenProcessPool:
+        _ocr_pool = None
+        return [_ocr_page(path, n, dpi) for n in page_numbers]
+
+
+def _pdf_page_texts(path):
+    """Per-page text layer: PyMuPDF first, pdfplumber if PyMuPDF finds nothing."""
+    pages = []
+    try:
+        with fitz.open(path) as doc:
+            pages = [page.get_text("text") or "" for page in doc]
     except Exception:
         pass
 
-    if text.strip():
-        return text
+    if any(p.strip() for p in pages):
+        return pages
 
-    # 2. fallback to OCR
     try:
-        ocr_text = ""
-        doc = fitz.open(path)
-        for page in doc:
-            pix = page.get_pixmap()
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            ocr_text += pytesseract.image_to_string(img) + "\n"
-        return ocr_text
+        with pdfplumber.open(path) as pdf:
+            plumber_pages = [page.extract_text() or "" for page in pdf.pages]
+        if any(p.strip() for p in plumber_pages) or not pages:
+            return plumber_pages
     except Exception:
-        return ""
+        pass
+
+    return pages
+
+
+def extract_text_from_pdf(path, dpi=CV_OCR_DPI, max_ocr_pages=CV_OCR_MAX_PAGES):
+    """
+    Text layer per page, with OCR only for the pages that have none
+    (scanned CVs, or a scanned page inside an exported one). OCR covers at
+    most `max_ocr_pages` pages and runs them in parallel in a process pool.
+    """
+    pages = _pdf_page_texts(path)
+
+    scanned = [i for i, text in enumerate(pages) if len(text.strip()) < MIN_PAGE_TEXT_CHARS]
+    scanned = scanned[:max_ocr_pages]
+
+    if scanned:
+        try:
+            for page_no, text in zip(scanned, _ocr_pages(path, scanned, dpi)):
+                pages[page_no] = text
+        except Exception:
+            pass
+
+    return "".join(text + "\n" for text in pages if text.strip())
 
 
 def extract_text_from_docx(path):
@@ -112,6 +186,29 @@ def extract_text_from_doc(path):
 
 
 def extract_cv_text(path):
+    """
+    Extract CV text, cached by file content so a re-upload of the same
+    file (or a retried onboarding step) skips extraction and OCR.
+    """
+    try:
+        key = (file_sha256(path), os.path.splitext(path)[1].lower())
+    except OSError:
+        key = None
+
+    if key and key in _text_cache:
+        _text_cache.move_to_end(key)
+        return _text_cache[key]
+
+    text = _extract_cv_text(path)
+
+    if key and text.strip():
+        _text_cache[key] = text
+        while len(_text_cache) > CV_TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return text
+
+
+def _extract_cv_text(path):
     ext = os.path.splitext(path)[1].lower()
 
     if ext == ".pdf":
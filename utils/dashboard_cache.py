@@ -0,0 +1,167 @@
+# utils/dashboard_cache.py
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "300"))
+DASHBOARD_CACHE_SIZE = int(os.getenv("DASHBOARD_CACHE_SIZE", "5000"))
+
+# With a Redis URL (REDIS_URL, set from the hirednow-cache Key Value
+# instance in render.yaml) the cache is shared by the web workers, and the
+# application / match workers can invalidate it. Without one each process
+# keeps its own LRU, invalidations from other processes never reach it, so
+# entries only live DASHBOARD_CACHE_LOCAL_TTL.
+DASHBOARD_CACHE_REDIS_URL = os.getenv("DASHBOARD_CACHE_REDIS_URL") or os.getenv("REDIS_URL")
+DASHBOARD_CACHE_LOCAL_TTL = int(os.getenv("DASHBOARD_CACHE_LOCAL_TTL", "20"))
+
+KEY_PREFIX = "dashboard:summary:"
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry."""
+
+    def __init__(self, max_size: int = DASHBOARD_CACHE_SIZE):
+        self.max_size = max_size
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.data.get(key)
+            if not entry:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self.data[key]
+                return None
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.data[key] = (value, time.monotonic() + ttl)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_size:
+                self.data.popitem(last=False)
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.data.pop(key, None)
+
+
+class RedisBackend:
+    """
+    Any client with Redis' get / setex / delete (redis-py, or fakeredis
+    locally). Errors are logged and treated as misses.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        try:
+            value = self.client.get(key)
+        except Exception as e:
+            logger.warning(f"Dashboard cache read failed: {e}")
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.setex(key, ttl, value)
+        except Exception as e:
+            logger.warning(f"Dashboard cache write failed: {e}")
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        try:
+            self.client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Dashboard cache invalidation failed: {e}")
+
+
+def make_backend(redis_url: str | None = DASHBOARD_CACHE_REDIS_URL):
+    if redis_url:
+        try:
+            import redis
+        except ImportError:
+            logger.warning("Redis URL set but the redis package is not installed, using the in-process cache")
+        else:
+            return RedisBackend(redis.Redis.from_url(redis_url, socket_timeout=0.25, socket_connect_timeout=0.25))
+    return MemoryBackend()
+
+
+class DashboardSummaryCache:
+    """
+    Per-user dashboard summary (credits, counts, subscription, top matches)
+    stored as JSON. Entries are dropped by invalidate() whenever one of
+    those changes, and expire after DASHBOARD_CACHE_TTL regardless
+    (DASHBOARD_CACHE_LOCAL_TTL on the in-process backend).
+    """
+
+    def __init__(self, backend=None, ttl: int | None = None):
+        self.backend = backend if backend is not None else make_backend()
+        if ttl is None:
+            shared = isinstance(self.backend, RedisBackend)
+            ttl = DASHBOARD_CACHE_TTL if shared else min(DASHBOARD_CACHE_TTL, DASHBOARD_CACHE_LOCAL_TTL)
+        self.ttl = ttl
+
+    def get(self, user_id):
+        raw = self.backend.get(f"{KEY_PREFIX}{user_id}")
+        return json.loads(raw) if raw else None
+
+    def set(self, user_id, summary: dict):
+        self.backend.set(f"{KEY_PREFIX}{user_id}", json.dumps(summary, default=str), self.ttl)
+
+    def get_or_build(self, user_id, build):
+        summary = self.get(user_id)
+        if summary is None:
+            summary = build()
+            self.set(user_id, summary)
+        return summary
+
+    def invalidate(self, *user_ids):
+        self.backend.delete(*(f"{KEY_PREFIX}{u}" for u in user_ids if u is not None))
+
+
+dashboard_cache = DashboardSummaryCache()
+
+
+def invalidate_dashboard(*user_ids):
+    dashboard_cache.invalidate(*user_ids)
+
+
+def register_orm_invalidation(session, models):
+    """
+    Invalidate the summary of every user whose rows of `models` (anything
+    with a user_id) were inserted, updated or deleted, once the
+    transaction commits. Covers every web-side change (billing, admin
+    credit adjustments, dismissals, manual applications) in one place.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(session, "after_flush")
+    def _collect(sess, flush_context):
+        touched = sess.info.setdefault("dashboard_users", set())
+        for obj in list(sess.new) + list(sess.dirty) + list(sess.deleted):
+            if isinstance(obj, models):
+                touched.add(getattr(obj, "user_id", None))
+
+    @event.listens_for(session, "after_commit")
+    def _invalidate(sess):
+        touched = sess.info.pop("dashboard_users", None)
+        if touched:
+            invalidate_dashboard(*touched)
+
+    @event.listens_for(session, "after_rollback")
+    def _discard(sess):
+        sess.info.pop("dashboard_users", None)
@@ -0,0 +1,167 @@
+# utils/job_condenser.py
+
+import json
+import logging
+import os
+from collections import OrderedDict
+
+from openai import AsyncOpenAI
+
+from utils.cv_cache import normalize_job_text, sha256
+from utils.tracing import span, record_usage
+
+
+logger = logging.getLogger(__name__)
+
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Bump when the condensation prompt or rendering changes; stored briefs
+# with an older version are recomputed on next use.
+JOB_BRIEF_VERSION = "2026-10-v1"
+
+JOB_BRIEF_MODEL = "gpt-4o-mini"
+JOB_BRIEF_MEMORY_SIZE = int(os.getenv("JOB_BRIEF_MEMORY_SIZE", "2000"))
+
+# Shorter descriptions are already compact enough to send as they are
+JOB_BRIEF_MIN_CHARS = int(os.getenv("JOB_BRIEF_MIN_CHARS", "1500"))
+
+# Cap on the description sent to the condenser itself
+JOB_BRIEF_INPUT_LIMIT = 12000
+
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+
+JOB_BRIEF_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": [
+        "title", "seniority", "company_summary", "key_requirements",
+        "skills", "responsibilities", "nice_to_have", "location_and_terms",
+    ],
+    "properties": {
+        "title": {"type": "string"},
+        "seniority": {"type": "string"},
+        "company_summary": {"type": "string"},
+        "key_requirements": _STRINGS,
+        "skills": _STRINGS,
+        "responsibilities": _STRINGS,
+        "nice_to_have": _STRINGS,
+        "location_and_terms": {"type": "string"},
+    },
+}
+
+CONDENSE_INSTRUCTIONS = """
+Condense the job posting for use in CV tailoring and application answers.
+Keep only what a candidate would tailor to: requirements, skills and tools, main
+responsibilities, nice-to-haves, one sentence on the company, and location /
+contract / salary terms if stated. Use short phrases, the posting's own keywords,
+and drop benefits boilerplate, legal notices and repetition. Do not invent anything.
+""".strip()
+
+_SECTIONS = (
+    ("Key requirements", "key_requirements"),
+    ("Skills", "skills"),
+    ("Responsibilities", "responsibilities"),
+    ("Nice to have", "nice_to_have"),
+)
+
+
+def job_text_hash(job_text: str) -> str:
+    """Identifies the description a brief was made from (and the brief version)."""
+    return sha256(f"{JOB_BRIEF_VERSION}|{normalize_job_text(job_text)}")
+
+
+def render_brief(data: dict) -> str:
+    lines = []
+    title = " - ".join(p for p in (data.get("title"), data.get("seniority")) if p)
+    if title:
+        lines.append(f"Role: {title}")
+    if data.get("company_summary"):
+        lines.append(f"Company: {data['company_summary']}")
+    for label, key in _SECTIONS:
+        items = [i for i in data.get(key) or [] if i]
+        if items:
+            lines.append(f"{label}:")
+            lines.extend(f"- {i}" for i in items)
+    if data.get("location_and_terms"):
+        lines.append(f"Location and terms: {data['location_and_terms']}")
+    return "\n".join(lines)
+
+
+async def condense_job_text(job_text: str, trace=None) -> str:
+    with span(trace, "jd_condense_llm"):
+        response = await client.chat.completions.create(
+            model=JOB_BRIEF_MODEL,
+            messages=[
+                {"role": "system", "content": CONDENSE_INSTRUCTIONS},
+                {"role": "user", "content": job_text[:JOB_BRIEF_INPUT_LIMIT]},
+            ],
+            temperature=0,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "job_brief", "strict": True, "schema": JOB_BRIEF_SCHEMA},
+            },
+        )
+    record_usage(trace, "jd_condense_llm", response.usage)
+    return render_brief(json.loads(response.choices[0].message.content))
+
+
+class JobBriefStore:
+    """
+    Condensed job descriptions ("briefs"), computed once per job and shared
+    by every applicant. Stored on jobs.condensed_description together with
+    the hash of the text it was made from, with an in-process LRU in front.
+    Short descriptions are used as they are.
+    """
+
+    def __init__(self, max_memory: int = JOB_BRIEF_MEMORY_SIZE, min_chars: int = JOB_BRIEF_MIN_CHARS):
+        self.max_memory = max_memory
+        self.min_chars = min_chars
+        self.memory = OrderedDict()
+
+    def _remember(self, job_id, text_hash, brief):
+        self.memory[job_id] = (text_hash, brief)
+        self.memory.move_to_end(job_id)
+        while len(self.memory) > self.max_memory:
+            self.memory.popitem(last=False)
+
+    async def get(self, pool, job, job_text: str, trace=None) -> str:
+        """
+        Brief for `job` (a jobs row) whose description is `job_text`.
+        Falls back to `job_text` if the model call fails.
+        """
+        if len(job_text) < self.min_chars:
+            return job_text
+
+        job_id = job["id"]
+        text_hash = job_text_hash(job_text)
+
+        cached = self.memory.get(job_id)
+        if cached and cached[0] == text_hash:
+            self.memory.move_to_end(job_id)
+            return cached[1]
+
+        if job.get("condensed_hash") == text_hash and job.get("condensed_description"):
+            self._remember(job_id, text_hash, job["condensed_description"])
+            return job["condensed_description"]
+
+        try:
+            brief = await condense_job_text(job_text, trace)
+        except Exception as e:
+            logger.warning(f"Job condensation failed for {job_id}: {e}")
+            return job_text
+
+        self._remember(job_id, text_hash, brief)
+        try:
+            await pool.execute(
+                """
+                UPDATE jobs
+                SET condensed_description = $2, condensed_hash = $3
+                WHERE id = $1
+                """,
+                job_id,
+                brief,
+                text_hash,
+            )
+        except Exception as e:
+            logger.warning(f"Saving job brief failed for {job_id}: {e}")
+        return brief
@@ -1,8 +1,187 @@
 # utils/job_description_fetcher.py
 
 import asyncio
+import html
+import json
+import logging
+import time
+from urllib.parse import urlparse, parse_qs
+
+import aiohttp
+from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 
+from utils.description_parser import html_to_text
+
+
+logger = logging.getLogger(__name__)
+
+# Anything shorter than this from the HTTP path is treated as a miss
+# (cookie walls, JS shells) and we fall through to the browser.
+MIN_DESCRIPTION_CHARS = 200
+
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.85 Safari/537.36",
+    "Accept-Language": "en-GB,en;q=0.9",
+}
+
+_session: aiohttp.ClientSession | None = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    One pooled aiohttp session per process, so repeated fetches reuse
+    TCP/TLS connections instead of opening a new pool each time.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=20, limit_per_host=4, ttl_dns_cache=300)
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=HTTP_TIMEOUT,
+            headers=HTTP_HEADERS,
+        )
+    return _session
+
+
+async def close_http_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+# ---------------------------------------------------------
+# ATS JSON endpoints
+# ---------------------------------------------------------
+
+def ats_api_url(url: str) -> str | None:
+    """
+    Map a public Greenhouse / Lever / Workable posting URL to the ATS's
+    public JSON endpoint for that posting. Returns None if not recognised.
+    """
+    parsed = urlparse(url)
+    host = (parsed.netloc or "").lower()
+    parts = [p for p in parsed.path.split("/") if p]
+    query = parse_qs(parsed.query)
+
+    if "greenhouse.io" in host:
+        # boards.greenhouse.io/embed/job_app?for=acme&token=123
+        if query.get("for") and query.get("token"):
+            return f"https://boards-api.greenhouse.io/v1/boards/{query['for'][0]}/jobs/{query['token'][0]}"
+        # (job-)boards(.eu).greenhouse.io/acme/jobs/123
+        if len(parts) >= 3 and parts[1] == "jobs":
+            return f"https://boards-api.greenhouse.io/v1/boards/{parts[0]}/jobs/{parts[2]}"
+        return None
+
+    if "lever.co" in host:
+        # jobs(.eu).lever.co/acme/<uuid>[/apply]
+        if len(parts) >= 2:
+            api_host = "api.eu.lever.co" if ".eu." in host else "api.lever.co"
+            return f"https://{api_host}/v0/postings/{parts[0]}/{parts[1]}"
+        return None
+
+    if host == "apply.workable.com":
+        # apply.workable.com/acme/j/ABC123[/apply]
+        if len(parts) >= 3 and parts[1] == "j":
+            return f"https://apply.workable.com/api/v2/accounts/{parts[0]}/jobs/{parts[2]}"
+        return None
+
+    return None
+
+
+def description_from_ats_json(data: dict) -> str:
+    """
+    Pull the description HTML out of a Greenhouse, Lever or Workable
+    posting payload and return cleaned text.
+    """
+    chunks = []
+
+    # Greenhouse: "content" is HTML-escaped HTML
+    if data.get("content"):
+        chunks.append(html.unescape(data["content"]))
+
+    # Lever: description + lists + additional
+    if data.get("description"):
+        chunks.append(data["description"])
+    for block in data.get("lists") or []:
+        chunks.append(f"<h3>{block.get('text', '')}</h3>{block.get('content', '')}")
+    if data.get("additional"):
+        chunks.append(data["additional"])
+
+    # Workable: requirements + benefits alongside "description"
+    for key in ("requirements", "benefits"):
+        if data.get(key):
+            chunks.append(data[key])
+
+    return html_to_text("\n".join(c for c in chunks if isinstance(c, str)))
+
+
+# ---------------------------------------------------------
+# Plain HTML extraction
+# ---------------------------------------------------------
+
+def description_from_html(page_html: str) -> str:
+    """
+    Extract the job description from a posting page.
+    Prefers schema.org JobPosting JSON-LD, then the main content area.
+    """
+    if not page_html:
+        return ""
+
+    soup = BeautifulSoup(page_html, "html.parser")
+
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            payload = json.loads(tag.string or "")
+        except (ValueError, TypeError):
+            continue
+        items = payload if isinstance(payload, list) else [payload]
+        for item in items:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting" and item.get("description"):
+                return html_to_text(html.unescape(item["description"]))
+
+    for tag in soup(["script", "style", "noscript", "nav", "header", "footer", "form"]):
+        tag.decompose()
+
+    container = (
+        soup.find(id="content")
+        or soup.find("main")
+        or soup.find(class_="job-post")
+        or soup.body
+        or soup
+    )
+    return container.get_text(" ", strip=True)
+
+
+async def fetch_via_http(url: str) -> str:
+    session = get_http_session()
+
+    api_url = ats_api_url(url)
+    if api_url:
+        try:
+            async with session.get(api_url) as resp:
+                if resp.status == 200:
+                    text = description_from_ats_json(await resp.json(content_type=None))
+                    if len(text) >= MIN_DESCRIPTION_CHARS:
+                        return text
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.info(f"[JD] ATS API fetch failed for {api_url}: {e}")
+
+    try:
+        async with session.get(url) as resp:
+            if resp.status == 200:
+                return description_from_html(await resp.text())
+    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+        logger.info(f"[JD] HTTP fetch failed for {url}: {e}")
+
+    return ""
+
+
+# ---------------------------------------------------------
+# Browser fallback
+# ---------------------------------------------------------
 
 async def scrape_job_description(url):
     async with async_playwright() as p:
@@ -14,3 +193,78 @@ async def scrape_job_description(url):
 
         await browser.close()
         return html
+
+
+async def fetch_job_description(url: str) -> str:
+    """
+    Return cleaned job description text for a posting URL.
+    Tries the ATS JSON endpoint and plain HTTP first, and only launches
+    a headless browser when neither yields a usable description.
+    """
+    text = await fetch_via_http(url)
+    if len(text) >= MIN_DESCRIPTION_CHARS:
+        return text
+
+    logger.info(f"[JD] HTTP extraction too short ({len(text)} chars), using browser for {url}")
+    return description_from_html(await scrape_job_description(url))
+
+
+# ---------------------------------------------------------
+# Bulk write-back
+# ---------------------------------------------------------
+
+class DescriptionWriteBack:
+    """
+    Buffers fetched descriptions and writes them to jobs.description in a
+    single UPDATE. Pending entries are served from memory so a second
+    application for the same job never refetches before the flush.
+    """
+
+    def __init__(self, max_pending: int = 25, max_age: float = 30.0):
+        self.max_pending = max_pending
+        self.max_age = max_age
+        self.pending: dict[int, str] = {}
+        self.oldest: float | None = None
+
+    def get(self, job_id):
+        return self.pending.get(job_id)
+
+    def add(self, job_id, text: str):
+        if self.oldest is None:
+            self.oldest = time.monotonic()
+        self.pending[job_id] = text
+
+    def is_due(self) -> bool:
+        if not self.pending:
+            return False
+        return (
+            len(self.pending) >= self.max_pending
+            or time.monotonic() - self.oldest >= self.max_age
+        )
+
+    async def flush(self, pool):
+        if not self.pending:
+            return 0
+
+        ids = list(self.pending.keys())
+        texts = [self.pending[i] for i in ids]
+
+        await pool.execute(
+            """
+            UPDATE jobs AS j
+            SET description = v.description
+            FROM unnest($1::bigint[], $2::text[]) AS v(id, description)
+            WHERE j.id = v.id
+            """,
+            ids,
+            texts,
+        )
+
+        self.pending.clear()
+        self.oldest = None
+        return len(ids)
+
+    async def flush_if_due(self, pool):
+        if self.is_due():
+            return await self.flush(pool)
+        return 0
@@ -0,0 +1,114 @@
+# utils/json_stream.py
+
+import json
+
+
+class TopLevelJsonStream:
+    """
+    Incremental reader for a streamed JSON object.
+
+    feed() takes the next chunk of text and returns the events that became
+    complete with it:
+      ("item", key, value)  - one element of a top-level array member
+      ("value", key, value) - a whole top-level member
+    Anything nested deeper is only decoded as part of its parent.
+    """
+
+    def __init__(self):
+        self.buf = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+
+        self.expect_key = True
+        self.key_start = None
+        self.key = None
+        self.value_start = None
+        self.value_is_array = False
+        self.item_start = None
+
+    def feed(self, chunk: str):
+        events = []
+        self.buf += chunk
+        buf = self.buf
+
+        while self.pos < len(buf):
+            i = self.pos
+            c = buf[i]
+            self.pos += 1
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.key_start is not None:
+                        self.key = json.loads(buf[self.key_start:i + 1])
+                        self.key_start = None
+                continue
+
+            if c == '"':
+                self.in_string = True
+                if self.depth == 1 and self.expect_key:
+                    self.key_start = i
+                    self.expect_key = False
+                elif self.depth == 1 and self.value_start is None:
+                    self.value_start = i
+                elif self.depth == 2 and self.value_is_array and self.item_start is None:
+                    self.item_start = i
+                continue
+
+            if c.isspace():
+                continue
+
+            if c in "{[":
+                if self.depth == 1 and self.value_start is None:
+                    self.value_start = i
+                    self.value_is_array = c == "["
+                elif self.depth == 2 and self.value_is_array and self.item_start is None:
+                    self.item_start = i
+                self.depth += 1
+                continue
+
+            if c in "}]":
+                self.depth -= 1
+                if self.depth == 1 and self.value_is_array and c == "]":
+                    self._end_item(buf, i, events)
+                elif self.depth == 0:
+                    self._end_value(buf, i, events)
+                continue
+
+            if c == ",":
+                if self.depth == 1:
+                    self._end_value(buf, i, events)
+                elif self.depth == 2 and self.value_is_array:
+                    self._end_item(buf, i, events)
+                continue
+
+            if c == ":" and self.depth == 1:
+                continue
+
+            # start of a number / true / false / null
+            if self.depth == 1 and self.value_start is None:
+                self.value_start = i
+            elif self.depth == 2 and self.value_is_array and self.item_start is None:
+                self.item_start = i
+
+        return events
+
+    def _end_item(self, buf, end, events):
+        if self.item_start is not None:
+            events.append(("item", self.key, json.loads(buf[self.item_start:end])))
+        self.item_start = None
+
+    def _end_value(self, buf, end, events):
+        if self.key is not None and self.value_start is not None:
+            events.append(("value", self.key, json.loads(buf[self.value_start:end])))
+        self.expect_key = True
+        self.key = None
+        self.value_start = None
+        self.value_is_array = False
+        self.item_start = None
@@ -0,0 +1,113 @@
+# utils/keyword_engine.py
+#
+# Title keyword scoring for matching.match_user. A user's title phrases
+# score 0.7 each when they occur in the job title and 0.4 when they only
+# occur in the description, as plain substrings of the lowercased text.
+#
+# Instead of running `phrase in text` per phrase, per job, per user, the
+# phrases of every user in a run are compiled into one Aho-Corasick
+# automaton and each job's title / description is lowercased and scanned
+# once. Scoring a user against a job is then a few set lookups.
+
+import logging
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+logger = logging.getLogger(__name__)
+
+TITLE_KEYWORD_WEIGHT = 0.7
+DESC_KEYWORD_WEIGHT = 0.4
+
+NO_HITS = frozenset()
+
+
+class PhraseIndex:
+    """
+    Lowercased phrases compiled into an Aho-Corasick automaton
+    (pyahocorasick). hits(text) returns the ids of every phrase occurring
+    in text, overlapping matches included, i.e. exactly the phrases for
+    which `phrase in text` holds. Without pyahocorasick each phrase is
+    checked with `in`, which gives the same result more slowly.
+    """
+
+    def __init__(self, phrases=(), use_automaton=True):
+        self.ids = {}
+        for phrase in phrases:
+            self.ids.setdefault(phrase, len(self.ids))
+
+        # "" is a substring of everything
+        self.always = frozenset(pid for phrase, pid in self.ids.items() if not phrase)
+
+        self.automaton = None
+        if use_automaton and ahocorasick is None:
+            logger.warning("pyahocorasick is not installed, keyword matching falls back to substring checks")
+        elif use_automaton and len(self.ids) > len(self.always):
+            self.automaton = ahocorasick.Automaton()
+            for phrase, pid in self.ids.items():
+                if phrase:
+                    self.automaton.add_word(phrase, pid)
+            self.automaton.make_automaton()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def ids_for(self, phrases):
+        """Ids of `phrases` in order, or None if any is not in the index."""
+        try:
+            return [self.ids[p] for p in phrases]
+        except KeyError:
+            return None
+
+    def hits(self, text):
+        if not text or not self.ids:
+            return self.always or NO_HITS
+        if self.automaton is not None:
+            found = {pid for _, pid in self.automaton.iter(text)}
+        else:
+            found = {pid for phrase, pid in self.ids.items() if phrase in text}
+        if self.always:
+            found |= self.always
+        return frozenset(found) if found else NO_HITS
+
+
+class JobKeywordHits:
+    """
+    (title hits, description hits) per job for one PhraseIndex. With
+    cache=True the hits are kept by job id, so a job streamed once per
+    user in the daily run is only scanned the first time.
+    """
+
+    def __init__(self, index, cache=True):
+        self.index = index
+        self.cache = {} if cache else None
+        self.scanned = 0
+
+    def get(self, job):
+        if self.cache is not None:
+            hit = self.cache.get(job["id"])
+            if hit is not None:
+                return hit
+
+        hit = (
+            self.index.hits((job["title"] or "").lower()),
+            self.index.hits((job["description"] or "").lower()),
+        )
+        self.scanned += 1
+
+        if self.cache is not None:
+            self.cache[job["id"]] = hit
+        return hit
+
+
+def keyword_score(keyword_ids, title_hits, desc_hits):
+    score = 0.0
+    for pid in keyword_ids:
+        if pid in title_hits:
+            score += TITLE_KEYWORD_WEIGHT
+        elif pid in desc_hits:
+            score += DESC_KEYWORD_WEIGHT
+    return score
@@ -1,10 +1,21 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 MAILGUN_API_KEY = os.getenv("MAILGUN_API_KEY")
 MAILGUN_DOMAIN = os.getenv("MAILGUN_DOMAIN")
 FROM_EMAIL = os.getenv("SUPPORT_FROM_EMAIL", "support_noreply@notifications.hirednowai.com")
-MAILGUN_API_BASE = "https://api.eu.mailgun.net/v3"
+# Overridable so batch sends can be pointed at a local fake server
+MAILGUN_API_BASE = os.getenv("MAILGUN_API_BASE", "https://api.eu.mailgun.net/v3")
+
+# Batch sending (lifecycle emails)
+MAILGUN_MAX_WORKERS = int(os.getenv("MAILGUN_MAX_WORKERS", "8"))
+MAILGUN_RATE_PER_SEC = float(os.getenv("MAILGUN_RATE_PER_SEC", "10"))
 
 
 def send_contact_reply(to_email: str, subject: str, body: str):
@@ -19,3 +30,95 @@ def send_contact_reply(to_email: str, subject: str, body: str):
 		},
 		timeout=10,
 	)
+
+
+class RateLimiter:
+	"""Token bucket shared by the sending threads: `rate` requests per second, bursts up to `burst`."""
+
+	def __init__(self, rate: float, burst: int | None = None):
+		self.rate = rate
+		self.capacity = burst or max(1, int(rate))
+		self.tokens = float(self.capacity)
+		self.updated = time.monotonic()
+		self.lock = threading.Lock()
+
+	def acquire(self):
+		while True:
+			with self.lock:
+				now = time.monotonic()
+				self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+				self.updated = now
+				if self.tokens >= 1:
+					self.tokens -= 1
+					return
+				wait = (1 - self.tokens) / self.rate
+			time.sleep(wait)
+
+
+class MailgunClient:
+	"""
+	Sends Mailgun messages over one pooled session, several at a time.
+	429 / 5xx responses are retried with backoff by the adapter, and all
+	sends go through one rate limiter.
+	"""
+
+	def __init__(
+		self,
+		api_key: str = MAILGUN_API_KEY,
+		domain: str = MAILGUN_DOMAIN,
+		api_base: str = MAILGUN_API_BASE,
+		max_workers: int = MAILGUN_MAX_WORKERS,
+		rate_per_sec: float = MAILGUN_RATE_PER_SEC,
+		timeout: float = 10,
+	):
+		self.url = f"{api_base}/{domain}/messages"
+		self.domain = domain
+		self.max_workers = max_workers
+		self.timeout = timeout
+		self.limiter = RateLimiter(rate_per_sec)
+
+		retry = Retry(
+			total=3,
+			backoff_factor=0.5,
+			status_forcelist=(429, 500, 502, 503, 504),
+			allowed_methods=frozenset(["POST"]),
+			respect_retry_after_header=True,
+		)
+		adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+		self.session = requests.Session()
+		self.session.auth = ("api", api_key)
+		self.session.mount("https://", adapter)
+		self.session.mount("http://", adapter)
+
+	def send(self, message: dict) -> str | None:
+		"""
+		Send one message ({"to", "subject", "text", "html"}; "from" defaults
+		to the no-reply address). Returns Mailgun's message id; raises on failure.
+		"""
+		data = {"from": f"HiredNow AI <no-reply@{self.domain}>", **message}
+		self.limiter.acquire()
+		response = self.session.post(self.url, data=data, timeout=self.timeout)
+		response.raise_for_status()
+		try:
+			return response.json().get("id")
+		except ValueError:
+			return None
+
+	def send_many(self, messages: list) -> list:
+		"""
+		Send `messages` concurrently. Returns one (message_id, error) pair per
+		message, in order; error is None on success.
+		"""
+		def _send(message):
+			try:
+				return self.send(message), None
+			except Exception as e:
+				return None, e
+
+		if not messages:
+			return []
+		with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+			return list(pool.map(_send, messages))
+
+	def close(self):
+		self.session.close()
@@ -0,0 +1,137 @@
+# utils/question_router.py
+
+"""
+Deterministic question classifier shared by the ATS bots.
+
+Every rule is compiled once at import into a regex. classify() maps a
+question label to the set of canonical intents it mentions and is
+memoized on the normalized text, so repeated labels across applications
+cost a dict lookup. Each bot keeps its own priority order and answer
+logic; it only asks "which intents does this question carry?".
+
+Keywords are plain substrings ("relocat" matches "relocate" and
+"relocation"), so short ones over-match: intents that drive a typed
+answer or a salary mention use the bots' full phrases ("pay range",
+"expected pay", "authorized to work") rather than bare words ("pay"
+would also catch "payroll", "PayPal" and "payment systems").
+"""
+
+import re
+from functools import lru_cache
+
+
+def _any(*keywords):
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+# (intent, any_of, all_of, none_of) — any_of is a single compiled
+# alternation, all_of/none_of are keyword tuples. An intent may have
+# several rules; it matches if any of them does.
+_RULES = [
+    # --- identity / contact ---
+    ("preferred_first_name", ("preferred first",), (), ()),
+    ("first_name", ("first name", "given name"), (), ("preferred",)),
+    ("last_name", ("last name", "surname", "family name"), (), ()),
+    ("full_name", ("full",), ("name",), ()),
+    ("email", ("email",), (), ()),
+    ("phone", ("phone", "mobile"), (), ()),
+    ("address", ("address",), (), ("email",)),
+    ("city", ("city",), (), ("state", "ethnicity")),
+    ("linkedin", ("linkedin",), (), ()),
+    ("website", ("website", "portfolio"), (), ()),
+
+    # --- demographics ---
+    ("race", ("race", "ethnicity"), (), ()),
+    ("gender", ("gender",), (), ()),
+    ("disability", ("disability",), (), ()),
+    ("disability_accommodation", ("accommodation",), ("disability",), ()),
+    ("veteran", ("veteran",), (), ()),
+
+    # --- eligibility ---
+    ("work_authorization", (
+        "work authorization", "work authorisation", "employment authorization",
+        "authorized to work", "authorised to work", "legally authorized", "legally authorised",
+        "right to work", "eligible to work", "legally allowed", "work permit",
+    ), (), ()),
+    ("visa_status", ("visa status",), (), ()),
+    ("sponsorship", ("sponsor", "visa"), (), ()),
+    ("criminal_record", (
+        "convicted", "criminal", "felony", "misdemeanor", "offence",
+        "offense", "arrested", "charged with a crime",
+    ), (), ()),
+    ("restrictive_covenant", ("restrictive", "covenant", "non compete", "non-compete"), (), ()),
+    ("duty_limitation", ("limited",), ("job",), ()),
+    ("agreement_copy", ("agreement",), ("copy",), ()),
+    ("previously_interviewed", ("previously interviewed", "interviewed with"), (), ()),
+
+    # --- logistics ---
+    ("relocation", ("relocat",), (), ()),
+    ("commute", ("local", "commute"), (), ()),
+    ("remote_preference", ("remote", "hybrid", "work preference"), (), ()),
+    ("salary", (
+        "salary", "compensation", "remuneration", "pay range", "annual pay",
+        "expected pay", "pay expectation", "expected earnings", "ctc",
+    ), (), ()),
+    ("notice_period", ("notice",), (), ()),
+    ("availability", ("availability", "available to begin", "available to start"), (), ()),
+    ("start", ("start",), (), ()),
+
+    # --- education ---
+    ("school", ("school", "university", "institution"), (), ()),
+    ("degree", ("degree",), (), ()),
+    ("discipline", ("discipline",), (), ()),
+    ("graduation_year", ("graduation",), (), ()),
+    ("graduation_year", ("year",), (), ("start", "end", "experience")),
+
+    # --- experience ---
+    ("experience", ("experience",), (), ()),
+    ("years_experience", ("years of", "years'", "years experience", "year of experience"), ("experience",), ()),
+    ("field_experience", ("experience in this field",), (), ()),
+    ("skills", ("skills",), (), ()),
+    ("exp_start_month", ("start date month",), (), ()),
+    ("exp_start_year", ("start date year",), (), ()),
+    ("exp_end_month", ("end date month",), (), ()),
+    ("exp_end_year", ("end date year",), (), ()),
+    ("company", ("company",), (), ()),
+    ("current_employer", ("employer",), (), ()),
+    ("current_employer", ("current",), ("company",), ()),
+    ("role_title", ("role", "title"), (), ("this role", "why")),
+]
+
+_COMPILED = [
+    (intent, _any(*any_of), all_of, none_of)
+    for intent, any_of, all_of, none_of in _RULES
+]
+
+_WS_RE = re.compile(r"\s+")
+
+INTENTS = frozenset(intent for intent, *_ in _RULES)
+
+
+def normalize_question(text: str) -> str:
+    return _WS_RE.sub(" ", text or "").strip().lower()
+
+
+@lru_cache(maxsize=8192)
+def _classify_normalized(q: str) -> frozenset:
+    found = set()
+    for intent, any_re, all_of, none_of in _COMPILED:
+        if intent in found:
+            continue
+        if not any_re.search(q):
+            continue
+        if all_of and not all(k in q for k in all_of):
+            continue
+        if none_of and any(k in q for k in none_of):
+            continue
+        found.add(intent)
+    return frozenset(found)
+
+
+def classify(text: str) -> frozenset:
+    """Return the set of canonical intents mentioned by a question label."""
+    return _classify_normalized(normalize_question(text))
+
+
+def cache_info():
+    return _classify_normalized.cache_info()
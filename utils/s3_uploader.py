@@ -1,9 +1,75 @@
 # utils/s3_uploader.py
 
-import boto3
+import asyncio
+import functools
+import mimetypes
 import os
+import threading
 import uuid
-import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
+
+
+S3_UPLOAD_WORKERS = int(os.getenv("S3_UPLOAD_WORKERS", "4"))
+# Attempts per request (first try included), retried by botocore with
+# backoff on throttling, 5xx and connection errors
+S3_UPLOAD_RETRIES = int(os.getenv("S3_UPLOAD_RETRIES", "3"))
+
+# Files above the threshold go up as parallel multipart chunks
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+
+_client = None
+_client_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=S3_UPLOAD_WORKERS, thread_name_prefix="s3-upload")
+
+
+def get_s3_client():
+    """
+    One boto3 client per process. boto3 clients are thread-safe, so the
+    connection pool and resolved credentials are shared by every upload.
+    AWS_S3_ENDPOINT_URL points the client at a local stand-in (minio/moto).
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client(
+                    "s3",
+                    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+                    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+                    region_name=os.getenv("AWS_REGION", "eu-west-1"),
+                    endpoint_url=os.getenv("AWS_S3_ENDPOINT_URL") or None,
+                    config=BotoConfig(
+                        max_pool_connections=max(10, S3_UPLOAD_WORKERS * 4),
+                        retries={"total_max_attempts": S3_UPLOAD_RETRIES, "mode": "standard"},
+                    ),
+                )
+    return _client
+
+
+def build_object_key(local_path: str, folder: str, custom_filename: str | None = None) -> str:
+    ext = os.path.splitext(local_path)[1] or ""
+
+    # If you provided a filename, use it — else fallback to UUID
+    if custom_filename:
+        return f"{folder}/{custom_filename}"
+    return f"{folder}/{uuid.uuid4()}{ext}"
+
+
+def object_url(bucket: str, key: str) -> str:
+    endpoint = os.getenv("AWS_S3_ENDPOINT_URL")
+    if endpoint:
+        return f"{endpoint.rstrip('/')}/{bucket}/{key}"
+
+    region = os.getenv("AWS_REGION", "eu-west-1")
+    return f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
 
 
 def upload_to_s3(local_path: str, folder: str, custom_filename: str | None = None) -> str:
@@ -11,37 +77,43 @@ def upload_to_s3(local_path: str, folder: str, custom_filename: str | None = Non
     Uploads any file to S3 under a custom folder.
     - If custom_filename is provided, it is used as the object key.
     - Uses UUID fallback otherwise.
+    - Failed requests are retried by the client (S3_UPLOAD_RETRIES);
+      large files go up as multipart.
+
+    Blocking — from async code use upload_to_s3_async().
     """
 
     bucket = os.getenv("AWS_S3_BUCKET")
-    region = os.getenv("AWS_REGION", "eu-west-1")
 
     if not bucket:
         raise ValueError("AWS_S3_BUCKET env variable not set")
 
-    s3 = boto3.client(
-        "s3",
-        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        region_name=region
-    )
-
-    ext = os.path.splitext(local_path)[1] or ""
-
-    # If you provided a filename, use it — else fallback to UUID
-    if custom_filename:
-        filename = f"{folder}/{custom_filename}"
-    else:
-        filename = f"{folder}/{uuid.uuid4()}{ext}"
+    key = build_object_key(local_path, folder, custom_filename)
 
     # Infer content type
     content_type = mimetypes.guess_type(local_path)[0] or "application/octet-stream"
 
+    s3 = get_s3_client()
+
     s3.upload_file(
         local_path,
         bucket,
-        filename,
-        ExtraArgs={"ContentType": content_type}
+        key,
+        ExtraArgs={"ContentType": content_type},
+        Config=TRANSFER_CONFIG,
+    )
+
+    return object_url(bucket, key)
+
+
+async def upload_to_s3_async(local_path: str, folder: str, custom_filename: str | None = None) -> str:
+    """
+    Same as upload_to_s3(), run on the shared upload thread pool so the
+    event loop is never blocked.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor,
+        functools.partial(upload_to_s3, local_path, folder, custom_filename=custom_filename),
     )
 
-    return f"https://{bucket}.s3.{region}.amazonaws.com/{filename}"
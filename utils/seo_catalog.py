@@ -0,0 +1,283 @@
+# utils/seo_catalog.py
+#
+# Catalog of generated SEO landing pages (role x country, role x city,
+# remote role x country) for workers/seo_snapshot_worker.py.
+#
+# Pages are derived from live job counts rather than listed by hand: for
+# each role family one query pulls the matching live jobs (the title
+# patterns are served by idx_jobs_title_trgm), counts them per country /
+# city / remote with window aggregates, and keeps only the newest
+# PAGE_LIMIT rows of each group. Groups with at least MIN_PAGE_JOBS jobs
+# become pages. Families run in parallel, one connection each.
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+from psycopg2.extras import RealDictCursor
+
+
+PAGE_LIMIT = 50
+MIN_PAGE_JOBS = 5
+MAX_CITY_PAGES_PER_COUNTRY = 200
+
+# Sitemaps may hold 50,000 URLs; stay clear of the limit
+SITEMAP_SHARD_SIZE = 45000
+
+# Role family -> title keywords (any match). Slugs of the country pages
+# line up with the hand-written SEO_SNAPSHOTS, which keep their content.
+ROLE_FAMILIES = {
+    "software-engineer": ["software engineer", "software developer"],
+    "frontend-engineer": ["frontend engineer", "front end engineer", "front-end engineer", "frontend developer"],
+    "backend-engineer": ["backend engineer", "back end engineer", "back-end engineer", "backend developer"],
+    "full-stack-engineer": ["full stack", "fullstack", "full-stack"],
+    "mobile-engineer": ["ios engineer", "android engineer", "mobile engineer", "mobile developer"],
+    "devops-engineer": ["devops", "site reliability", "platform engineer"],
+    "data-engineer": ["data engineer"],
+    "data-analyst": ["data analyst"],
+    "data-scientist": ["data scientist"],
+    "machine-learning-engineer": ["machine learning", "ml engineer"],
+    "security-engineer": ["security engineer", "security analyst"],
+    "qa-engineer": ["qa engineer", "quality assurance", "test engineer"],
+    "engineering-manager": ["engineering manager"],
+    "product-manager": ["product manager"],
+    "project-manager": ["project manager"],
+    "program-manager": ["program manager", "programme manager"],
+    "product-designer": ["product designer"],
+    "ux-designer": ["ux designer", "user experience"],
+    "ui-designer": ["ui designer", "user interface"],
+    "marketing-manager": ["marketing manager"],
+    "content-marketing": ["content marketing", "content writer", "copywriter"],
+    "customer-success-manager": ["customer success"],
+    "customer-support": ["customer support", "customer service"],
+    "account-executive": ["account executive"],
+    "account-manager": ["account manager"],
+    "sales-manager": ["sales manager"],
+    "business-analyst": ["business analyst"],
+    "finance-manager": ["finance manager", "financial controller"],
+    "accountant": ["accountant"],
+    "recruiter": ["recruiter", "talent acquisition"],
+    "hr-manager": ["hr manager", "people partner", "hr business partner"],
+    "operations-manager": ["operations manager"],
+    "nurse": ["nurse"],
+}
+
+# ISO country -> (slug prefix, display name). Countries missing here get
+# no generated pages.
+COUNTRIES = {
+    "us": ("us", "the United States"),
+    "gb": ("uk", "the United Kingdom"),
+    "ca": ("ca", "Canada"),
+    "ie": ("ie", "Ireland"),
+    "au": ("au", "Australia"),
+    "de": ("de", "Germany"),
+    "nl": ("nl", "the Netherlands"),
+}
+
+# Rows returned per job, counts and ranks per group
+FAMILY_QUERY = """
+    WITH matched AS (
+        SELECT id, title, company, job_url, posted_at, scraped_at,
+               country, city, is_remote
+        FROM jobs
+        WHERE expires_at >= CURRENT_DATE
+          AND country = ANY(%(countries)s)
+          AND ({title_filter})
+    ),
+    ranked AS (
+        SELECT m.*,
+               COUNT(*) OVER w_country AS country_jobs,
+               ROW_NUMBER() OVER (w_country ORDER BY COALESCE(posted_at, scraped_at) DESC, id DESC) AS country_rn,
+               COUNT(*) OVER w_city AS city_jobs,
+               ROW_NUMBER() OVER (w_city ORDER BY COALESCE(posted_at, scraped_at) DESC, id DESC) AS city_rn,
+               COUNT(*) OVER w_remote AS remote_jobs,
+               ROW_NUMBER() OVER (w_remote ORDER BY COALESCE(posted_at, scraped_at) DESC, id DESC) AS remote_rn
+        FROM matched m
+        WINDOW w_country AS (PARTITION BY country),
+               w_city AS (PARTITION BY country, LOWER(TRIM(city))),
+               w_remote AS (PARTITION BY country, is_remote)
+    )
+    SELECT *
+    FROM ranked
+    WHERE country_rn <= %(lim)s
+       OR city_rn <= %(lim)s
+       OR (is_remote AND remote_rn <= %(lim)s)
+"""
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", (text or "").lower()).strip("-")
+
+
+def role_name(family):
+    name = family.replace("-", " ")
+    for short in ("ux", "ui", "qa", "hr"):
+        name = re.sub(rf"\b{short}\b", short.upper(), name)
+    return name
+
+
+def page_content(role, place):
+    return {
+        "intro": f"Browse the latest {role} jobs in {place} from verified company career pages.",
+        "what_are": f"{role[0].upper()}{role[1:]} jobs in {place}, updated daily from employers hiring right now.",
+        "how_to_apply": f"Applying to multiple {role} roles manually is time consuming. An AI job application system tailors your CV and submits applications automatically.",
+        "faq": [
+            {
+                "q": f"Are these real {role} jobs?",
+                "a": "Yes. All roles are sourced directly from company career pages.",
+            }
+        ],
+    }
+
+
+def fetch_family_pages(conn, family, keywords, countries=COUNTRIES, lim=PAGE_LIMIT, min_jobs=MIN_PAGE_JOBS):
+    """
+    Pages for one role family. Returns a list of snapshot dicts shaped like
+    SEO_SNAPSHOTS entries, plus "rows" (the page's jobs, newest first) and
+    "job_count" (live jobs in the group).
+    """
+    params = {"countries": list(countries), "lim": lim}
+    named = []
+    for i, keyword in enumerate(keywords):
+        params[f"p{i}"] = f"%{keyword}%"
+        named.append(f"title ILIKE %(p{i})s")
+    query = FAMILY_QUERY.format(title_filter=" OR ".join(named))
+
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(query, params)
+        rows = cur.fetchall()
+    conn.rollback()
+
+    role = role_name(family)
+    groups = {}
+
+    def _add(key, row, rank, count):
+        if rank > lim or count < min_jobs:
+            return
+        group = groups.setdefault(key, {"count": count, "rows": []})
+        group["rows"].append((rank, row))
+
+    for row in rows:
+        country = row["country"]
+        _add(("country", country, None), row, row["country_rn"], row["country_jobs"])
+        city = (row["city"] or "").strip()
+        if city and city.lower() != "remote":
+            _add(("city", country, city.lower()), row, row["city_rn"], row["city_jobs"])
+        if row["is_remote"]:
+            _add(("remote", country, None), row, row["remote_rn"], row["remote_jobs"])
+
+    pages = []
+    city_pages = {}
+    for (kind, country, city_key), group in groups.items():
+        prefix, country_name = countries[country]
+        ordered = [row for _, row in sorted(group["rows"], key=lambda r: r[0])]
+
+        if kind == "country":
+            slug = f"{prefix}-{family}-jobs"
+            place = country_name
+            filters = {"country": country, "title_contains": keywords}
+            location = None
+        elif kind == "remote":
+            slug = f"{prefix}-remote-{family}-jobs"
+            place = country_name
+            filters = {"country": country, "is_remote": True, "title_contains": keywords}
+            location = "Remote"
+        else:
+            city = ordered[0]["city"].strip()
+            slug = f"{prefix}-{family}-jobs-in-{slugify(city)}"
+            place = city
+            filters = {"country": country, "city": city, "title_contains": keywords}
+            location = city
+
+        page = {
+            "slug": slug,
+            "filters": filters,
+            "limit": lim,
+            "content": page_content(f"remote {role}" if kind == "remote" else role, place),
+            "rows": ordered,
+            "job_count": group["count"],
+        }
+        if location:
+            page["location"] = location
+
+        if kind == "city":
+            city_pages.setdefault(country, []).append(page)
+        else:
+            pages.append(page)
+
+    # Only the biggest cities of each country get a page; spellings that
+    # slugify alike ("St. Louis" / "St Louis") keep the bigger one
+    for country_pages in city_pages.values():
+        country_pages.sort(key=lambda p: (-p["job_count"], p["slug"]))
+        seen = set()
+        for page in country_pages:
+            if len(seen) >= MAX_CITY_PAGES_PER_COUNTRY:
+                break
+            if page["slug"] not in seen:
+                seen.add(page["slug"])
+                pages.append(page)
+
+    return pages
+
+
+def build_catalog(connect, families=ROLE_FAMILIES, workers=4):
+    """
+    Every generated page, one family per task across `workers` connections
+    (`connect` opens one). Returns (pages, seconds spent per family).
+    """
+    def _run(item):
+        family, keywords = item
+        started = time.monotonic()
+        conn = connect()
+        try:
+            return family, fetch_family_pages(conn, family, keywords), time.monotonic() - started
+        finally:
+            conn.close()
+
+    pages = []
+    timings = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for family, family_pages, elapsed in pool.map(_run, families.items()):
+            pages.extend(family_pages)
+            timings[family] = elapsed
+    return pages, timings
+
+
+def build_urlset(urls):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    ]
+    for url in urls:
+        lines.append("  <url>")
+        lines.append(f"    <loc>{escape(url['loc'])}</loc>")
+        lines.append(f"    <changefreq>{url['changefreq']}</changefreq>")
+        lines.append(f"    <priority>{url['priority']}</priority>")
+        lines.append("  </url>")
+    lines.append("</urlset>")
+    return "\n".join(lines)
+
+
+def build_sitemaps(urls, base_url, shard_size=SITEMAP_SHARD_SIZE, prefix="sitemaps"):
+    """
+    Split `urls` into sitemap shards of at most shard_size URLs plus a
+    sitemap index listing them. Returns {key: xml} with the index under
+    "sitemap.xml" and the shards under "{prefix}/sitemap-N.xml".
+    """
+    files = {}
+    for n, start in enumerate(range(0, len(urls), shard_size), start=1):
+        files[f"{prefix}/sitemap-{n}.xml"] = build_urlset(urls[start:start + shard_size])
+
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    ]
+    for key in files:
+        lines.append("  <sitemap>")
+        lines.append(f"    <loc>{escape(f'{base_url}/{key}')}</loc>")
+        lines.append("  </sitemap>")
+    lines.append("</sitemapindex>")
+
+    files["sitemap.xml"] = "\n".join(lines)
+    return files
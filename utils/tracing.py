@@ -0,0 +1,149 @@
+# utils/tracing.py
+
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+
+logger = logging.getLogger(__name__)
+
+PHASE_METRICS_LOG_SECONDS = int(os.getenv("PHASE_METRICS_LOG_SECONDS", "300"))
+PHASE_METRICS_WINDOW = int(os.getenv("PHASE_METRICS_WINDOW", "500"))
+
+
+class Trace:
+    """
+    Phase timings for one application. Spans with the same name add up
+    (e.g. several LLM calls); bot phases are recorded as "bot.<phase>".
+    """
+
+    def __init__(self, app_id, ats: str | None = None):
+        self.app_id = app_id
+        self.ats = ats
+        self.status = None
+        self.spans = {}
+        self.tokens = {}
+        self._started = time.perf_counter()
+
+    def add(self, name: str, seconds: float):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def add_usage(self, name: str, prompt_tokens: int, completion_tokens: int):
+        prompt, completion = self.tokens.get(name, (0, 0))
+        self.tokens[name] = (prompt + prompt_tokens, completion + completion_tokens)
+
+    @contextmanager
+    def span(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    async def timed(self, name: str, awaitable):
+        """Await `awaitable` inside a span; handy for background tasks."""
+        with self.span(name):
+            return await awaitable
+
+    def add_bot_phases(self, bot):
+        pacing = getattr(bot, "pacing", None)
+        if pacing is not None:
+            for phase, (elapsed, waited) in pacing.timings.items():
+                self.add(f"bot.{phase}", elapsed)
+            self.add("bot.deliberate_wait", pacing.waited)
+
+        answers = getattr(bot, "form_answers", None)
+        if answers is not None:
+            self.add("bot.answer_llm", answers.llm_seconds)
+
+    def finish(self, status: str | None = None):
+        if status:
+            self.status = status
+        self.spans["total"] = time.perf_counter() - self._started
+
+    def summary(self) -> str:
+        parts = []
+        for name, seconds in self.spans.items():
+            part = f"{name}={seconds:.2f}s"
+            if name in self.tokens:
+                part += " ({}+{} tok)".format(*self.tokens[name])
+            parts.append(part)
+        return ", ".join(parts)
+
+
+def span(trace: Trace | None, name: str):
+    """trace.span(name), or a no-op when there is no trace."""
+    return trace.span(name) if trace is not None else nullcontext()
+
+
+def record_usage(trace: Trace | None, name: str, usage):
+    """Add an OpenAI response's token usage to `trace` (no-op without either)."""
+    if trace is not None and usage is not None:
+        trace.add_usage(name, usage.prompt_tokens or 0, usage.completion_tokens or 0)
+
+
+async def save_trace(pool, trace: Trace):
+    """Write every span of `trace` to application_phase_timings in one statement."""
+    if not trace.spans:
+        return
+    names = list(trace.spans)
+    await pool.execute(
+        """
+        INSERT INTO application_phase_timings
+            (application_id, ats, status, phase, duration_ms, prompt_tokens, completion_tokens)
+        SELECT $1, $2, $3, phase, duration_ms, prompt_tokens, completion_tokens
+        FROM unnest($4::text[], $5::int[], $6::int[], $7::int[])
+            AS t(phase, duration_ms, prompt_tokens, completion_tokens)
+        """,
+        trace.app_id,
+        trace.ats,
+        trace.status,
+        names,
+        [int(trace.spans[n] * 1000) for n in names],
+        [trace.tokens[n][0] if n in trace.tokens else None for n in names],
+        [trace.tokens[n][1] if n in trace.tokens else None for n in names],
+    )
+
+
+def percentile(sorted_values, q: float):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class PhaseMetrics:
+    """
+    In-process p50/p95 per (ATS, phase) over the last PHASE_METRICS_WINDOW
+    applications, logged every PHASE_METRICS_LOG_SECONDS.
+    """
+
+    def __init__(self, window: int = PHASE_METRICS_WINDOW, interval: int = PHASE_METRICS_LOG_SECONDS):
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.interval = interval
+        self.last_logged = time.monotonic()
+        self.count = 0
+
+    def record(self, trace: Trace):
+        self.count += 1
+        for name, seconds in trace.spans.items():
+            self.samples[(trace.ats or "-", name)].append(seconds)
+
+    def snapshot(self):
+        rows = []
+        for (ats, phase), values in sorted(self.samples.items()):
+            ordered = sorted(values)
+            rows.append((ats, phase, len(ordered), percentile(ordered, 0.5), percentile(ordered, 0.95)))
+        return rows
+
+    def log_if_due(self):
+        if not self.samples or time.monotonic() - self.last_logged < self.interval:
+            return
+        self.last_logged = time.monotonic()
+
+        lines = [f"Phase timings over the last {self.count} applications (p50 / p95):"]
+        for ats, phase, n, p50, p95 in self.snapshot():
+            lines.append(f"  {ats:<12} {phase:<24} n={n:<5} {p50:8.2f}s {p95:8.2f}s")
+        logger.info("\n".join(lines))
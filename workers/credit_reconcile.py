@@ -0,0 +1,40 @@
+import os
+import sys
+
+import psycopg2
+
+# Allow imports of utils/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.credits import settle_reservations, find_balance_drift
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Reservations still open after this long are settled even if some of
+# their applications never left the queue; those fall back to the balance.
+RESERVATION_MAX_AGE_HOURS = int(os.getenv("CREDIT_RESERVATION_MAX_AGE_HOURS", "48"))
+
+
+def run():
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        settled = settle_reservations(conn, RESERVATION_MAX_AGE_HOURS)
+        print(f"[CREDITS] Settled {settled} credit reservations")
+
+        drift = find_balance_drift(conn)
+        if not drift:
+            print("[CREDITS] All balances match the ledger")
+            return
+
+        print(f"[CREDITS] {len(drift)} balances differ from the ledger:")
+        for row in drift:
+            print(
+                f"[CREDITS]   user {row['user_id']}: available={row['available_credits']} "
+                f"held={row['held']} ledger={row['ledger_total']} drift={row['drift']:+d}"
+            )
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import psycopg2
+
+# Allow imports of utils/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cv_ingest import claim_cv_ingest, ingest_cv, fail_cv_ingest, CvIngestError
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+def get_conn():
+    return psycopg2.connect(DATABASE_URL)
+
+
+def cv_ingest_loop():
+    print("[CV INGEST WORKER] Started")
+
+    conn = get_conn()
+    while True:
+        try:
+            item = claim_cv_ingest(conn)
+        except psycopg2.Error as e:
+            print(f"[CV INGEST WORKER] DB error, reconnecting: {e}")
+            try:
+                conn.close()
+            except Exception:
+                pass
+            time.sleep(2)
+            conn = get_conn()
+            continue
+
+        if not item:
+            time.sleep(1)
+            continue
+
+        print(f"[CV INGEST WORKER] Processing upload {item['id']} for user {item['user_id']}")
+        started = time.perf_counter()
+
+        try:
+            ingest_cv(conn, item)
+            print(f"[CV INGEST WORKER] Done {item['id']} in {time.perf_counter() - started:.1f}s")
+            continue
+        except Exception as e:
+            error = e
+
+        try:
+            if isinstance(error, CvIngestError):
+                fail_cv_ingest(conn, item, error, retry=False)
+                print(f"[CV INGEST WORKER] Failed {item['id']}: {error}")
+            else:
+                retried = fail_cv_ingest(conn, item, error)
+                print(f"[CV INGEST WORKER] Error on {item['id']} ({'will retry' if retried else 'giving up'}): {error}")
+        except psycopg2.Error as e:
+            # The connection died with the upload; it stays 'processing'
+            # and is picked up again after CV_INGEST_STALE_MINUTES
+            print(f"[CV INGEST WORKER] Could not record failure of {item['id']} ({error}), reconnecting: {e}")
+            try:
+                conn.close()
+            except Exception:
+                pass
+            time.sleep(2)
+            conn = get_conn()
+
+
+if __name__ == "__main__":
+    cv_ingest_loop()
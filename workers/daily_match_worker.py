@@ -15,7 +15,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from matching import match_user
+from matching import match_user, extract_titles
+from utils.keyword_engine import JobKeywordHits, PhraseIndex
 
 def get_connection():
     return psycopg2.connect(os.environ["DATABASE_URL"])
@@ -28,6 +29,18 @@ def get_all_user_ids(conn):
         return [r["user_id"] for r in rows]
 
 
+def build_keyword_hits(conn, user_ids):
+    """
+    One phrase index over every user's titles, with job hits cached for
+    the run, so each job's title and description are scanned once rather
+    than once per user.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT job_titles FROM profile WHERE user_id = ANY(%s)", (user_ids,))
+        phrases = {t for (raw,) in cur.fetchall() for t in extract_titles(raw)}
+    return JobKeywordHits(PhraseIndex(sorted(phrases)))
+
+
 def run_daily_matching():
     print("[DAILY MATCH] Starting refresh...")
 
@@ -36,16 +49,19 @@ def run_daily_matching():
 
     print(f"[DAILY MATCH] Found {len(user_ids)} onboarded users")
 
+    keyword_hits = build_keyword_hits(conn, user_ids)
+    print(f"[DAILY MATCH] {len(keyword_hits.index)} distinct title keywords")
+
     for uid in user_ids:
         try:
             print(f"[DAILY MATCH] Matching user {uid}")
             # Reuse the same connection for performance
-            match_user(conn, uid)
+            match_user(conn, uid, keyword_hits=keyword_hits)
         except Exception as e:
             print(f"[DAILY MATCH] Error matching user {uid}: {e}")
 
     conn.close()
-    print("[DAILY MATCH] Complete")
+    print(f"[DAILY MATCH] Complete ({keyword_hits.scanned} jobs scanned for keywords)")
 
 
 if __name__ == "__main__":
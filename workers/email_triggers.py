@@ -10,105 +10,114 @@ if PROJECT_ROOT not in sys.path:
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import datetime, timedelta
-from models import db, User, Profile, UserSubscription, EmailEvent, CreditBalance
+from models import db, User, Profile, UserSubscription, EmailEvent, CreditBalance, CreditReservation
 from app import create_app
-from emails.onboarding_bounce import send_onboarding_bounce_email
-from emails.credits_exhausted import send_credits_exhausted_email
-from sqlalchemy.exc import IntegrityError
+from emails.onboarding_bounce import build_onboarding_bounce_email
+from emails.credits_exhausted import build_credits_exhausted_email
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import contains_eager
+from utils.mailgun import MailgunClient
+
+
+def no_active_subscription():
+    return ~(
+        select(UserSubscription.id)
+        .where(UserSubscription.user_id == User.id)
+        .where(UserSubscription.status.in_(["active", "trialing"]))
+        .exists()
+    )
+
+
+def not_yet_sent(event_type):
+    return ~(
+        select(EmailEvent.id)
+        .where(EmailEvent.user_id == User.id)
+        .where(EmailEvent.event_type == event_type)
+        .exists()
+    )
+
+
+def send_and_record(client, event_type, users, build):
+    """
+    Send one email per user concurrently, then record an EmailEvent for
+    every accepted send in a single insert. Failed sends are not recorded,
+    so they are picked up again on the next run.
+    """
+    if not users:
+        print(f"[EMAIL] {event_type}: nobody to email")
+        return
+
+    messages = [build(user) for user in users]
+    results = client.send_many(messages)
+
+    now = datetime.utcnow()
+    rows = []
+    for user, (message_id, error) in zip(users, results):
+        if error:
+            print(f"[EMAIL] {event_type} failed for user {user.id}: {error}")
+            continue
+        rows.append({
+            "user_id": user.id,
+            "event_type": event_type,
+            "provider": "mailgun",
+            "provider_message_id": message_id,
+            "status": "sent",
+            "sent_at": now,
+            "created_at": now,
+        })
+
+    if rows:
+        db.session.execute(pg_insert(EmailEvent).values(rows).on_conflict_do_nothing())
+        db.session.commit()
+
+    print(f"[EMAIL] {event_type}: sent {len(rows)}/{len(users)}")
+
 
 def run():
     app = create_app()
     with app.app_context():
         now = datetime.utcnow()
         cutoff = now - timedelta(hours=1)
-
-        users = (
-            db.session.query(User, Profile)
-            .join(Profile, Profile.user_id == User.id)
-            .filter(Profile.onboarding_step == 5)
-            .filter(Profile.updated_at < cutoff)
-            .all()
-        )
-
-        for user, profile in users:
-            # Skip if user has a subscription
-            has_sub = (
-                UserSubscription.query
-                .filter_by(user_id=user.id)
-                .filter(UserSubscription.status.in_(["active", "trialing"]))
-                .first()
-            )
-
-            if has_sub:
-                continue
-
-            # Idempotency check
-            already_sent = EmailEvent.query.filter_by(
-                user_id=user.id,
-                event_type="onboarding_plan_bounce"
-            ).first()
-
-            if already_sent:
-                continue
-
-            # Send email
-            print(user)
-            send_onboarding_bounce_email(user)
-
-            #Record event (DB-enforced idempotency)
-            try:
-                db.session.add(
-                    EmailEvent(
-                        user_id=user.id,
-                        event_type="onboarding_plan_bounce"
-                    )
-                )
-                db.session.commit()
-            except IntegrityError:
-                db.session.rollback()
-
-        # --------------------------------------------------
-        # 2. Credits exhausted email (NEW)
-        # --------------------------------------------------
-
-        exhausted_users = (
-            db.session.query(User, CreditBalance)
-            .join(CreditBalance, CreditBalance.user_id == User.id)
-            .filter(CreditBalance.available_credits == 0)
-            .all()
-        )
-
-        for user, balance in exhausted_users:
-
-            # Skip active subscribers
-            has_sub = (
-                UserSubscription.query
-                .filter_by(user_id=user.id)
-                .filter(UserSubscription.status.in_(["active", "trialing"]))
-                .first()
+        client = MailgunClient()
+
+        try:
+            # --------------------------------------------------
+            # 1. Onboarding bounce: stuck on the plan step, no subscription
+            # --------------------------------------------------
+            bounce_users = (
+                db.session.query(User)
+                .join(Profile, Profile.user_id == User.id)
+                .options(contains_eager(User.profile))
+                .filter(Profile.onboarding_step == 5)
+                .filter(Profile.updated_at < cutoff)
+                .filter(no_active_subscription())
+                .filter(not_yet_sent("onboarding_plan_bounce"))
+                .all()
             )
-            if has_sub:
-                continue
-
-            # Idempotency
-            already_sent = EmailEvent.query.filter_by(
-                user_id=user.id,
-                event_type="credits_exhausted"
-            ).first()
-
-            if already_sent:
-                continue
-
-            print(f"Exhausted: {user}")
-            send_credits_exhausted_email(user)
-
-            db.session.add(
-                EmailEvent(
-                    user_id=user.id,
-                    event_type="credits_exhausted"
-                )
+            send_and_record(client, "onboarding_plan_bounce", bounce_users, build_onboarding_bounce_email)
+
+            # --------------------------------------------------
+            # 2. Credits exhausted, no subscription
+            # --------------------------------------------------
+            exhausted_users = (
+                db.session.query(User)
+                .join(CreditBalance, CreditBalance.user_id == User.id)
+                .filter(CreditBalance.available_credits == 0)
+                .filter(~(
+                    select(CreditReservation.id)
+                    .where(CreditReservation.user_id == User.id)
+                    .where(CreditReservation.status == "open")
+                    .where(CreditReservation.consumed < CreditReservation.reserved)
+                    .exists()
+                ))
+                .filter(no_active_subscription())
+                .filter(not_yet_sent("credits_exhausted"))
+                .all()
             )
-            db.session.commit()
+            send_and_record(client, "credits_exhausted", exhausted_users, build_credits_exhausted_email)
+        finally:
+            client.close()
 
 if __name__ == '__main__':
-    run()
\ No newline at end of file
+    run()
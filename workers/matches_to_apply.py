@@ -1,12 +1,18 @@
 import asyncio
 import asyncpg
 import os
+import sys
 import hashlib
 from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Allow imports of utils/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.dashboard_cache import invalidate_dashboard
+
 MAX_APPLICATIONS_PER_DAY = 30
 
 
@@ -20,9 +26,17 @@ async def process_auto_applications():
 
     print("[AUTO WORKER] Starting auto application enqueue")
 
-    # 1. Select active auto users correctly
+    # 1. Select active auto users correctly, with how many applications
+    # each already has today (from the per-day rollup, see
+    # sql/create_tables/application_daily_counts.sql)
     users = await conn.fetch("""
-        SELECT p.user_id
+        SELECT p.user_id,
+               COALESCE((
+                   SELECT SUM(adc.count)
+                   FROM application_daily_counts adc
+                   WHERE adc.user_id = p.user_id
+                     AND adc.day = CURRENT_DATE
+               ), 0) AS todays_count
         FROM profile p
         join credit_balance cb on cb.user_id = p.user_id 
         WHERE p.application_mode = 'auto'
@@ -37,13 +51,8 @@ async def process_auto_applications():
         user_id = row["user_id"]
         print(f"\n[AUTO WORKER] Processing user {user_id}")
 
-        # 2. Count how many applications this user already has today
-        todays_count = await conn.fetchval("""
-            SELECT COUNT(*)
-            FROM applications
-            WHERE user_id = $1
-              AND DATE(created_at) = CURRENT_DATE
-        """, user_id)
+        # 2. How many applications this user already has today
+        todays_count = row["todays_count"]
 
         print(f"[AUTO WORKER] User {user_id} has {todays_count} applications today")
 
@@ -122,26 +131,48 @@ async def process_auto_applications():
                 m["job_id"]
             ))
 
-        # Insert apps (deduped with ON CONFLICT)
-        await conn.executemany("""
-            INSERT INTO applications (
-                user_id,
-                job_url,
-                job_url_hash,
-                job_title,
-                company,
-                location,
-                salary,
-                status,
-                created_at,
-                updated_at,
-                job_id
-            )
-            VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11)
-            ON CONFLICT (user_id, job_url_hash) DO NOTHING
-        """, insert_rows)
-
-        print(f"[AUTO WORKER] Inserted {len(insert_rows)} applications for user {user_id}")
+        # Insert apps (deduped with ON CONFLICT) and reserve credits for
+        # the batch in one transaction, so the apply worker charges the
+        # reservation rather than locking the balance per application
+        async with conn.transaction():
+            app_ids = await conn.fetch("""
+                INSERT INTO applications (
+                    user_id,
+                    job_url,
+                    job_url_hash,
+                    job_title,
+                    company,
+                    location,
+                    salary,
+                    status,
+                    created_at,
+                    updated_at,
+                    job_id
+                )
+                SELECT * FROM unnest(
+                    $1::int[], $2::text[], $3::text[], $4::text[], $5::text[], $6::text[],
+                    $7::text[], $8::text[], $9::timestamp[], $10::timestamp[], $11::bigint[]
+                )
+                ON CONFLICT (user_id, job_url_hash) DO NOTHING
+                RETURNING id
+            """, *(list(col) for col in zip(*insert_rows)))
+            app_ids = [r["id"] for r in app_ids]
+
+            reservation = None
+            if app_ids:
+                reservation = await conn.fetchrow(
+                    "SELECT * FROM reserve_credits($1, $2)", user_id, len(app_ids)
+                )
+            if reservation:
+                await conn.execute("""
+                    UPDATE applications
+                    SET reservation_id = $1
+                    WHERE id = ANY($2::int[])
+                """, reservation["reservation_id"], app_ids[:reservation["reserved"]])
+
+        reserved = reservation["reserved"] if reservation else 0
+        invalidate_dashboard(user_id)
+        print(f"[AUTO WORKER] Inserted {len(app_ids)} applications for user {user_id}, {reserved} credits reserved")
 
     await conn.close()
     print("\n[AUTO WORKER] Done\n")
@@ -1,19 +1,37 @@
 import os
 import json
 import sys
+import argparse
+import hashlib
+import time
 import psycopg2
 import boto3
-from datetime import datetime, date
-from psycopg2.extras import RealDictCursor
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
 
 load_dotenv()
 
 sys.path.insert(0, "/opt/render/project/src")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.seo_catalog import build_catalog, build_sitemaps
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-S3_BUCKET = "hired-now-ai"
+S3_BUCKET = os.getenv("SEO_S3_BUCKET", "hired-now-ai")
 S3_PREFIX = "snapshots"
+BASE_URL = "https://hirednowai.com"
+UPLOAD_WORKERS = int(os.getenv("SEO_UPLOAD_WORKERS", "8"))
+CATALOG_WORKERS = int(os.getenv("SEO_CATALOG_WORKERS", "4"))
+
+# Pages whose content is unchanged are still re-uploaded after this many
+# days, so the "N days ago" label kept for the current frontend does not
+# drift too far (pages should render the age from posted_date instead)
+AGE_REFRESH_DAYS = int(os.getenv("SEO_AGE_REFRESH_DAYS", "7"))
+
+# The sitemap shares seo_snapshot_state with the snapshots under this key
+SITEMAP_STATE_KEY = "__sitemap__"
 
 SEO_SNAPSHOTS = [
     # -------------------------
@@ -540,78 +558,241 @@ def get_conn():
     return psycopg2.connect(DATABASE_URL)
 
 
-def run():
-    print("[SEO SNAPSHOT WORKER] Started")
+def get_s3_client():
+    # AWS_S3_ENDPOINT_URL points at a local stand-in (minio/moto)
+    return boto3.client("s3", endpoint_url=os.getenv("AWS_S3_ENDPOINT_URL") or None)
 
-    conn = get_conn()
-    s3 = boto3.client("s3")
 
-    for snapshot in SEO_SNAPSHOTS:
-        slug = snapshot["slug"]
-        print(f"[SEO SNAPSHOT WORKER] Generating {slug}")
+class LocalBucket:
+    """put_object into a directory instead of S3 (--out)."""
 
-        rows = fetch_jobs(conn, snapshot)
+    def __init__(self, root):
+        self.root = root
 
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        path = os.path.join(self.root, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(Body.encode("utf-8") if isinstance(Body, str) else Body)
+
+
+def sitemap_state_key(key):
+    # The index keeps the key used before the sitemap was sharded
+    return SITEMAP_STATE_KEY if key == "sitemap.xml" else f"{SITEMAP_STATE_KEY}/{key}"
+
+
+def run(full=False, curated_only=False, out_dir=None):
+    """
+    Build the hand-written SEO_SNAPSHOTS plus the pages generated from live
+    job counts (utils/seo_catalog.py), and upload only those whose content
+    changed since the last run (content hashes are kept in
+    seo_snapshot_state). full=True uploads everything regardless.
+    out_dir writes every file to a local directory and leaves the stored
+    hashes alone.
+    """
+    if out_dir:
+        full = True
+    print(f"[SEO SNAPSHOT WORKER] Started ({'full' if full else 'incremental'})")
+
+    started = time.monotonic()
+    conn = get_conn()
+    s3 = LocalBucket(out_dir) if out_dir else get_s3_client()
+
+    pages = []
+    jobs_by_slug = fetch_all_snapshot_jobs(conn, SEO_SNAPSHOTS)
+    for snapshot in SEO_SNAPSHOTS:
+        rows = jobs_by_slug.get(snapshot["slug"])
         if not rows:
-            print(f"[SEO SNAPSHOT WORKER] No jobs found for {slug}, skipping")
+            print(f"[SEO SNAPSHOT WORKER] No jobs found for {snapshot['slug']}, skipping")
             continue
-
+        pages.append((snapshot, rows))
+
+    sitemap_pages = list(SEO_SNAPSHOTS)
+    if not curated_only:
+        curated = {s["slug"] for s in SEO_SNAPSHOTS}
+        catalog, family_timings = build_catalog(get_conn, workers=CATALOG_WORKERS)
+        generated = [page for page in catalog if page["slug"] not in curated]
+        pages.extend((page, page["rows"]) for page in generated)
+        sitemap_pages.extend(generated)
+
+        slowest = sorted(family_timings.items(), key=lambda kv: -kv[1])[:3]
+        print(
+            f"[SEO SNAPSHOT WORKER] Catalog: {len(generated)} generated pages from "
+            f"{len(family_timings)} role families (slowest: "
+            + ", ".join(f"{family} {secs:.2f}s" for family, secs in slowest) + ")"
+        )
+
+    fetched = time.monotonic()
+    stored = {} if full else load_snapshot_hashes(conn)
+
+    uploads = []
+    for snapshot, rows in pages:
         payload = build_payload(rows, snapshot)
-        upload_snapshot(s3, slug, payload)
-
-        print(f"[SEO SNAPSHOT WORKER] Uploaded {slug} ({len(rows)} jobs)")
+        content_hash = payload_hash(payload)
+        if stored.get(snapshot["slug"]) != content_hash:
+            uploads.append((snapshot["slug"], payload, content_hash, len(rows)))
+
+    sitemap_files = generate_sitemap(sitemap_pages)
+    sitemap_uploads = []
+    for key, xml in sitemap_files.items():
+        xml_hash = hashlib.sha256(xml.encode("utf-8")).hexdigest()
+        if stored.get(sitemap_state_key(key)) != xml_hash:
+            sitemap_uploads.append((key, xml, xml_hash))
+
+    built = time.monotonic()
+    print(f"[SEO SNAPSHOT WORKER] {len(uploads)} of {len(pages)} snapshots changed")
+
+    def _upload(item):
+        slug, payload, content_hash, _ = item
+        upload_snapshot(s3, slug, payload, content_hash)
+        return item
+
+    uploaded = []
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+        futures = [pool.submit(_upload, item) for item in uploads]
+        for future in futures:
+            try:
+                slug, _, content_hash, job_count = future.result()
+            except Exception as e:
+                print(f"[SEO SNAPSHOT WORKER] Upload failed: {e}")
+                continue
+            uploaded.append((slug, content_hash, job_count))
+
+    # Shards before the index, so the index never lists a missing shard
+    sitemap_uploads.sort(key=lambda item: item[0] == "sitemap.xml")
+    for key, xml, xml_hash in sitemap_uploads:
+        try:
+            upload_sitemap(s3, xml, key)
+        except Exception as e:
+            print(f"[SEO SNAPSHOT WORKER] Sitemap upload failed for {key}: {e}")
+            continue
+        uploaded.append((sitemap_state_key(key), xml_hash, None))
+    print(f"[SEO SNAPSHOT WORKER] {len(sitemap_uploads)} of {len(sitemap_files)} sitemap files changed")
 
+    if not out_dir:
+        save_snapshot_hashes(conn, uploaded)
     conn.close()
-    print("[SEO SNAPSHOT WORKER] Completed")
-    print("[SEO SNAPSHOT WORKER] Generating sitemap")
-
-    sitemap_xml = generate_sitemap(SEO_SNAPSHOTS)
-    upload_sitemap(s3, sitemap_xml)
 
-    print("[SEO SNAPSHOT WORKER] Sitemap uploaded")
+    finished = time.monotonic()
+    per_thousand = (finished - started) / max(len(pages), 1) * 1000
+    print(
+        f"[SEO SNAPSHOT WORKER] Completed: {len(pages)} pages in {finished - started:.1f}s "
+        f"(fetch {fetched - started:.1f}s, build {built - fetched:.1f}s, upload {finished - built:.1f}s), "
+        f"{per_thousand:.1f}s per 1000 pages"
+    )
 
 
-def fetch_jobs(conn, snapshot):
-    filters = snapshot["filters"]
-    limit = snapshot["limit"]
+def fetch_all_snapshot_jobs(conn, snapshots):
+    """
+    Latest jobs for every snapshot in one query: the snapshot filters are
+    passed in as rows and joined against a single scan of live jobs, with
+    the per-snapshot limit applied by row_number().
+    Returns {slug: rows}.
+    """
+    specs = []
+    for snapshot in snapshots:
+        filters = snapshot["filters"]
+        keywords = filters.get("title_contains")
+        specs.append({
+            "slug": snapshot["slug"],
+            "country": filters.get("country"),
+            "remote_only": filters.get("is_remote") is True,
+            "patterns": [f"%{k.lower()}%" for k in keywords] if keywords else None,
+            "lim": snapshot["limit"],
+        })
 
-    where_clauses = [
-        "expires_at >= CURRENT_DATE"
-    ]
-    params = []
-
-    if "country" in filters:
-        where_clauses.append("country = %s")
-        params.append(filters["country"])
-
-    if filters.get("is_remote") is True:
-        where_clauses.append("is_remote = TRUE")
-
-    if "title_contains" in filters:
-        title_conditions = []
-        for keyword in filters["title_contains"]:
-            title_conditions.append("LOWER(title) LIKE %s")
-            params.append(f"%{keyword.lower()}%")
-        where_clauses.append(f"({' OR '.join(title_conditions)})")
-
-    query = f"""
-        SELECT
-            id,
-            title,
-            company,
-            job_url,
-            posted_at,
-            scraped_at
-        FROM jobs
-        WHERE {' AND '.join(where_clauses)}
-        ORDER BY
-            COALESCE(posted_at, scraped_at) DESC
-        LIMIT {limit};
+    countries = sorted({s["country"] for s in specs if s["country"]})
+    any_country = any(s["country"] is None for s in specs)
+
+    query = """
+        WITH specs AS (
+            SELECT *
+            FROM jsonb_to_recordset(%s::jsonb)
+                AS s(slug TEXT, country TEXT, remote_only BOOLEAN, patterns TEXT[], lim INT)
+        ),
+        ranked AS (
+            SELECT
+                s.slug,
+                s.lim,
+                j.id,
+                j.title,
+                j.company,
+                j.job_url,
+                j.posted_at,
+                j.scraped_at,
+                ROW_NUMBER() OVER (
+                    PARTITION BY s.slug
+                    ORDER BY COALESCE(j.posted_at, j.scraped_at) DESC, j.id DESC
+                ) AS rn
+            FROM jobs j
+            JOIN specs s
+              ON (s.country IS NULL OR j.country = s.country)
+             AND (NOT s.remote_only OR j.is_remote = TRUE)
+             AND (s.patterns IS NULL OR LOWER(j.title) LIKE ANY (s.patterns))
+            WHERE j.expires_at >= CURRENT_DATE
+              AND (%s OR j.country = ANY(%s))
+        )
+        SELECT slug, id, title, company, job_url, posted_at, scraped_at
+        FROM ranked
+        WHERE rn <= lim
+        ORDER BY slug, rn;
     """
 
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute(query, params)
-        return cur.fetchall()
+        cur.execute(query, (json.dumps(specs), any_country, countries))
+        rows = cur.fetchall()
+
+    jobs_by_slug = {}
+    for row in rows:
+        jobs_by_slug.setdefault(row["slug"], []).append(row)
+    return jobs_by_slug
+
+
+def payload_hash(payload):
+    """
+    Hash of everything in a snapshot except its generation time and the
+    relative job ages, which change every day without the page changing.
+    """
+    stable = {k: v for k, v in payload.items() if k not in ("meta", "jobs")}
+    stable["slug"] = payload["meta"]["slug"]
+    stable["jobs"] = [{k: v for k, v in job.items() if k != "posted_at"} for job in payload.get("jobs", [])]
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def load_snapshot_hashes(conn, refresh_days=AGE_REFRESH_DAYS):
+    """
+    {slug: content_hash} of the last uploads. Uploads older than
+    refresh_days are left out, so those pages go out again.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT slug, content_hash
+            FROM seo_snapshot_state
+            WHERE uploaded_at >= %s
+            """,
+            (datetime.utcnow() - timedelta(days=refresh_days),),
+        )
+        return dict(cur.fetchall())
+
+
+def save_snapshot_hashes(conn, uploaded):
+    if not uploaded:
+        return
+    with conn.cursor() as cur:
+        execute_values(
+            cur,
+            """
+            INSERT INTO seo_snapshot_state (slug, content_hash, job_count, uploaded_at)
+            VALUES %s
+            ON CONFLICT (slug) DO UPDATE
+            SET content_hash = EXCLUDED.content_hash,
+                job_count = EXCLUDED.job_count,
+                uploaded_at = EXCLUDED.uploaded_at
+            """,
+            [(slug, content_hash, job_count, datetime.utcnow()) for slug, content_hash, job_count in uploaded],
+        )
+    conn.commit()
 
 
 def build_payload(rows, snapshot):
@@ -624,7 +805,8 @@ def build_payload(rows, snapshot):
             "id": row["id"],
             "title": row["title"],
             "company": row["company"] or "",
-            "location": "Remote",
+            "location": snapshot.get("location") or row.get("city") or "Remote",
+            "posted_date": posted_date.isoformat(),
             "posted_at": humanize_date(posted_date),
             "apply_url": row["job_url"]
         })
@@ -640,7 +822,7 @@ def build_payload(rows, snapshot):
 
 
 
-def upload_snapshot(s3, slug, payload):
+def upload_snapshot(s3, slug, payload, content_hash=None):
     key = f"{S3_PREFIX}/{slug}.json"
 
     s3.put_object(
@@ -648,13 +830,14 @@ def upload_snapshot(s3, slug, payload):
         Key=key,
         Body=json.dumps(payload),
         ContentType="application/json",
-        CacheControl="public, max-age=3600"
+        CacheControl="public, max-age=3600",
+        Metadata={"content-hash": content_hash or payload_hash(payload)},
     )
 
-def upload_sitemap(s3, xml):
+def upload_sitemap(s3, xml, key="sitemap.xml"):
     s3.put_object(
         Bucket=S3_BUCKET,
-        Key="sitemap.xml",
+        Key=key,
         Body=xml,
         ContentType="application/xml",
         CacheControl="public, max-age=3600"
@@ -671,29 +854,10 @@ def humanize_date(d: date):
     return f"{days} days ago"
 
 
-def build_sitemap_xml(urls):
-    lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
-    ]
-
-    for url in urls:
-        lines.append("  <url>")
-        lines.append(f"    <loc>{url['loc']}</loc>")
-        lines.append(f"    <changefreq>{url['changefreq']}</changefreq>")
-        lines.append(f"    <priority>{url['priority']}</priority>")
-        lines.append("  </url>")
-
-    lines.append("</urlset>")
-
-    return "\n".join(lines)
-
-
 def generate_sitemap(snapshots):
+    """Sitemap index plus shards, as {key: xml}."""
     urls = []
 
-    BASE_URL = "https://hirednowai.com"
-
     # Static pages
     static_paths = [
         "/",
@@ -720,8 +884,13 @@ def generate_sitemap(snapshots):
             "priority": "0.9"
         })
 
-    return build_sitemap_xml(urls)
+    return build_sitemaps(urls, BASE_URL)
 
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="upload every snapshot even if unchanged")
+    parser.add_argument("--curated-only", action="store_true", help="skip the generated catalog pages")
+    parser.add_argument("--out", help="write files to this directory instead of S3")
+    args = parser.parse_args()
+    run(full=args.full, curated_only=args.curated_only, out_dir=args.out)
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+
+# Add Render project root so billing, models and utils/ are importable
+PROJECT_ROOT = "/opt/render/project/src"
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Add parent of /workers (local dev use)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from models import db
+from billing import claim_stripe_events, process_stripe_event, webhook_queue_stats
+
+BATCH_SIZE = int(os.getenv("STRIPE_WEBHOOK_BATCH_SIZE", "20"))
+IDLE_SLEEP = 1
+STATS_EVERY = 60
+
+
+def log_stats():
+    stats = webhook_queue_stats()
+    print(
+        "[STRIPE WORKER] queue: "
+        f"pending={stats['pending']} attempted={stats['attempted']} dead={stats['dead']} "
+        f"oldest={stats['oldest_pending_age'] or 0:.0f}s "
+        f"lag p50={stats['p50_lag_1h'] or 0:.1f}s p95={stats['p95_lag_1h'] or 0:.1f}s"
+    )
+
+
+def stripe_webhook_loop():
+    app = create_app()
+    with app.app_context():
+        print("[STRIPE WORKER] Started")
+        next_stats = 0
+
+        while True:
+            try:
+                if time.monotonic() >= next_stats:
+                    log_stats()
+                    next_stats = time.monotonic() + STATS_EVERY
+
+                rows = claim_stripe_events(BATCH_SIZE)
+            except OperationalError as e:
+                print(f"[STRIPE WORKER] DB error, retrying: {e}")
+                db.session.rollback()
+                time.sleep(2)
+                continue
+
+            if not rows:
+                time.sleep(IDLE_SLEEP)
+                continue
+
+            done = 0
+            started = time.perf_counter()
+            for row in rows:
+                if process_stripe_event(row):
+                    done += 1
+
+            print(f"[STRIPE WORKER] Batch of {len(rows)}: {done} processed in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    stripe_webhook_loop()
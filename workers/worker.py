@@ -13,7 +13,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import logging
 import json
-import aiohttp
 import uuid
 
 import asyncio
@@ -26,10 +25,20 @@ from bots.greenhouse import GreenhouseBot
 from bots.workable import WorkableBot
 
 from utils.description_parser import html_to_text
-from utils.job_description_fetcher import scrape_job_description
-from utils.cv_builder import generate_custom_cv
+from utils.job_description_fetcher import (
+    fetch_job_description,
+    close_http_session,
+    DescriptionWriteBack,
+)
+from utils.cv_builder import generate_custom_cv, CV_PROMPT_VERSION
+from utils.cv_cache import CvGenerationCache
+from utils.answer_engine import answer_cache
+from utils.job_condenser import JobBriefStore
 from utils.cv_loader import load_cv_text
-from utils.s3_uploader import upload_to_s3
+from utils.s3_uploader import upload_to_s3_async
+from utils.artifact_store import ArtifactStore
+from utils.tracing import Trace, PhaseMetrics, save_trace
+from utils.dashboard_cache import invalidate_dashboard
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -37,6 +46,9 @@ load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="[Worker] %(message)s")
 
+# Condensed job descriptions, shared by every application to the same job
+job_briefs = JobBriefStore()
+
 
 async def get_db():
     return await asyncpg.create_pool(os.getenv("DATABASE_URL"))
@@ -52,7 +64,15 @@ WITH next_task AS (
       ON p.user_id = a.user_id
     WHERE a.status = 'pending'
       AND a.credit_consumed = FALSE
-      AND cb.available_credits > 0
+      AND (
+          cb.available_credits > 0
+          OR EXISTS (
+              SELECT 1 FROM credit_reservations r
+              WHERE r.id = a.reservation_id
+                AND r.status = 'open'
+                AND r.consumed < r.reserved
+          )
+      )
       AND p.is_active = TRUE
     ORDER BY RANDOM()
     LIMIT 1
@@ -94,80 +114,18 @@ async def deactivate_user(pool, user_id: int, reason: str):
         )
 
 async def consume_credit(pool, user_id: int, app_id: int):
-    async with pool.acquire() as conn:
-        async with conn.transaction():
-
-            # Lock application row
-            app = await conn.fetchrow(
-                """
-                SELECT credit_consumed
-                FROM applications
-                WHERE id = $1
-                FOR UPDATE
-                """,
-                app_id
-            )
+    """
+    Charge the credit for a successful application (once). Draws on the
+    application's credit reservation when it has one, so the user's
+    balance row is only locked for applications queued without one; see
+    sql/create_tables/credit_reservations.sql.
+    """
+    result = await pool.fetchval("SELECT consume_application_credit($1)", app_id)
 
-            if not app:
-                raise Exception("Application not found")
-
-            if app["credit_consumed"]:
-                # Idempotent safe exit
-                return False
-
-            # Lock credit balance row
-            balance = await conn.fetchrow(
-                """
-                SELECT available_credits
-                FROM credit_balance
-                WHERE user_id = $1
-                FOR UPDATE
-                """,
-                user_id
-            )
+    if result == "insufficient":
+        raise InsufficientCredits()
 
-            if not balance or balance["available_credits"] <= 0:
-                raise InsufficientCredits()
-
-            # Ledger entry
-            await conn.execute(
-                """
-                INSERT INTO credit_ledger (
-                    user_id,
-                    change_amount,
-                    reason,
-                    reference_id
-                )
-                VALUES ($1, -1, 'application_success', $2)
-                """,
-                user_id,
-                str(app_id)
-            )
-
-            # Update balance
-            await conn.execute(
-                """
-                UPDATE credit_balance
-                SET
-                    available_credits = available_credits - 1,
-                    lifetime_spent = lifetime_spent + 1,
-                    updated_at = now()
-                WHERE user_id = $1
-                """,
-                user_id
-            )
-
-            # Mark application
-            await conn.execute(
-                """
-                UPDATE applications
-                SET credit_consumed = TRUE
-                WHERE id = $1
-                """,
-                app_id
-            )
-
-            return True
+    return result == "consumed"
 
 
 
@@ -181,25 +139,6 @@ def get_bot(ats_type):
     return bots.get(ats_type.lower())
 
 
-async def download_cv_to_tmp(cv_url: str, custom_cv_name) -> str:
-    filename = f"/tmp/{custom_cv_name}"
-
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(cv_url, ssl=False) as resp:
-                if resp.status != 200:
-                    raise Exception(f"HTTP {resp.status}")
-                data = await resp.read()
-        except Exception as e:
-            raise Exception(f"Download error: {str(e)}")
-
-    with open(filename, "wb") as f:
-        f.write(data)
-
-    return filename
-
-
-
 async def mark_success(pool, app_id, user_id):
     async with pool.acquire() as conn:
         await conn.execute(
@@ -219,6 +158,8 @@ async def mark_success(pool, app_id, user_id):
         logging.warning(f"[Worker] User {user_id} credits exhausted, pausing automation")
         #await deactivate_user(pool, user_id, "credits_exhausted")
 
+    invalidate_dashboard(user_id)
+
 
 
 async def mark_failed(pool, app_id, error_msg):
@@ -251,12 +192,185 @@ async def mark_manual_required(pool, app_id, error_msg, cv_url=None):
 
 
 
+async def generate_and_apply(pool, conn, app_id, user_id, job, user, bot,
+                             base_cv_text, job_text, artifacts, CV_GENERATION_TEST, trace):
+    # 3 - Generate tailored CV
+    try:
+        with trace.span("cv_generate"):
+            cv_json, custom_cv_path, custom_cv_name = await generate_custom_cv(
+                base_cv_text=base_cv_text,
+                job_text=job_text,
+                user=user,
+                out_dir=artifacts.dir,
+                cache=CvGenerationCache(pool, CV_PROMPT_VERSION),
+                company=job.get("company"),
+                job_brief=job.get("condensed_description"),
+                trace=trace,
+            )
+    except Exception as e:
+        trace.status = "retry"
+        await mark_retry(pool, app_id, f"CV generation error: {str(e)}")
+        return
+
+    # Store JSON variant
+    try:
+        await conn.execute("""
+            UPDATE applications
+            SET cv_variant = $1
+            WHERE id = $2
+        """, json.dumps(cv_json), app_id)
+    except Exception as e:
+        trace.status = "failed"
+        await mark_failed(pool, app_id, f"Failed saving CV variant JSON: {str(e)}")
+        return
+
+    # 4 - Upload DOCX to S3 in the background; the bot uses the local file
+    upload_task = asyncio.create_task(trace.timed(
+        "s3_upload",
+        upload_to_s3_async(custom_cv_path, folder="cv-variants", custom_filename=custom_cv_name),
+    ))
+
+    try:
+        # ---- TEST MODE: stop here ----
+        if CV_GENERATION_TEST:
+            logging.info("CV_GENERATION_TEST mode enabled - skipping ATS apply step")
+            try:
+                cv_url = await upload_task
+                await conn.execute("""
+                    UPDATE applications
+                    SET status = 'success',
+                        cv_variant_url = $1,
+                        cv_variant = $2,
+                        updated_at = now()
+                    WHERE id = $3
+                """, cv_url, json.dumps(cv_json), app_id)
+                await consume_credit(pool, user_id, app_id)
+                invalidate_dashboard(user_id)
+                trace.status = "success"
+            except Exception as e:
+                trace.status = "retry"
+                await mark_retry(pool, app_id, f"CV upload failed: {str(e)}")
+            return
+
+        # 5 - Apply ONCE with the local CV variant
+        try:
+            with trace.span("bot_apply"):
+                result = await bot.apply(job, user, custom_cv_path)
+        except Exception as e:
+            logging.exception(f"Application {app_id} crashed")
+            trace.status = "crashed"
+            cv_url = await collect_cv_upload(pool, app_id, upload_task)
+            # If a CV variant exists, send the user to manual apply instead of retry loop
+            if cv_url:
+                await mark_manual_required(pool, app_id, f"Bot crashed: {str(e)}", cv_url=cv_url)
+            else:
+                await mark_retry(pool, app_id, f"Bot crashed: {str(e)}")
+            return
+        finally:
+            trace.add_bot_phases(bot)
+
+        trace.status = result.status
+        logging.info(f"[Worker] Result for {app_id}: {result.status} — {result.message}")
+
+        # Save screenshot URL if bot returned one
+        if hasattr(result, "screenshot_url") and result.screenshot_url:
+            async with pool.acquire() as conn2:
+                await conn2.execute("""
+                    UPDATE applications
+                    SET screenshot_url = $1
+                    WHERE id = $2
+                """, result.screenshot_url, app_id)
+
+        cv_url = await collect_cv_upload(pool, app_id, upload_task)
+
+        if result.status == "success":
+            await mark_success(pool, app_id, user_id)
+            if not cv_url:
+                # Submitted, so it cannot go back to retry; leave a trace of the
+                # missing variant for the dashboard and support
+                await record_cv_upload_failure(pool, app_id)
+
+        elif result.status == "retry":
+            await mark_retry(pool, app_id, result.message)
+
+        elif result.status == "manual_required":
+            if cv_url:
+                await mark_manual_required(pool, app_id, result.message, cv_url=cv_url)
+            else:
+                await mark_retry(pool, app_id, f"{result.message} (CV upload failed)")
+
+        else:
+            await mark_failed(pool, app_id, result.message)
+    finally:
+        # Whatever went wrong above, never leave the upload running unawaited
+        if not upload_task.done():
+            upload_task.cancel()
+        await asyncio.gather(upload_task, return_exceptions=True)
+
+async def collect_cv_upload(pool, app_id, upload_task):
+    """
+    Wait for the background CV upload and store its URL. The S3 client
+    already retries failed requests; returns None if the upload failed.
+    """
+    try:
+        cv_url = await upload_task
+    except Exception as e:
+        logging.error(f"[Worker] CV upload failed for {app_id}: {e}")
+        return None
+
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            UPDATE applications
+            SET cv_variant_url = $1
+            WHERE id = $2
+        """, cv_url, app_id)
+
+    return cv_url
+
+
+async def record_cv_upload_failure(pool, app_id):
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            UPDATE applications
+            SET error_message = 'Applied, but the CV variant could not be uploaded'
+            WHERE id = $1
+        """, app_id)
+
+
 async def worker_loop():
     logging.info("Worker started")
     pool = await get_db()
     CV_GENERATION_TEST = os.getenv("CV_GENERATION_TEST", "false").lower() == "true"
+    description_writer = DescriptionWriteBack()
+    answer_cache.attach_pool(pool)
+    metrics = PhaseMetrics()
 
+    try:
+        await _worker_loop(pool, description_writer, metrics, CV_GENERATION_TEST)
+    finally:
+        await description_writer.flush(pool)
+        await close_http_session()
+
+
+async def record_trace(pool, metrics, trace):
+    trace.finish()
+    logging.info(f"Timings for {trace.app_id} ({trace.ats}, {trace.status}): {trace.summary()}")
+    metrics.record(trace)
+    try:
+        await save_trace(pool, trace)
+    except Exception as e:
+        logging.warning(f"Saving phase timings failed for {trace.app_id}: {e}")
+
+
+async def _worker_loop(pool, description_writer, metrics, CV_GENERATION_TEST):
     while True:
+        try:
+            await description_writer.flush_if_due(pool)
+        except Exception as e:
+            logging.warning(f"Job description write-back failed: {e}")
+
+        metrics.log_if_due()
+
         async with pool.acquire() as conn:
 
             task = await conn.fetchrow(CLAIM_QUERY)
@@ -269,159 +383,79 @@ async def worker_loop():
             job_id = task["job_id"]
 
             logging.info(f"Processing application {app_id} for user {user_id}")
-
-            job = await load_job(conn, job_id)
-            user = await load_user_profile(conn, user_id)
-
-            if not job or not user:
-                await mark_manual_required(pool, app_id, "Missing job or user profile — manual apply required")
-                continue
-
-            ats_type = job.get("source_ats")
-            if not ats_type:
-                await mark_manual_required(pool, app_id, "ATS type Missing — manual apply required")
-                continue
-
-            bot = get_bot(ats_type)
-            if not bot:
-                # Unsupported ATS → manual apply needed
-                await mark_manual_required(pool, app_id, f"Unsupported ATS: {ats_type}")
-                continue
-
-            # 1 - Job description
-            description_html = job["description"]
-            if not description_html or len(description_html.strip()) < 50:
-                try:
-                    apply_url = job.get("apply_url") or job.get("job_url") or job.get("url")
-
-                    if not apply_url:
-                        await mark_failed(pool, app_id, "No apply_url or job_url found on job")
-                        continue
-
-                    scraped_html = await scrape_job_description(apply_url)
-
-                    await conn.execute("""
-                        UPDATE jobs SET description=$1 WHERE id=$2
-                    """, scraped_html, job_id)
-                    description_html = scraped_html
-                except Exception as e:
-                    await mark_manual_required(pool, app_id, f"JD scrape failed: {str(e)}", cv_url=None)
-                    continue
-
-            job_text = html_to_text(description_html)
-
-            # 2 - Base CV load
-            try:
-                base_cv_text = str(user["ai_cv_data"])
-            except Exception as e:
-                await mark_manual_required(pool, app_id, "CV load failed — please apply manually", cv_url=None)
-                continue
-
-            # 3 - Generate tailored CV
+            trace = Trace(app_id)
             try:
-                cv_json, custom_cv_path, custom_cv_name = await generate_custom_cv(
-                    base_cv_text=base_cv_text,
-                    job_text=job_text,
-                    user=user
+                await process_application(
+                    pool, conn, app_id, user_id, job_id, description_writer, trace, CV_GENERATION_TEST
                 )
-            except Exception as e:
-                await mark_retry(pool, app_id, f"CV generation error: {str(e)}")
-                continue
+            finally:
+                await record_trace(pool, metrics, trace)
 
-            # Store JSON variant
-            try:
-                await conn.execute("""
-                    UPDATE applications
-                    SET cv_variant = $1
-                    WHERE id = $2
-                """, json.dumps(cv_json), app_id)
-            except Exception as e:
-                await mark_failed(pool, app_id, f"Failed saving CV variant JSON: {str(e)}")
-                continue
-
-            # 4 - Upload DOCX to S3
-            try:
-                cv_url = upload_to_s3(custom_cv_path, folder="cv-variants", custom_filename=custom_cv_name)
-
-                # Save CV file URL to applications.cv_variant_url
-                await conn.execute("""
-                    UPDATE applications
-                    SET cv_variant_url = $1
-                    WHERE id = $2
-                """, cv_url, app_id)
-                # ---- TEST MODE: stop here ----
-                if CV_GENERATION_TEST:
-                    logging.info("CV_GENERATION_TEST mode enabled - skipping ATS apply step")
-
-                    await conn.execute("""
-                        UPDATE applications
-                        SET status = 'success',
-                            cv_variant_url = $1,
-                            cv_variant = $2,
-                            updated_at = now()
-                        WHERE id = $3
-                    """, cv_url, json.dumps(cv_json), app_id)
-                    await consume_credit(pool, user_id, app_id)
-
-                    continue  # Go to next job without applying
-
-
-            except Exception as e:
-                await mark_retry(pool, app_id, f"CV upload failed: {str(e)}")
-                continue
-
-            # 5 - Apply ONCE
-            # 5 - Download S3 CV variant to /tmp
-            try:
-                local_cv_path = await download_cv_to_tmp(cv_url, custom_cv_name)
-            except Exception as e:
-                await mark_retry(pool, app_id, f"CV download failed: {str(e)}")
-                continue
-            try:
-                result = await bot.apply(job, user, local_cv_path)
-                logging.info(f"[Worker] Result for {app_id}: {result.status} — {result.message}")
+        await asyncio.sleep(1)
 
-                # Save screenshot URL if bot returned one
-                if hasattr(result, "screenshot_url") and result.screenshot_url:
-                    async with pool.acquire() as conn2:
-                        await conn2.execute("""
-                            UPDATE applications
-                            SET screenshot_url = $1
-                            WHERE id = $2
-                        """, result.screenshot_url, app_id)
 
-                try:
-                    os.remove(local_cv_path)
-                except:
-                    pass
+async def process_application(pool, conn, app_id, user_id, job_id, description_writer, trace, CV_GENERATION_TEST):
+    trace.status = "manual_required"
 
-                try:
-                    os.remove(custom_cv_path)
-                except:
-                    pass
+    with trace.span("load"):
+        job = await load_job(conn, job_id)
+        user = await load_user_profile(conn, user_id)
 
-                if result.status == "success":
-                    await mark_success(pool, app_id, user_id)
+    if not job or not user:
+        await mark_manual_required(pool, app_id, "Missing job or user profile — manual apply required")
+        return
 
-                elif result.status == "retry":
-                    await mark_retry(pool, app_id, result.message)
+    ats_type = job.get("source_ats")
+    if not ats_type:
+        await mark_manual_required(pool, app_id, "ATS type Missing — manual apply required")
+        return
 
-                elif result.status == "manual_required":
-                    await mark_manual_required(pool, app_id, result.message, cv_url=cv_url)
+    trace.ats = ats_type
 
-                else:
-                    await mark_failed(pool, app_id, result.message)
+    bot = get_bot(ats_type)
+    if not bot:
+        # Unsupported ATS → manual apply needed
+        await mark_manual_required(pool, app_id, f"Unsupported ATS: {ats_type}")
+        return
 
+    # 1 - Job description
+    description_html = description_writer.get(job_id) or job["description"]
+    if not description_html or len(description_html.strip()) < 50:
+        try:
+            apply_url = job.get("apply_url") or job.get("job_url") or job.get("url")
 
+            if not apply_url:
+                trace.status = "failed"
+                await mark_failed(pool, app_id, "No apply_url or job_url found on job")
+                return
 
-            except Exception as e:
-                logging.exception(f"Application {app_id} crashed")
-                # If a CV variant exists, send the user to manual apply instead of retry loop
-                await mark_manual_required(pool, app_id, f"Bot crashed: {str(e)}", cv_url=cv_url)
+            with trace.span("jd_fetch"):
+                description_html = await fetch_job_description(apply_url)
+            description_writer.add(job_id, description_html)
+        except Exception as e:
+            await mark_manual_required(pool, app_id, f"JD scrape failed: {str(e)}", cv_url=None)
+            return
 
+    job_text = html_to_text(description_html)
 
+    # Compact brief of the posting, used by the CV and answer prompts
+    with trace.span("jd_condense"):
+        job_brief = await job_briefs.get(pool, job, job_text, trace)
+    job = {**dict(job), "condensed_description": job_brief}
 
-        await asyncio.sleep(1)
+    # 2 - Base CV load
+    try:
+        base_cv_text = str(user["ai_cv_data"])
+    except Exception as e:
+        await mark_manual_required(pool, app_id, "CV load failed — please apply manually", cv_url=None)
+        return
+
+    # 3..5 - Tailored CV + apply, temp files scoped to this application
+    with ArtifactStore(prefix=f"app_{app_id}_") as artifacts:
+        await generate_and_apply(
+            pool, conn, app_id, user_id, job, user, bot,
+            base_cv_text, job_text, artifacts, CV_GENERATION_TEST, trace
+        )
 
 
 if __name__ == "__main__":